@@ -1,15 +1,34 @@
 import abc
+from typing import Iterable
 
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
 
 from adapters.repository.repo import SQLAlchemyRepository
-from models import Answer
+from models import Answer, Question
 
 
 class AnswersRepositoryABC(SQLAlchemyRepository, abc.ABC):
-    pass
+    @abc.abstractmethod
+    def get_questions_answers(self, questions_ids: Iterable[int]) -> list[Row]:
+        raise NotImplementedError
 
 
 class AnswersRepository(AnswersRepositoryABC):
     def __init__(self, db_session: Session):
         super().__init__(Answer, db_session)
+
+    def get_questions_answers(self, questions_ids: Iterable[int]) -> list[Row]:
+        return self.get_rows(
+            db_query=select(
+                Question.id.label('question_id'),
+                Question.type.label('question_type'),
+                Question.version.label('question_version'),
+                Answer.id.label('answer_id'),
+                Answer.is_correct,
+            ).outerjoin(
+                Question.answers
+            ).where(
+                Question.id.in_(list(questions_ids))
+            )
+        )
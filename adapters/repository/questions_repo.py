@@ -1,7 +1,9 @@
 import abc
+from typing import Iterable
 
 from sqlalchemy import select, func
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
 from adapters.repository.repo import SQLAlchemyRepository
 from models import Question
@@ -12,6 +14,18 @@ class QuestionsRepositoryABC(SQLAlchemyRepository, abc.ABC):
     def get_questions_for_user_test(self):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_random_questions_ids_query(self, limit: int = 3) -> Select:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_questions_ids(self, question_type: str, after_id: int = 0) -> list[int]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_existing_questions_ids(self, questions_ids: Iterable[int]) -> set[int]:
+        raise NotImplementedError
+
 
 class QuestionsRepository(QuestionsRepositoryABC):
     def __init__(self, db_session: Session):
@@ -19,3 +33,21 @@ class QuestionsRepository(QuestionsRepositoryABC):
 
     def get_questions_for_user_test(self):
         return self.get_many(db_query=select(Question).order_by(func.random()).limit(3))
+
+    def get_random_questions_ids_query(self, limit: int = 3) -> Select:
+        return select(Question.id).order_by(func.random()).limit(limit)
+
+    def get_questions_ids(self, question_type: str, after_id: int = 0) -> list[int]:
+        return self.get_many(
+            db_query=select(
+                Question.id
+            ).where(
+                Question.type == question_type, Question.id > after_id
+            ).order_by(
+                Question.id
+            ),
+            unique_results=False,
+        )
+
+    def get_existing_questions_ids(self, questions_ids: Iterable[int]) -> set[int]:
+        return set(self.get_many(db_query=select(Question.id).where(Question.id.in_(questions_ids))))
@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
 from typing import Any, List, Optional, Type, TypeVar, cast
 
-from sqlalchemy import column, delete, exists, func, insert, select, update
+from sqlalchemy import Row, column, delete, exists, func, insert, select, update
 from sqlalchemy.orm import load_only, Session
-from sqlalchemy.sql import Select
+from sqlalchemy.sql import Executable, Select
 
 Model = TypeVar('Model')
 
@@ -49,6 +49,14 @@ class AbstractRepository(ABC):
     def get_many(self, *args, db_query: Optional[Any] = None, fields_to_load: Optional[tuple] = None):
         pass
 
+    @abstractmethod
+    def get_rows(self, *args, db_query: Optional[Any] = None):
+        pass
+
+    @abstractmethod
+    def update_many(self, values: list[dict]):
+        pass
+
     @abstractmethod
     def exists(self, *args, db_query: Optional[Any] = None):
         pass
@@ -139,6 +147,13 @@ class SQLAlchemyRepository(AbstractRepository):
         results = self.__db_session.scalars(select_query)
         return results.unique().all() if unique_results else results.all()
 
+    def get_rows(self, *args: Any, db_query: Optional[Select] = None) -> list[Row]:
+        return self._execute(self._get_db_query(*args, db_query=db_query)).all()
+
+    def update_many(self, values: list[dict]):
+        if values:
+            self._execute(update(self.model), values)
+
     def exists(self, *args: Any, db_query: Optional[Select] = None) -> Optional[bool]:
         select_db_query = self._get_db_query(*args, db_query=db_query)
         exists_db_query = exists(select_db_query).select()
@@ -150,5 +165,8 @@ class SQLAlchemyRepository(AbstractRepository):
         db_query = db_query.with_only_columns([func.count()]).order_by(None)
         return self.__db_session.scalar(db_query) or 0
 
+    def _execute(self, statement: Executable, parameters: Optional[list[dict]] = None):
+        return self.__db_session.execute(statement, parameters)
+
     def _get_db_query(self, *args, db_query: Optional[Select]) -> Select:
         return db_query.where(*args) if db_query is not None else select(self.model).where(*args)
@@ -1,10 +1,11 @@
 import abc
+from typing import Iterable
 
-from sqlalchemy import select
+from sqlalchemy import Row, delete, insert, select
 from sqlalchemy.orm import selectinload, joinedload, Session
 
 from adapters.repository.repo import SQLAlchemyRepository
-from models import UserTest, UserAnswer, Question
+from models import User, UserTest, UserAnswer, Question, UserAnswersLinkAnswers
 
 
 class UserAnswersRepositoryABC(SQLAlchemyRepository, abc.ABC):
@@ -12,6 +13,14 @@ class UserAnswersRepositoryABC(SQLAlchemyRepository, abc.ABC):
     def get_user_answers_for_test(self, user_test_id: int) -> list[UserAnswer]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_unfinished_test_user_answers(self, username: str) -> list[Row]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def replace_answers(self, answers_ids: dict[int, Iterable[int]]):
+        raise NotImplementedError
+
 
 class UserAnswersRepository(UserAnswersRepositoryABC):
     def __init__(self, db_session: Session):
@@ -30,3 +39,37 @@ class UserAnswersRepository(UserAnswersRepositoryABC):
                 selectinload(UserAnswer.answers)
             )
         )
+
+    def get_unfinished_test_user_answers(self, username: str) -> list[Row]:
+        unfinished_user_test_id = select(
+            UserTest.id
+        ).join(
+            UserTest.user
+        ).where(
+            User.username == username,
+            UserTest.result.is_(None),
+        ).limit(1).scalar_subquery()
+        return self.get_rows(
+            db_query=select(
+                UserAnswer.id,
+                UserAnswer.user_test_id,
+                UserAnswer.question_id,
+                Question.version.label('question_version'),
+            ).join(
+                UserAnswer.question
+            ).where(
+                UserAnswer.user_test_id == unfinished_user_test_id
+            )
+        )
+
+    def replace_answers(self, answers_ids: dict[int, Iterable[int]]):
+        if not answers_ids:
+            return
+        self._execute(delete(UserAnswersLinkAnswers).where(UserAnswersLinkAnswers.c.user_answer_id.in_(answers_ids)))
+        links = [
+            {'user_answer_id': user_answer_id, 'answer_id': answer_id}
+            for user_answer_id, user_answer_answers_ids in answers_ids.items()
+            for answer_id in user_answer_answers_ids
+        ]
+        if links:
+            self._execute(insert(UserAnswersLinkAnswers), links)
@@ -1,11 +1,12 @@
 import abc
-from typing import Optional
+from typing import Iterable, Optional, Union
 
-from sqlalchemy import select
+from sqlalchemy import false, insert, select, true
 from sqlalchemy.orm import selectinload, Session, contains_eager
+from sqlalchemy.sql import Select
 
 from adapters.repository.repo import SQLAlchemyRepository
-from models import UserTest, User, UserAnswer
+from models import UserTest, User, UserAnswer, Question
 
 
 class UserTestsRepositoryABC(SQLAlchemyRepository, abc.ABC):
@@ -17,6 +18,10 @@ class UserTestsRepositoryABC(SQLAlchemyRepository, abc.ABC):
     def get_user_tests_by_user(self, username: str) -> list[UserTest]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def create_with_user_answers(self, username: str, questions_ids: Union[Iterable[int], Select]) -> Optional[int]:
+        raise NotImplementedError
+
 
 class UserTestsRepository(UserTestsRepositoryABC):
     def __init__(self, db_session: Session):
@@ -57,3 +62,26 @@ class UserTestsRepository(UserTestsRepositoryABC):
             ).where(User.username == username),
             fields_to_load=(UserTest.result, UserTest.finished_at),
         )
+
+    def create_with_user_answers(self, username: str, questions_ids: Union[Iterable[int], Select]) -> Optional[int]:
+        if not isinstance(questions_ids, Select):
+            questions_ids = select(Question.id).where(Question.id.in_(list(questions_ids)))
+        questions_ids = questions_ids.subquery('test_questions')
+        new_user_test = insert(
+            UserTest.__table__
+        ).from_select(
+            ['user_id'], select(User.id).where(User.username == username),
+        ).returning(
+            UserTest.id
+        ).cte('new_user_test')
+        new_user_answers = insert(
+            UserAnswer.__table__
+        ).from_select(
+            ['user_test_id', 'question_id', 'is_correct'],
+            select(
+                new_user_test.c.id, questions_ids.c.id, false(),
+            ).select_from(
+                new_user_test.join(questions_ids, true())
+            ),
+        ).cte('new_user_answers')
+        return self.get_one(db_query=select(new_user_test.c.id).add_cte(new_user_answers))
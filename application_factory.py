@@ -0,0 +1,95 @@
+import os
+from typing import Type
+
+from database.base import session_maker
+from database.wsgi_sessionmaker import DatabaseSessionMaker, register_connection_pool_metrics
+from endpoints import router
+from presentation import QuestionsFragmentsRenderer
+from service_layer.answer_keys import AnswerKeysCache
+from service_layer.questions_pool import QuestionsPool
+from service_layer.unit_of_work import SqlAlchemyUnitOfWork
+from sessions_backend import RedisSessionsBackend
+from wsgi_application.application import Application
+from wsgi_application.compression import CompressionMiddleware, ResponseCompressor
+from wsgi_application.database import QueryStatisticsMiddleware
+from wsgi_application.dependencies import Dependency, DependencyScope
+from wsgi_application.fragments import FragmentCache
+from wsgi_application.logging import get_default_logging_configuration
+from wsgi_application.metrics import MetricsRegistry
+from wsgi_application.profiling import RequestProfiler
+from wsgi_application.session_cache import CachedSessionsBackend
+from wsgi_application.sessions import SignedCookieSessionsBackend
+from wsgi_application.static_files import StaticFiles
+
+METRICS_DIRECTORY = os.environ.get('UNI_METRICS_DIRECTORY', '/tmp/uni_wsgi_metrics')
+TEMPLATES_BYTECODE_CACHE_DIRECTORY = os.environ.get('UNI_TEMPLATES_BYTECODE_CACHE', '/tmp/uni_wsgi_templates_cache')
+DEVELOPMENT_MODE = os.environ.get('UNI_RELOAD') == '1'
+
+
+def create_application(application_class: Type[Application] = Application) -> Application:
+    app = application_class()
+
+    logging_configuration = get_default_logging_configuration()
+    logging_configuration['queue'] = {'maxsize': 10_000, 'overflow_policy': 'drop'}
+    app.change_logger_configuration(logging_configuration)
+
+    app.include_router(router)
+
+    app.set_authentication_failed_redirect_path('http://uni_site.com/login_form.html')
+
+    app.set_database_session_maker(DatabaseSessionMaker)
+
+    metrics_registry = MetricsRegistry(METRICS_DIRECTORY)
+    register_connection_pool_metrics(metrics_registry)
+    app.enable_metrics(metrics_registry)
+
+    redis_sessions_backend = CachedSessionsBackend(
+        RedisSessionsBackend(host='localhost', port=6379, db=0), ttl=5.0, metrics_registry=metrics_registry,
+    )
+    if session_secret_keys := os.environ.get('UNI_SESSION_SECRET_KEYS'):
+        app.set_sessions_backend(SignedCookieSessionsBackend(
+            session_secret_keys.split(','), fallback_backend=redis_sessions_backend,
+        ))
+    else:
+        app.set_sessions_backend(redis_sessions_backend)
+
+    app.set_templates_path(
+        'static/templates',
+        auto_reload=DEVELOPMENT_MODE,
+        bytecode_cache_directory=None if DEVELOPMENT_MODE else TEMPLATES_BYTECODE_CACHE_DIRECTORY,
+        cache_size=1000,
+        preload=not DEVELOPMENT_MODE,
+    )
+
+    questions_fragments_renderer = QuestionsFragmentsRenderer(
+        FragmentCache('questions', max_bytes=16 * 1024 * 1024, metrics_registry=metrics_registry),
+    )
+    answer_keys_cache = AnswerKeysCache(max_size=10_000)
+    questions_pool = QuestionsPool(
+        test_size=3,
+        refresh_interval=60.0,
+        full_refresh_interval=60 * 60.0,
+        create_unit_of_work=lambda: SqlAlchemyUnitOfWork(session_maker()),
+        logger=app.logger,
+    )
+    app.override_dependencies({
+        QuestionsFragmentsRenderer: Dependency(lambda: questions_fragments_renderer, scope=DependencyScope.SINGLETON),
+        QuestionsPool: Dependency(lambda: questions_pool, scope=DependencyScope.SINGLETON),
+        AnswerKeysCache: Dependency(lambda: answer_keys_cache, scope=DependencyScope.SINGLETON),
+    })
+
+    app.add_middleware(QueryStatisticsMiddleware(app.logger, max_queries=15, repeated_statement_threshold=3))
+
+    app.add_middleware(CompressionMiddleware(ResponseCompressor(minimum_size=500, compression_level=6)))
+
+    if profiling_directory := os.environ.get('UNI_PROFILING_DIRECTORY'):
+        app.enable_profiling(RequestProfiler(
+            profiling_directory,
+            sample_rate=float(os.environ.get('UNI_PROFILING_SAMPLE_RATE', '0.001')),
+            secret_header='X-Profile',
+            secret=os.environ.get('UNI_PROFILING_SECRET'),
+        ))
+
+    app.mount_static_files('/', StaticFiles('static', excluded_directories=('templates',)))
+
+    return app
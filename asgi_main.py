@@ -0,0 +1,9 @@
+import os
+
+from application_factory import create_application
+from sessions_backend import AsyncRedisSessionsBackend
+from wsgi_application.asgi import AsgiApplication
+
+application = create_application(AsgiApplication)
+if os.environ.get('UNI_ASYNC_SESSIONS') == '1':
+    application.set_sessions_backend(AsyncRedisSessionsBackend(host='localhost', port=6379, db=0))
@@ -2,6 +2,7 @@ import functools
 from typing import Callable
 
 from wsgi_application.authentication import AuthenticationError
+from wsgi_application.sessions import session_required
 
 
 def authentication_required(request_handler: Callable):
@@ -13,4 +14,4 @@ def authentication_required(request_handler: Callable):
             raise AuthenticationError
         return request_handler(request, database_connection, *args, **kwargs)
 
-    return _authentication_required
+    return session_required(_authentication_required)
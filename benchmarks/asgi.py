@@ -0,0 +1,83 @@
+# Run from the repository root: python -m benchmarks.asgi
+import asyncio
+import io
+import time
+
+from wsgi_application.application import Application
+from wsgi_application.asgi import AsgiApplication
+from wsgi_application.response import SimpleResponse
+from wsgi_application.routing import Router
+
+DATABASE_LATENCY_SECONDS = 0.02
+REQUESTS_COUNT = 200
+CONCURRENCY = 50
+
+router = Router()
+
+
+@router.route('/questions', methods=['GET'])
+def get_questions(request, database_session):
+    time.sleep(DATABASE_LATENCY_SECONDS)
+    return SimpleResponse(request, 200, 'questions')
+
+
+@router.route('/process_answers', methods=['POST'])
+def process_answers(request, database_session):
+    request.body
+    time.sleep(DATABASE_LATENCY_SECONDS)
+    return SimpleResponse(request, 200, 'result')
+
+
+@router.route('/async/questions', methods=['GET'])
+async def get_questions_async(request, database_session):
+    await asyncio.sleep(DATABASE_LATENCY_SECONDS)
+    return SimpleResponse(request, 200, 'questions')
+
+
+def _run_wsgi(application: Application, path: str, method: str) -> float:
+    started_at = time.perf_counter()
+    for _ in range(REQUESTS_COUNT):
+        environ = {
+            'PATH_INFO': path,
+            'REQUEST_METHOD': method,
+            'QUERY_STRING': '',
+            'wsgi.input': io.BytesIO(b'1=1'),
+        }
+        b''.join(application(environ, lambda status, headers: None))
+    return REQUESTS_COUNT / (time.perf_counter() - started_at)
+
+
+async def _run_asgi(application: AsgiApplication, path: str, method: str) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'1=1', 'more_body': False}
+
+    async def send(message):
+        pass
+
+    async def call():
+        async with semaphore:
+            scope = {'type': 'http', 'method': method, 'path': path, 'query_string': b'', 'headers': []}
+            await application(scope, receive, send)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(REQUESTS_COUNT)))
+    return REQUESTS_COUNT / (time.perf_counter() - started_at)
+
+
+def run():
+    wsgi_application = Application()
+    wsgi_application.include_router(router)
+    asgi_application = AsgiApplication(max_threads=CONCURRENCY)
+    asgi_application.include_router(router)
+    print(f'Simulated database latency {DATABASE_LATENCY_SECONDS * 1000:.0f} ms, {CONCURRENCY} concurrent clients')
+    for path, method in (('/questions', 'GET'), ('/process_answers', 'POST')):
+        print(f'{path:>24} WSGI sync worker: {_run_wsgi(wsgi_application, path, method):>8.0f} req/s')
+        print(f'{path:>24} ASGI thread pool: {asyncio.run(_run_asgi(asgi_application, path, method)):>8.0f} req/s')
+    requests_per_second = asyncio.run(_run_asgi(asgi_application, '/async/questions', 'GET'))
+    print(f'{"/async/questions":>24} ASGI async:       {requests_per_second:>8.0f} req/s')
+
+
+if __name__ == '__main__':
+    run()
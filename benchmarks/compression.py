@@ -0,0 +1,51 @@
+# Run from the repository root: python -m benchmarks.compression
+import timeit
+
+from wsgi_application.compression import ResponseCompressor
+from wsgi_application.request import RequestCreator
+from wsgi_application.response import SimpleResponse
+
+RESPONSE_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+COMPRESSION_LEVELS = (1, 6, 9)
+
+
+def _html(size: int) -> str:
+    question = (
+        '<h3><label for="{id}">Питання номер {id}: оберіть правильну відповідь</label></h3>'
+        '<input type="radio" id="{id}1" name="{id}" value="{id}1"><label for="{id}1">Відповідь А</label><br>'
+        '<input type="radio" id="{id}2" name="{id}" value="{id}2"><label for="{id}2">Відповідь Б</label><br>'
+    )
+    html = ''
+    question_id = 0
+    while len(html.encode()) < size:
+        question_id += 1
+        html += question.format(id=question_id)
+    return html
+
+
+def run():
+    request_creator = RequestCreator()
+    request = request_creator.create_request(
+        {'PATH_INFO': '/questions', 'REQUEST_METHOD': 'GET', 'HTTP_ACCEPT_ENCODING': 'gzip'},
+    )
+    print(f'{"size":>9} {"level":>5} {"compressed":>11} {"saved":>7} {"us/response":>12} {"MB/s":>7}')
+    for size in RESPONSE_SIZES:
+        html = _html(size)
+        body_size = len(html.encode())
+        for compression_level in COMPRESSION_LEVELS:
+            compressor = ResponseCompressor(minimum_size=0, compression_level=compression_level)
+
+            def compress():
+                return b''.join(compressor.compress(request, SimpleResponse(request, 200, html)).format_response())
+
+            compressed_size = len(compress())
+            number = max(1, 2_000_000 // body_size)
+            seconds = min(timeit.repeat(compress, number=number, repeat=3)) / number
+            print(
+                f'{body_size:>9} {compression_level:>5} {compressed_size:>11} '
+                f'{1 - compressed_size / body_size:>7.1%} {seconds * 1e6:>12.1f} {body_size / seconds / 1e6:>7.1f}'
+            )
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,139 @@
+# Run from the repository root: python -m benchmarks.grading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+
+from database.base import Base
+from models import Answer, Question, User, UserAnswer, UserTest
+from service_layer.answer_keys import AnswerKeysCache
+from service_layer.exceptions import NoUnfinishedUserTestException
+from service_layer.testing import FinishUserTest
+from service_layer.unit_of_work import SqlAlchemyUnitOfWork
+
+QUESTIONS_COUNT = 200
+ANSWERS_PER_QUESTION = 4
+TEST_SIZE = 3
+TESTS_COUNT = 1_000
+
+
+class LegacyFinishUserTest(FinishUserTest):
+    def __call__(self, username: str, answers: dict):
+        unfinished_user_test = self.user_tests_repo.get_unfinished_user_test(username=username)
+        if not unfinished_user_test:
+            raise NoUnfinishedUserTestException
+        correct_answers = 0
+        for user_answer in unfinished_user_test.user_answers:
+            given_answer = answers[str(user_answer.question_id)]
+            given_answer_ids = (
+                [int(given_answer)] if isinstance(given_answer, str) else [int(answer) for answer in given_answer]
+            )
+            if user_answer.question.type == Question.QuestionTypes.SINGLE:
+                answer_is_correct = False
+                for answer in user_answer.question.answers:
+                    if answer.id in given_answer_ids:
+                        answer_is_correct = answer.is_correct
+                        break
+            else:
+                right_answer_ids = [answer.id for answer in user_answer.question.answers if answer.is_correct]
+                answer_is_correct = set(right_answer_ids) == set(given_answer_ids)
+            if answer_is_correct:
+                correct_answers += 1
+            self.user_answers_repo.update_object(
+                user_answer,
+                is_correct=answer_is_correct,
+                answers=self.answers_repo.get_many(Answer.id.in_(given_answer_ids), fields_to_load=(Answer.id,)),
+            )
+        result = round((correct_answers / len(unfinished_user_test.user_answers)) * 100)
+        self.user_tests_repo.update_object(unfinished_user_test, result=result, finished_at=datetime.utcnow())
+        self.uow.commit()
+        return result
+
+
+def _populate(engine) -> list[tuple[str, dict]]:
+    submissions = []
+    with Session(engine) as db_session:
+        db_session.execute(insert(Question), [
+            {
+                'id': question_id,
+                'text': f'Питання {question_id}',
+                'type': 'multi' if question_id % 2 else 'single',
+            }
+            for question_id in range(1, QUESTIONS_COUNT + 1)
+        ])
+        db_session.execute(insert(Answer), [
+            {
+                'id': question_id * 10 + index,
+                'question_id': question_id,
+                'text': f'Відповідь {index}',
+                'is_correct': index < 1 + question_id % 2,
+            }
+            for question_id in range(1, QUESTIONS_COUNT + 1) for index in range(ANSWERS_PER_QUESTION)
+        ])
+        users, user_tests, user_answers = [], [], []
+        for user_test_id in range(1, TESTS_COUNT * 3 + 1):
+            users.append({'id': user_test_id, 'username': f'user {user_test_id}'})
+            user_tests.append({'id': user_test_id, 'user_id': user_test_id})
+            questions_ids = [(user_test_id * 7 + index * 31) % QUESTIONS_COUNT + 1 for index in range(TEST_SIZE)]
+            user_answers.extend(
+                {'user_test_id': user_test_id, 'question_id': question_id} for question_id in questions_ids
+            )
+            submissions.append((f'user {user_test_id}', {
+                str(question_id): [str(question_id * 10), str(question_id * 10 + 1)] if question_id % 2
+                else str(question_id * 10)
+                for question_id in questions_ids
+            }))
+        db_session.execute(insert(User), users)
+        db_session.execute(insert(UserTest), user_tests)
+        db_session.execute(insert(UserAnswer), user_answers)
+        db_session.commit()
+    return submissions
+
+
+def _measure(name: str, engine, create_service, submissions: list[tuple[str, dict]]):
+    statements_count = 0
+
+    def count_statement(*args):
+        nonlocal statements_count
+        statements_count += 1
+
+    seconds = []
+    event.listen(engine, 'before_cursor_execute', count_statement)
+    try:
+        for username, answers in submissions:
+            with Session(engine, autoflush=False, expire_on_commit=False) as db_session:
+                started_at = time.perf_counter()
+                assert create_service(SqlAlchemyUnitOfWork(db_session))(username, answers) == 100
+                seconds.append(time.perf_counter() - started_at)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_statement)
+    seconds.sort()
+    print(
+        f'{name:<24} {statements_count / len(submissions):>11.1f} {seconds[len(seconds) // 2] * 1e3:>8.3f}'
+        f' {seconds[int(len(seconds) * 0.99)] * 1e3:>8.3f}'
+    )
+
+
+def run():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    submissions = _populate(engine)
+    answer_keys_cache = AnswerKeysCache()
+    print(f'{"":<24} {"statements":>11} {"p50 ms":>8} {"p99 ms":>8}')
+    _measure('before', engine, lambda uow: LegacyFinishUserTest(uow, AnswerKeysCache()), submissions[:TESTS_COUNT])
+    _measure(
+        'answer keys, cold cache', engine, lambda uow: FinishUserTest(uow, AnswerKeysCache()),
+        submissions[TESTS_COUNT:TESTS_COUNT * 2],
+    )
+    _measure(
+        'answer keys, shared cache', engine, lambda uow: FinishUserTest(uow, answer_keys_cache),
+        submissions[TESTS_COUNT * 2:],
+    )
+    lookups_count = answer_keys_cache.hits + answer_keys_cache.misses
+    print(f'answer keys cache hit ratio: {answer_keys_cache.hits / lookups_count:.3f}')
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    run()
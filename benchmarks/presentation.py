@@ -0,0 +1,104 @@
+# Run from the repository root: python -m benchmarks.presentation
+import timeit
+from types import SimpleNamespace
+
+from models import Question
+from presentation import QuestionsFragmentsRenderer, build_questions_views
+from wsgi_application.fragments import FragmentCache
+from wsgi_application.templates import create_templates_environment, stream_template
+
+TEMPLATES_PATH = 'static/templates'
+QUESTIONS_COUNTS = (3, 50, 200, 500)
+ANSWERS_PER_QUESTION = 4
+
+
+def _user_answers(questions_count: int) -> list[SimpleNamespace]:
+    user_answers = []
+    for question_id in range(1, questions_count + 1):
+        answers = [
+            SimpleNamespace(id=question_id * 10 + index, text=f'Відповідь {index} на питання {question_id}')
+            for index in range(ANSWERS_PER_QUESTION)
+        ]
+        question = SimpleNamespace(
+            text=f'Питання номер {question_id}: оберіть правильну відповідь',
+            type=Question.QuestionTypes.MULTI if question_id % 2 else Question.QuestionTypes.SINGLE,
+            answers=answers,
+            version=1,
+        )
+        user_answers.append(SimpleNamespace(question_id=question_id, question=question, answers=answers[:2]))
+    return user_answers
+
+
+def _legacy_show_questions(user_answers: list[SimpleNamespace]) -> str:
+    response = '<form action="/process_answers" method="post">'
+    for user_answer in user_answers:
+        response += f'<h3><label for="{user_answer.question_id}">{user_answer.question.text}</label></h3>'
+        for answer_index, answer in enumerate(user_answer.question.answers):
+            response += (
+                f'<input type="{"checkbox" if user_answer.question.type == Question.QuestionTypes.MULTI else "radio"}"'
+                f'id="{answer.id}" name="{user_answer.question_id}" value="{answer.id}"'
+                f'{"checked" if answer in user_answer.answers else ""}>'
+                f'<label for="{answer.id}">{answer.text}</label><br>'
+            )
+            if answer_index == len(user_answer.question.answers) - 1:
+                response += '<br>'
+    response += '<input type="submit" value="Надіслати відповіді"></form>'
+    return response
+
+
+def run():
+    environment = create_templates_environment(TEMPLATES_PATH, auto_reload=False)
+    base_template = environment.get_template('base.html')
+    questions_template = environment.get_template('questions.html')
+
+    def before(user_answers):
+        return base_template.render(body=_legacy_show_questions(user_answers)).encode()
+
+    warm_renderer = QuestionsFragmentsRenderer(FragmentCache('benchmark'))
+
+    def render(user_answers, renderer: QuestionsFragmentsRenderer):
+        questions, checked_answers_ids = build_questions_views(user_answers)
+        return stream_template(
+            questions_template,
+            questions_fragments=renderer.render(environment, questions, checked_answers_ids),
+        )
+
+    def after_cold_cache(user_answers):
+        content = render(user_answers, QuestionsFragmentsRenderer(FragmentCache('benchmark')))
+        return b''.join(chunk.encode() for chunk in content)
+
+    def after_warm_cache(user_answers):
+        return b''.join(chunk.encode() for chunk in render(user_answers, warm_renderer))
+
+    def after_first_chunk(user_answers):
+        return next(iter(render(user_answers, warm_renderer))).encode()
+
+    def after_eager(user_answers):
+        questions, checked_answers_ids = build_questions_views(user_answers)
+        return questions_template.render(
+            questions_fragments=warm_renderer.render(environment, questions, checked_answers_ids),
+        ).encode()
+
+    print(
+        f'{"questions":>9} {"before us":>10} {"cold cache us":>14} {"warm cache us":>14} {"first chunk us":>15} '
+        f'{"eager us":>9}'
+    )
+    for questions_count in QUESTIONS_COUNTS:
+        user_answers = _user_answers(questions_count)
+        number = max(1, 2_000 // questions_count)
+        results = [
+            min(timeit.repeat(lambda: case(user_answers), number=number, repeat=5)) / number * 1e6
+            for case in (before, after_cold_cache, after_warm_cache, after_first_chunk, after_eager)
+        ]
+        print(
+            f'{questions_count:>9} {results[0]:>10.1f} {results[1]:>14.1f} {results[2]:>14.1f} {results[3]:>15.1f} '
+            f'{results[4]:>9.1f}'
+        )
+        if after_cold_cache(user_answers) != after_warm_cache(user_answers):
+            raise RuntimeError(f'Cached fragments render differently for {questions_count} questions')
+        if after_eager(user_answers) != after_warm_cache(user_answers):
+            raise RuntimeError(f'Eager and streamed pages differ for {questions_count} questions')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,56 @@
+# Run from the repository root: python -m benchmarks.questions_sampling
+import time
+import timeit
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from adapters.repository.questions_repo import QuestionsRepository
+from models import Question
+from service_layer.questions_pool import QuestionsPool
+
+QUESTIONS_COUNTS = (1_000, 100_000, 1_000_000)
+INSERT_BATCH_SIZE = 50_000
+SAMPLES_NUMBER = 200
+
+
+def _populate(db_session: Session, questions_count: int):
+    for batch_start in range(0, questions_count, INSERT_BATCH_SIZE):
+        db_session.execute(insert(Question), [
+            {'text': f'Питання {index}', 'type': 'multi' if index % 2 else 'single'}
+            for index in range(batch_start, min(batch_start + INSERT_BATCH_SIZE, questions_count))
+        ])
+    db_session.commit()
+
+
+def run():
+    print(f'{"questions":>9} {"order by random() us":>21} {"pool load ms":>13} {"pool sample us":>15}')
+    for questions_count in QUESTIONS_COUNTS:
+        engine = create_engine('sqlite://')
+        Question.__table__.create(engine)
+        with Session(engine) as db_session:
+            _populate(db_session, questions_count)
+            questions_repo = QuestionsRepository(db_session)
+            order_by_random_query = select(Question.id).order_by(func.random()).limit(3)
+            number = max(1, SAMPLES_NUMBER * 1_000 // questions_count)
+            order_by_random_seconds = min(timeit.repeat(
+                lambda: db_session.scalars(order_by_random_query).all(), number=number, repeat=3,
+            )) / number
+
+            questions_pool = QuestionsPool(test_size=3)
+            started_at = time.perf_counter()
+            questions_pool.refresh(questions_repo)
+            load_seconds = time.perf_counter() - started_at
+            assert questions_pool.size == questions_count
+            pool_seconds = min(timeit.repeat(
+                lambda: questions_pool.sample(questions_repo), number=SAMPLES_NUMBER, repeat=3,
+            )) / SAMPLES_NUMBER
+        engine.dispose()
+        print(
+            f'{questions_count:>9} {order_by_random_seconds * 1e6:>21.1f} {load_seconds * 1e3:>13.1f}'
+            f' {pool_seconds * 1e6:>15.1f}'
+        )
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,71 @@
+# Run from the repository root: python -m benchmarks.requests
+import io
+import os
+import tempfile
+import time
+
+from wsgi_application.request import RequestCreator
+from wsgi_application.routing import Route, RoutesTree
+from wsgi_application.sessions import FilesystemSessionsBackend
+
+DURATION_SECONDS = 2.0
+
+
+class CountingSessionsBackend(FilesystemSessionsBackend):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get_session_data(self, session_id: str) -> dict:
+        self.reads += 1
+        return super().get_session_data(session_id)
+
+
+def _environ(path: str, method: str, body: bytes = b'') -> dict:
+    return {
+        'PATH_INFO': path,
+        'REQUEST_METHOD': method,
+        'QUERY_STRING': 'page=1&sort=name',
+        'HTTP_COOKIE': 'session=0123456789abcdef0123456789abcdef; theme=dark',
+        'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+    }
+
+
+def _not_found(request_creator: RequestCreator, routes_tree: RoutesTree):
+    request = request_creator.create_request(_environ('/missing', 'GET'))
+    routes_tree.match(request.path, request.method)
+
+
+def _login(request_creator: RequestCreator, routes_tree: RoutesTree):
+    request = request_creator.create_request(_environ('/login', 'POST', b'username=John+Doe'))
+    routes_tree.match(request.path, request.method)
+    request.body.get('username')
+
+
+def _requests_per_second(case, request_creator: RequestCreator, routes_tree: RoutesTree) -> float:
+    requests = 0
+    started_at = time.perf_counter()
+    while (elapsed := time.perf_counter() - started_at) < DURATION_SECONDS:
+        for _ in range(100):
+            case(request_creator, routes_tree)
+        requests += 100
+    return requests / elapsed
+
+
+def run():
+    routes_tree = RoutesTree()
+    routes_tree.add_route(Route(methods=['POST'], handler=lambda: None, path='/login'))
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        sessions_backend = CountingSessionsBackend()
+        request_creator = RequestCreator(sessions_backend)
+        for name, case in (('404', _not_found), ('/login', _login)):
+            sessions_backend.reads = 0
+            requests_per_second = _requests_per_second(case, request_creator, routes_tree)
+            print(f'{name:>8}: {requests_per_second:>10.0f} req/s, session backend reads: {sessions_backend.reads}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,45 @@
+# Run from the repository root: python -m benchmarks.routing
+import timeit
+
+from wsgi_application.routing import Route, RoutesTree
+
+ROUTES_COUNTS = (5, 50, 500, 5000)
+LOOKUPS = 200_000
+
+
+def _handler():
+    pass
+
+
+def build_tree(routes_count: int) -> RoutesTree:
+    tree = RoutesTree()
+    for index in range(routes_count):
+        if index % 2:
+            path = f'/section_{index}/items/{{item_id:int}}'
+        else:
+            path = f'/section_{index}/page'
+        tree.add_route(Route(methods=['GET'], handler=_handler, path=path))
+    return tree
+
+
+def run():
+    print(f'{"routes":>8} {"static ns/lookup":>18} {"param ns/lookup":>17} {"405 ns/lookup":>15} {"404 ns/lookup":>15}')
+    for routes_count in ROUTES_COUNTS:
+        tree = build_tree(routes_count)
+        static_path = f'/section_{routes_count - 2}/page'
+        parameter_path = f'/section_{routes_count - 1}/items/42'
+        cases = (
+            (static_path, 'GET'),
+            (parameter_path, 'GET'),
+            (static_path, 'POST'),
+            ('/unknown/path', 'GET'),
+        )
+        timings = []
+        for path, method in cases:
+            seconds = min(timeit.repeat(lambda: tree.match(path, method), number=LOOKUPS, repeat=3))
+            timings.append(seconds / LOOKUPS * 1e9)
+        print(f'{routes_count:>8} {timings[0]:>18.0f} {timings[1]:>17.0f} {timings[2]:>15.0f} {timings[3]:>15.0f}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,52 @@
+# Run from the repository root: python -m benchmarks.sessions [sessions_count]
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+from wsgi_application.sessions import FilesystemSessionsBackend
+
+SESSIONS_COUNT = 1_000_000
+LOOKUPS_COUNT = 20_000
+SESSION_DATA = {'user_id': 42, 'questions_ids': list(range(3)), 'answered': {'1': 11, '2': 21}}
+
+
+def _measure(name: str, function, count: int):
+    started_at = time.perf_counter()
+    for _ in range(count):
+        function()
+    seconds = time.perf_counter() - started_at
+    print(f'{name:<32} {count:>9} {seconds * 1e6 / count:>10.1f} us/op {count / seconds:>12.0f} op/s')
+
+
+def run(sessions_count: int = SESSIONS_COUNT):
+    with tempfile.TemporaryDirectory() as directory:
+        writer = FilesystemSessionsBackend(directory, sweep_interval=None)
+        sessions_ids = [uuid.uuid4().hex for _ in range(sessions_count)]
+        sessions_ids_iterator = iter(sessions_ids)
+        _measure('write (populate)', lambda: writer.write_session_data(next(sessions_ids_iterator), SESSION_DATA),
+                 sessions_count)
+
+        uncached_reader = FilesystemSessionsBackend(directory, cache_size=0, sweep_interval=None)
+        _measure('read random, no cache', lambda: uncached_reader.get_session_data(random.choice(sessions_ids)),
+                 LOOKUPS_COUNT)
+        _measure('read unknown session', lambda: uncached_reader.get_session_data(uuid.uuid4().hex), LOOKUPS_COUNT)
+
+        cached_reader = FilesystemSessionsBackend(directory, cache_size=1024, sweep_interval=None)
+        hot_sessions_ids = random.sample(sessions_ids, 512)
+        _measure('read hot set, LRU cache', lambda: cached_reader.get_session_data(random.choice(hot_sessions_ids)),
+                 LOOKUPS_COUNT)
+        _measure('rewrite random', lambda: writer.write_session_data(random.choice(sessions_ids), SESSION_DATA),
+                 LOOKUPS_COUNT)
+
+        sweeper = FilesystemSessionsBackend(directory, ttl=3600, sweep_interval=None)
+        started_at = time.perf_counter()
+        removed_sessions_count = sweeper.sweep_expired_sessions()
+        print(f'sweep {sessions_count} files, removed {removed_sessions_count}: {time.perf_counter() - started_at:.2f}s')
+        print(f'files left in the root directory: {len(os.listdir(directory))}')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else SESSIONS_COUNT)
@@ -0,0 +1,79 @@
+# Run from the repository root: python -m benchmarks.templates
+import os
+import tempfile
+import time
+import timeit
+
+from jinja2 import Environment, FileSystemLoader
+
+from wsgi_application.templates import create_templates_environment, preload_templates
+
+TEMPLATES_PATH = 'static/templates'
+TEMPLATE_NAME = 'base.html'
+REPEAT = 20
+GET_TEMPLATE_NUMBER = 20_000
+
+
+def _first_request(environment: Environment) -> float:
+    started_at = time.perf_counter()
+    environment.get_template(TEMPLATE_NAME).render(body='<p>body</p>')
+    return time.perf_counter() - started_at
+
+
+def _forked_first_request(environment: Environment) -> float:
+    read_fd, write_fd = os.pipe()
+    if (pid := os.fork()) == 0:
+        os.close(read_fd)
+        os.write(write_fd, repr(_first_request(environment)).encode())
+        os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        seconds = float(f.read())
+    os.waitpid(pid, 0)
+    return seconds
+
+
+def _print(name: str, seconds: list[float]):
+    print(f'{name:<48} {min(seconds) * 1e3:>8.3f} ms (median {sorted(seconds)[len(seconds) // 2] * 1e3:.3f} ms)')
+
+
+def run():
+    with tempfile.TemporaryDirectory() as bytecode_cache_directory:
+        print('worker start-up + first request')
+        _print('before: default environment', [
+            _first_request(Environment(loader=FileSystemLoader(TEMPLATES_PATH))) for _ in range(REPEAT)
+        ])
+        _print('bytecode cache, cold', [
+            _first_request(create_templates_environment(TEMPLATES_PATH, False, tempfile.mkdtemp()))
+            for _ in range(REPEAT)
+        ])
+        _first_request(create_templates_environment(TEMPLATES_PATH, False, bytecode_cache_directory))
+        _print('bytecode cache, warm (another worker compiled it)', [
+            _first_request(create_templates_environment(TEMPLATES_PATH, False, bytecode_cache_directory))
+            for _ in range(REPEAT)
+        ])
+        preload_seconds = []
+        first_request_seconds = []
+        for _ in range(REPEAT):
+            started_at = time.perf_counter()
+            environment = create_templates_environment(TEMPLATES_PATH, False, bytecode_cache_directory)
+            preload_templates(environment)
+            preload_seconds.append(time.perf_counter() - started_at)
+            first_request_seconds.append(_forked_first_request(environment))
+        _print('preload in master (once, before fork)', preload_seconds)
+        _print('preloaded, first request in forked worker', first_request_seconds)
+
+        print(f'get_template per request ({GET_TEMPLATE_NUMBER} calls)')
+        for name, environment in (
+            ('auto_reload=True, cache_size=400', create_templates_environment(TEMPLATES_PATH)),
+            ('auto_reload=False, cache_size=1000', create_templates_environment(TEMPLATES_PATH, False, None, 1000)),
+        ):
+            environment.get_template(TEMPLATE_NAME)
+            seconds = min(timeit.repeat(
+                lambda: environment.get_template(TEMPLATE_NAME), number=GET_TEMPLATE_NUMBER, repeat=3,
+            ))
+            print(f'{name:<48} {seconds / GET_TEMPLATE_NUMBER * 1e6:>8.3f} us')
+
+
+if __name__ == '__main__':
+    run()
@@ -1,5 +1,10 @@
-from database.base import session_maker
-from wsgi_application.database import DatabaseSessionMakerABC
+from time import perf_counter
+
+from sqlalchemy import event
+
+from database.base import engine, session_maker
+from wsgi_application.database import DatabaseSessionMakerABC, get_current_query_statistics
+from wsgi_application.metrics import MetricsRegistry
 
 
 class DatabaseSessionMaker(DatabaseSessionMakerABC):
@@ -15,3 +20,35 @@ class DatabaseSessionMaker(DatabaseSessionMakerABC):
 
     def close(self):
         self.__session.close()
+
+
+@event.listens_for(engine, 'before_cursor_execute')
+def _before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    context.query_started_at = perf_counter()
+
+
+@event.listens_for(engine, 'after_cursor_execute')
+def _after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    if query_statistics := get_current_query_statistics():
+        query_statistics.record(statement, perf_counter() - context.query_started_at)
+
+
+def register_connection_pool_metrics(registry: MetricsRegistry):
+    checked_out_connections = registry.gauge(
+        'database_pool_checked_out_connections', 'Database connections currently checked out of the pool',
+    )
+    checkouts = registry.counter('database_pool_checkouts_total', 'Database connections checked out of the pool')
+    opened_connections = registry.counter('database_pool_connects_total', 'Database connections opened by the pool')
+
+    @event.listens_for(engine, 'checkout')
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out_connections.inc()
+        checkouts.inc()
+
+    @event.listens_for(engine, 'checkin')
+    def _checkin(dbapi_connection, connection_record):
+        checked_out_connections.dec()
+
+    @event.listens_for(engine, 'connect')
+    def _connect(dbapi_connection, connection_record):
+        opened_connections.inc()
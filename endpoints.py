@@ -2,13 +2,18 @@ from jinja2 import Environment
 
 import service_layer.exceptions
 from authentication import authentication_required
-from presentation import show_questions, show_user_results
+from presentation import QuestionsFragmentsRenderer, build_questions_views, build_user_results_views
 from providers import provide_uow
+from service_layer.answer_keys import AnswerKeysCache
+from service_layer.questions_pool import QuestionsPool
 from service_layer.testing import GetUserTestAnswers, FinishUserTest
 from service_layer.unit_of_work import AbstractUnitOfWork
 from service_layer.users import UserLoginService, GetUserTestsService
-from wsgi_application.application import Request, SimpleResponse, ResponseABC
+from wsgi_application.application import Request, SimpleResponse, StreamingResponse, ResponseABC
 from wsgi_application.routing import Router
+from wsgi_application.templates import stream_template
+
+STREAMED_QUESTIONS_MIN_COUNT = 200
 
 router = Router()
 
@@ -37,18 +42,40 @@ def login(request: Request, uow: AbstractUnitOfWork, environment: Environment) -
 @router.route('/questions', methods=['GET'])
 @authentication_required
 @provide_uow
-def get_questions(request: Request, uow: AbstractUnitOfWork, environment: Environment) -> ResponseABC:
-    get_user_test_answers_service = GetUserTestAnswers(uow)
-    user_answers = get_user_test_answers_service(request.session.get('username'))
-    response = environment.get_template('base.html').render(body=show_questions(user_answers))
-    return SimpleResponse(request, 200, response)
+def get_questions(
+    request: Request,
+    uow: AbstractUnitOfWork,
+    environment: Environment,
+    questions_fragments_renderer: QuestionsFragmentsRenderer,
+    questions_pool: QuestionsPool,
+) -> ResponseABC:
+    get_user_test_answers_service = GetUserTestAnswers(uow, questions_pool)
+    try:
+        user_answers = get_user_test_answers_service(request.session.get('username'))
+    except service_layer.exceptions.UserNotFoundException:
+        content = '<a href="http://uni_site.com/login_form.html">Користувача не знайдено, увійдіть знову</a>'
+        return SimpleResponse(request, 404, environment.get_template('base.html').render(body=content))
+    except service_layer.exceptions.NotEnoughQuestionsException:
+        content = '<a href="http://uni_site.com">Недостатньо запитань для тесту, спробуйте пізніше</a>'
+        return SimpleResponse(request, 503, environment.get_template('base.html').render(body=content))
+    questions, checked_answers_ids = build_questions_views(user_answers)
+    questions_template = environment.get_template('questions.html')
+    questions_fragments = questions_fragments_renderer.render(environment, questions, checked_answers_ids)
+    if len(questions) < STREAMED_QUESTIONS_MIN_COUNT:
+        return SimpleResponse(request, 200, questions_template.render(questions_fragments=questions_fragments))
+    return StreamingResponse(request, 200, stream_template(questions_template, questions_fragments=questions_fragments))
 
 
 @router.route('/process_answers', methods=['POST'])
 @authentication_required
 @provide_uow
-def process_answers(request: Request, uow: AbstractUnitOfWork, environment: Environment) -> ResponseABC:
-    finish_user_test_service = FinishUserTest(uow)
+def process_answers(
+    request: Request,
+    uow: AbstractUnitOfWork,
+    environment: Environment,
+    answer_keys_cache: AnswerKeysCache,
+) -> ResponseABC:
+    finish_user_test_service = FinishUserTest(uow, answer_keys_cache)
     try:
         correct_answers_percentage = finish_user_test_service(request.session['username'], request.body)
         content = (
@@ -70,6 +97,6 @@ def process_answers(request: Request, uow: AbstractUnitOfWork, environment: Envi
 def get_user_results(request: Request, uow: AbstractUnitOfWork, environment: Environment) -> ResponseABC:
     username = request.session['username']
     get_user_tests_service = GetUserTestsService(uow)
-    user_tests = get_user_tests_service(username)
-    response = environment.get_template('base.html').render(body=show_user_results(username, user_tests))
-    return SimpleResponse(request, 200, response)
+    user_tests = build_user_results_views(get_user_tests_service(username))
+    content = environment.get_template('results.html').render(username=username, user_tests=user_tests)
+    return SimpleResponse(request, 200, content)
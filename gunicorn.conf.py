@@ -1,11 +1,44 @@
+import os
+
 from gunicorn import glogging
 
+from wsgi_application.metrics import clear_metrics_directory, mark_process_dead
+
+METRICS_DIRECTORY = os.environ.get('UNI_METRICS_DIRECTORY', '/tmp/uni_wsgi_metrics')
+
 bind = '0.0.0.0:8000'
 workers = 1
-reload = True
+reload = os.environ.get('UNI_RELOAD') == '1'
+preload_app = not reload
 
 accesslog = '-'
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" db=%({wsgi_application.db_queries}e)s'
 
 logging_format = '%(asctime)s [%(levelname)s] %(message)s'
 glogging.Logger.access_fmt = logging_format
 glogging.Logger.error_fmt = logging_format
+
+
+def on_starting(server):
+    clear_metrics_directory(METRICS_DIRECTORY)
+
+
+def post_fork(server, worker):
+    from database.base import engine
+
+    engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    mark_process_dead(METRICS_DIRECTORY, worker.pid)
+
+
+def worker_exit(server, worker):
+    worker.wsgi.logger.stop()
+    database_statistics = worker.wsgi.database_sessions_statistics
+    logging_statistics = worker.wsgi.logger.queue_statistics
+    server.log.info(
+        f'Worker {worker.pid} served {database_statistics.requests} requests, '
+        f'{database_statistics.requests_without_database_session} of them without a database session; '
+        f'queued {logging_statistics.queued} log records, dropped {logging_statistics.dropped}'
+    )
@@ -1,26 +1,6 @@
 from gunicorn.app.wsgiapp import WSGIApplication
 
-from database.wsgi_sessionmaker import DatabaseSessionMaker
-from endpoints import router
-from sessions_backend import RedisSessionsBackend
-from wsgi_application.application import Application
-
-
-def create_application() -> Application:
-    app = Application()
-
-    app.include_router(router)
-
-    app.set_authentication_failed_redirect_path('http://uni_site.com/login_form.html')
-
-    app.set_database_session_maker(DatabaseSessionMaker)
-
-    app.set_sessions_backend(RedisSessionsBackend(host='localhost', port=6379, db=0))
-
-    app.set_templates_path('static/templates')
-
-    return app
-
+from application_factory import create_application
 
 application = create_application()
 
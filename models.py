@@ -1,7 +1,7 @@
 from enum import Enum
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, func, null, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, func, null, Table, event, inspect, update
+from sqlalchemy.orm import relationship, Session
 
 from database.base import Base
 
@@ -70,6 +70,7 @@ class Question(IdFieldMixin):
 
     text = Column(String, nullable=False)
     type = Column(String, nullable=False, default=QuestionTypes.SINGLE)
+    version = Column(Integer, nullable=False, default=1, server_default='1')
 
     answers = relationship('Answer', back_populates='question', cascade='all, delete')
     user_answers = relationship('UserAnswer', back_populates='question')
@@ -84,3 +85,24 @@ class Answer(IdFieldMixin):
 
     question = relationship('Question', back_populates='answers')
     user_answers = relationship('UserAnswer', secondary=UserAnswersLinkAnswers, back_populates='answers')
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_changed_questions_versions(session: Session, flush_context):
+    changed_questions_ids = set()
+    for instance in session.deleted:
+        if isinstance(instance, Answer):
+            changed_questions_ids.add(instance.question_id)
+    for instance in (*session.new, *session.dirty):
+        if isinstance(instance, Answer) and session.is_modified(instance, include_collections=False):
+            changed_questions_ids.add(instance.question_id)
+            changed_questions_ids.update(inspect(instance).attrs.question_id.history.deleted)
+        elif isinstance(instance, Question) and instance not in session.new and session.is_modified(
+            instance, include_collections=False,
+        ):
+            changed_questions_ids.add(instance.id)
+    changed_questions_ids.discard(None)
+    if changed_questions_ids:
+        session.connection().execute(
+            update(Question).where(Question.id.in_(changed_questions_ids)).values(version=Question.version + 1),
+        )
@@ -1,31 +1,81 @@
+from datetime import datetime
+from typing import Iterator, NamedTuple, Optional
+
+from jinja2 import Environment
+
 from models import UserAnswer, Question, UserTest
+from wsgi_application.fragments import FragmentCache
+
+CHECKED_MARKER = '\x00'
+
+
+class AnswerView(NamedTuple):
+    id: int
+    text: str
+
+
+class QuestionView(NamedTuple):
+    id: int
+    text: str
+    input_type: str
+    answers: tuple[AnswerView, ...]
+    version: int
+
 
+class UserTestResultView(NamedTuple):
+    finished_at: Optional[datetime]
+    result: Optional[int]
 
-def show_questions(user_answers: list[UserAnswer]) -> str:
-    response = '<form action="/process_answers" method="post">'
+
+def build_questions_views(user_answers: list[UserAnswer]) -> tuple[list[QuestionView], set[int]]:
+    questions = []
+    checked_answers_ids = set()
     for user_answer in user_answers:
-        response += show_question(user_answer)
-    response += '<input type="submit" value="Надіслати відповіді"></form>'
-    return response
-
-
-def show_question(user_answer: UserAnswer) -> str:
-    response = f'<h3><label for="{user_answer.question_id}">{user_answer.question.text}</label></h3>'
-    for answer_index, answer in enumerate(user_answer.question.answers):
-        response += (
-            f'<input type="{"checkbox" if user_answer.question.type == Question.QuestionTypes.MULTI else "radio"}"'
-            f'id="{answer.id}" name="{user_answer.question_id}" value="{answer.id}"'
-            f'{"checked" if answer in user_answer.answers else ""}>'
-            f'<label for="{answer.id}">{answer.text}</label><br>'
-        )
-        if answer_index == len(user_answer.question.answers) - 1:
-            response += '<br>'
-    return response
+        question = user_answer.question
+        questions.append(QuestionView(
+            user_answer.question_id,
+            question.text,
+            'checkbox' if question.type == Question.QuestionTypes.MULTI else 'radio',
+            tuple([AnswerView(answer.id, answer.text) for answer in question.answers]),
+            question.version,
+        ))
+        checked_answers_ids.update(answer.id for answer in user_answer.answers)
+    return questions, checked_answers_ids
+
+
+def build_user_results_views(user_tests: list[UserTest]) -> list[UserTestResultView]:
+    return [UserTestResultView(user_test.finished_at, user_test.result) for user_test in user_tests]
 
 
-def show_user_results(username:str, user_tests: list[UserTest]) -> str:
-    response = f'<h1>{username}, результати:<br></h1>'
-    for user_test in user_tests:
-        response += f'Дата та час: {user_test.finished_at}, Результат: {user_test.result}%<br>'
-    response += '<br><a href="http://uni_site.com">На головну</a>'
-    return response
+class QuestionsFragmentsRenderer:
+    def __init__(self, fragment_cache: FragmentCache):
+        self.fragment_cache = fragment_cache
+
+    def render(
+        self, environment: Environment, questions: list[QuestionView], checked_answers_ids: set[int],
+    ) -> Iterator[str]:
+        question_macro = None
+        for question in questions:
+            if (fragment_parts := self.fragment_cache.get((question.id, question.version))) is None:
+                question_macro = question_macro or environment.get_template('macros.html').module.question
+                fragment_parts = self.__render_fragment(question_macro, question)
+            yield self.__overlay_checked_answers(question, fragment_parts, checked_answers_ids)
+
+    def __render_fragment(self, question_macro, question: QuestionView) -> tuple[str, ...]:
+        answers_ids = {answer.id for answer in question.answers}
+        fragment_parts = tuple(str(question_macro(question, answers_ids, CHECKED_MARKER)).split(CHECKED_MARKER))
+        self.fragment_cache.set(
+            (question.id, question.version), fragment_parts, sum(len(part.encode()) for part in fragment_parts),
+        )
+        return fragment_parts
+
+    @staticmethod
+    def __overlay_checked_answers(
+        question: QuestionView, fragment_parts: tuple[str, ...], checked_answers_ids: set[int],
+    ) -> str:
+        chunks = [fragment_parts[0]]
+        for answer, fragment_part in zip(question.answers, fragment_parts[1:]):
+            if answer.id in checked_answers_ids:
+                chunks.append(' checked')
+            chunks.append(fragment_part)
+        return ''.join(chunks)
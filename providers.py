@@ -3,13 +3,14 @@ from typing import Callable
 
 from service_layer.unit_of_work import SqlAlchemyUnitOfWork
 from wsgi_application.request import Request
+from wsgi_application.tracing import span
 
 
 def provide_uow(func: Callable):
     @functools.wraps(func)
     def _provide_uow(request: Request, database_session, *args, **kwargs):
         uow = SqlAlchemyUnitOfWork(database_session)
-        with uow:
+        with span('db'), uow:
             return func(request, uow, *args, **kwargs)
 
     return _provide_uow
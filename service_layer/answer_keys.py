@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from adapters.repository.answers_repo import AnswersRepositoryABC
+from models import Question
+
+
+class AnswerKey(NamedTuple):
+    version: int
+    is_multi_choice: bool
+    answers_ids: frozenset[int]
+    correct_answers_ids: frozenset[int]
+
+    def is_correct(self, given_answers_ids: frozenset[int]) -> bool:
+        if self.is_multi_choice:
+            return given_answers_ids == self.correct_answers_ids
+        return len(given_answers_ids) == 1 and given_answers_ids <= self.correct_answers_ids
+
+
+class AnswerKeysCache:
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__answer_keys: OrderedDict[int, AnswerKey] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get_answer_keys(
+        self, answers_repo: AnswersRepositoryABC, questions_versions: dict[int, int],
+    ) -> dict[int, AnswerKey]:
+        answer_keys = {}
+        with self.__lock:
+            for question_id, version in questions_versions.items():
+                answer_key = self.__answer_keys.get(question_id)
+                if answer_key is not None and answer_key.version == version:
+                    self.__answer_keys.move_to_end(question_id)
+                    answer_keys[question_id] = answer_key
+            self.hits += len(answer_keys)
+            self.misses += len(questions_versions) - len(answer_keys)
+        if len(answer_keys) == len(questions_versions):
+            return answer_keys
+        loaded_answer_keys = self.__load(
+            answers_repo, [question_id for question_id in questions_versions if question_id not in answer_keys],
+        )
+        with self.__lock:
+            self.__answer_keys.update(loaded_answer_keys)
+            while len(self.__answer_keys) > self.max_size:
+                self.__answer_keys.popitem(last=False)
+        answer_keys.update(loaded_answer_keys)
+        return answer_keys
+
+    def clear(self):
+        with self.__lock:
+            self.__answer_keys.clear()
+
+    @staticmethod
+    def __load(answers_repo: AnswersRepositoryABC, questions_ids: list[int]) -> dict[int, AnswerKey]:
+        questions = {}
+        for row in answers_repo.get_questions_answers(questions_ids):
+            question_type, version, answers_ids, correct_answers_ids = questions.setdefault(
+                row.question_id, (row.question_type, row.question_version, set(), set()),
+            )
+            if row.answer_id is not None:
+                answers_ids.add(row.answer_id)
+                if row.is_correct:
+                    correct_answers_ids.add(row.answer_id)
+        return {
+            question_id: AnswerKey(
+                version,
+                question_type == Question.QuestionTypes.MULTI,
+                frozenset(answers_ids),
+                frozenset(correct_answers_ids),
+            )
+            for question_id, (question_type, version, answers_ids, correct_answers_ids) in questions.items()
+        }
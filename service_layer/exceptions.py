@@ -6,3 +6,13 @@ class NotAllQuestionsAnsweredException(Exception):
 class NoUnfinishedUserTestException(Exception):
     def __init__(self):
         super().__init__('No unfinished user\'s test found')
+
+
+class NotEnoughQuestionsException(Exception):
+    def __init__(self):
+        super().__init__('Not enough questions to create a test')
+
+
+class UserNotFoundException(Exception):
+    def __init__(self):
+        super().__init__('User not found')
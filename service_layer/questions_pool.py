@@ -0,0 +1,146 @@
+import os
+import random
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Callable, Optional
+
+from adapters.repository.questions_repo import QuestionsRepositoryABC
+from models import Question
+from service_layer.exceptions import NotEnoughQuestionsException
+from service_layer.unit_of_work import AbstractUnitOfWork
+from wsgi_application.logging import LoggerABC
+
+
+class QuestionsPool:
+    def __init__(
+        self,
+        test_size: int = 3,
+        questions_per_type: Optional[dict[str, int]] = None,
+        refresh_interval: float = 60.0,
+        full_refresh_interval: Optional[float] = None,
+        max_sampling_attempts: int = 3,
+        create_unit_of_work: Optional[Callable[[], AbstractUnitOfWork]] = None,
+        logger: Optional[LoggerABC] = None,
+    ):
+        if questions_per_type is not None and sum(questions_per_type.values()) != test_size:
+            raise ValueError('Questions per type must add up to the test size')
+        self.test_size = test_size
+        self.questions_per_type = questions_per_type
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.max_sampling_attempts = max_sampling_attempts
+        self.create_unit_of_work = create_unit_of_work
+        self.logger = logger
+        self.__questions_ids: dict[str, array] = {
+            question_type.value: array('q') for question_type in Question.QuestionTypes
+        }
+        self.__max_question_id = 0
+        self.__refreshed_at: Optional[float] = None
+        self.__fully_refreshed_at: Optional[float] = None
+        self.__lock = threading.Lock()
+        self.__refresh_lock = threading.Lock()
+        self.__refresher_pid: Optional[int] = None
+        self.__refresher_stopped = threading.Event()
+
+    @property
+    def size(self) -> int:
+        with self.__lock:
+            return sum(len(questions_ids) for questions_ids in self.__questions_ids.values())
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__fully_refreshed_at is not None
+
+    def sample(self, questions_repo: QuestionsRepositoryABC) -> Optional[list[int]]:
+        self.start_refresher()
+        if not self.is_loaded:
+            return None
+        for _ in range(self.max_sampling_attempts):
+            questions_ids = self.__sample_ids()
+            existing_questions_ids = questions_repo.get_existing_questions_ids(questions_ids)
+            if len(existing_questions_ids) == len(questions_ids):
+                return questions_ids
+            self.__discard(set(questions_ids) - existing_questions_ids)
+        return None
+
+    def refresh(self, questions_repo: QuestionsRepositoryABC, force: bool = False):
+        with self.__refresh_lock:
+            now = time.monotonic()
+            is_full_refresh = force or self.__fully_refreshed_at is None or (
+                self.full_refresh_interval is not None and now - self.__fully_refreshed_at > self.full_refresh_interval
+            )
+            if not is_full_refresh and now - self.__refreshed_at < self.refresh_interval:
+                return
+            after_id = 0 if is_full_refresh else self.__max_question_id
+            new_questions_ids = {
+                question_type: array('q', questions_repo.get_questions_ids(question_type, after_id=after_id))
+                for question_type in self.__questions_ids
+            }
+            max_question_id = max((ids[-1] for ids in new_questions_ids.values() if ids), default=after_id)
+            with self.__lock:
+                if is_full_refresh:
+                    self.__questions_ids = new_questions_ids
+                else:
+                    for question_type, ids in new_questions_ids.items():
+                        self.__questions_ids[question_type].extend(ids)
+            self.__max_question_id = max_question_id
+            self.__refreshed_at = now
+            if is_full_refresh:
+                self.__fully_refreshed_at = now
+
+    def start_refresher(self):
+        if self.create_unit_of_work is None or self.__refresher_pid == os.getpid():
+            return
+        self.__refresher_pid = os.getpid()
+        self.__refresher_stopped = threading.Event()
+        threading.Thread(target=self.__refresh_periodically, name='questions_pool_refresher', daemon=True).start()
+
+    def stop_refresher(self):
+        self.__refresher_stopped.set()
+
+    def __refresh_periodically(self):
+        refresher_stopped = self.__refresher_stopped
+        while not refresher_stopped.is_set():
+            try:
+                with self.create_unit_of_work() as uow:
+                    self.refresh(uow.questions_repo)
+            except Exception:
+                if self.logger:
+                    self.logger.exception('Questions pool refresh failed')
+            refresher_stopped.wait(self.refresh_interval)
+
+    def __sample_ids(self) -> list[int]:
+        with self.__lock:
+            questions_ids = self.__questions_ids
+            if self.questions_per_type is None:
+                return self.__sample_from(list(questions_ids.values()), self.test_size)
+            sampled_ids = []
+            for question_type, questions_count in self.questions_per_type.items():
+                sampled_ids.extend(self.__sample_from([questions_ids.get(question_type, array('q'))], questions_count))
+        random.shuffle(sampled_ids)
+        return sampled_ids
+
+    @staticmethod
+    def __sample_from(questions_ids_groups: list[array], questions_count: int) -> list[int]:
+        total_count = sum(len(questions_ids) for questions_ids in questions_ids_groups)
+        if total_count < questions_count:
+            raise NotEnoughQuestionsException
+        sampled_ids = []
+        for index in random.sample(range(total_count), questions_count):
+            for questions_ids in questions_ids_groups:
+                if index < len(questions_ids):
+                    sampled_ids.append(questions_ids[index])
+                    break
+                index -= len(questions_ids)
+        return sampled_ids
+
+    def __discard(self, questions_ids: set[int]):
+        with self.__lock:
+            for question_id in questions_ids:
+                for ids in self.__questions_ids.values():
+                    index = bisect_left(ids, question_id)
+                    if index < len(ids) and ids[index] == question_id:
+                        del ids[index]
+                        break
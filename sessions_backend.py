@@ -1,24 +1,328 @@
+import abc
+import enum
 import json
-from typing import Optional
+import marshal
+import os
+import threading
+import time
+import warnings
+from functools import lru_cache
+from typing import Any, Callable, Optional, Union
 
 import redis
+import redis.asyncio
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
 
-from wsgi_application.sessions import SessionsBackendABC
+from wsgi_application.sessions import AsyncSessionsBackendABC, Session, SessionsBackendABC, is_ttl_refresh_due
 
 
-class RedisSessionsBackend(SessionsBackendABC):
-    def __init__(self, host: str, port: int, db: int, password: Optional[str] = None):
-        self.redis = redis.Redis(host=host, port=port, db=db, password=password)
+class SessionSerializerABC(abc.ABC):
+    @abc.abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def loads(self, value: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonSessionSerializer(SessionSerializerABC):
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode()
+
+    def loads(self, value: bytes) -> Any:
+        return json.loads(value)
+
+
+class MarshalSessionSerializer(SessionSerializerABC):
+    def dumps(self, value: Any) -> bytes:
+        return marshal.dumps(value)
+
+    def loads(self, value: bytes) -> Any:
+        return marshal.loads(value)
+
+
+INVALIDATING_KEYSPACE_EVENTS = frozenset((b'set', b'del', b'hset', b'hdel', b'expired', b'evicted', b'rename_from'))
+REQUIRED_KEYSPACE_EVENTS_FLAGS = frozenset('Kgh$xe')
+ALL_KEYSPACE_EVENTS_ALIAS_FLAGS = frozenset('g$lshzxetd')
+
+
+RedisPipeline = Union[redis.client.Pipeline, redis.asyncio.client.Pipeline]
+
+
+class RedisSessionStorage(enum.Enum):
+    HASH = 'hash'
+    STRING = 'string'
+
+
+def get_keyspace_events_flags(notify_keyspace_events: str) -> frozenset[str]:
+    flags = set(notify_keyspace_events)
+    if 'A' in flags:
+        flags.update(ALL_KEYSPACE_EVENTS_ALIAS_FLAGS)
+    return frozenset(flags)
+
+
+def _get_expires_at(pttl: int) -> Optional[float]:
+    return time.time() + pttl / 1000 if pttl > 0 else None
+
+
+@lru_cache
+def get_connection_pool(
+    host: str,
+    port: int,
+    db: int,
+    password: Optional[str] = None,
+    max_connections: int = 50,
+    socket_timeout: float = 0.5,
+    socket_connect_timeout: float = 0.5,
+    retries: int = 2,
+) -> redis.ConnectionPool:
+    return redis.ConnectionPool(
+        host=host,
+        port=port,
+        db=db,
+        password=password,
+        max_connections=max_connections,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=socket_connect_timeout,
+        socket_keepalive=True,
+        health_check_interval=30,
+        retry=Retry(ExponentialBackoff(cap=0.5, base=0.01), retries),
+        retry_on_error=[redis.ConnectionError, redis.TimeoutError],
+    )
+
+
+class RedisSessionsCommands:
+    def __init__(
+        self,
+        ttl: Optional[int],
+        storage: RedisSessionStorage,
+        serializer: SessionSerializerABC,
+        key_prefix: str,
+        ttl_refresh_interval: float,
+    ):
+        self.ttl = ttl
+        self.ttl_refresh_interval = ttl_refresh_interval
+        self.storage = storage
+        self.serializer = serializer
+        self.key_prefix = key_prefix
+        self.supports_partial_updates = storage is RedisSessionStorage.HASH
+
+    def is_session_ttl_refresh_due(self, session: Session) -> bool:
+        return is_ttl_refresh_due(session, self.ttl, self.ttl_refresh_interval)
+
+    def _get_key(self, session_id: str) -> str:
+        return f'{self.key_prefix}{session_id}'
+
+    def _queue_load(self, pipeline: RedisPipeline, key: str):
+        if self.storage is RedisSessionStorage.STRING:
+            pipeline.get(key)
+        else:
+            pipeline.hgetall(key)
+        pipeline.pttl(key)
+
+    def _build_session(
+        self, session_id: str, existing_session_data: Optional[Union[bytes, dict]], pttl: int,
+    ) -> Session:
+        if not existing_session_data:
+            session_data = {}
+        elif self.storage is RedisSessionStorage.STRING:
+            session_data = self.serializer.loads(existing_session_data)
+        else:
+            session_data = {
+                field.decode(): self.serializer.loads(value) for field, value in existing_session_data.items()
+            }
+        session = Session(session_id, session_data)
+        session.expires_at = _get_expires_at(pttl)
+        return session
+
+    def _create_write_pipeline(self, client: Union[redis.Redis, redis.asyncio.Redis]) -> RedisPipeline:
+        return client.pipeline(transaction=self.storage is RedisSessionStorage.HASH)
+
+    def _queue_write(self, pipeline: RedisPipeline, key: str, data: dict):
+        if self.storage is RedisSessionStorage.STRING:
+            pipeline.set(key, self.serializer.dumps(data), ex=self.ttl)
+            return
+        pipeline.delete(key)
+        if data:
+            pipeline.hset(key, mapping={field: self.serializer.dumps(value) for field, value in data.items()})
+            self._queue_expire(pipeline, key)
+
+    def _queue_update(self, pipeline: RedisPipeline, key: str, changed_data: dict, deleted_keys: set[str]):
+        if deleted_keys:
+            pipeline.hdel(key, *deleted_keys)
+        if changed_data:
+            pipeline.hset(key, mapping={field: self.serializer.dumps(value) for field, value in changed_data.items()})
+        self._queue_expire(pipeline, key)
+
+    def _queue_expire(self, pipeline: RedisPipeline, key: str):
+        if self.ttl:
+            pipeline.expire(key, self.ttl)
+
+
+class RedisSessionsBackend(RedisSessionsCommands, SessionsBackendABC):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int,
+        password: Optional[str] = None,
+        ttl: Optional[int] = 24 * 60 * 60,
+        storage: RedisSessionStorage = RedisSessionStorage.HASH,
+        serializer: SessionSerializerABC = JsonSessionSerializer(),
+        key_prefix: str = 'session:',
+        max_connections: int = 50,
+        socket_timeout: float = 0.5,
+        socket_connect_timeout: float = 0.5,
+        retries: int = 2,
+        ttl_refresh_interval: float = 60.0,
+    ):
+        super().__init__(ttl, storage, serializer, key_prefix, ttl_refresh_interval)
+        self.redis = redis.Redis(connection_pool=get_connection_pool(
+            host, port, db, password, max_connections, socket_timeout, socket_connect_timeout, retries,
+        ))
+        self.__invalidations_listener_pid: Optional[int] = None
 
     def get_session_data(self, session_id: str) -> dict:
+        return self.load_session(session_id).to_dict()
+
+    def load_session(self, session_id: str) -> Session:
         if not session_id:
-            return {}
-        existing_session_data = self.redis.get(session_id)
-        if existing_session_data:
-            return json.loads(existing_session_data)
-        return {}
+            return Session()
+        key = self._get_key(session_id)
+        pipeline = self.redis.pipeline(transaction=False)
+        self._queue_load(pipeline, key)
+        try:
+            existing_session_data, pttl = pipeline.execute()
+        except redis.ResponseError:
+            self.redis.delete(key)
+            return Session(session_id)
+        return self._build_session(session_id, existing_session_data, pttl)
+
+    def save_session(self, session: Session) -> Optional[str]:
+        slides_expiry = session.is_modified or self.is_session_ttl_refresh_due(session)
+        cookie_value = super().save_session(session)
+        if slides_expiry and self.ttl:
+            session.expires_at = time.time() + self.ttl
+        return cookie_value
 
     def write_session_data(self, session_id: str, data: dict):
         if not session_id:
             return
-        self.redis.set(session_id, json.dumps(data))
+        pipeline = self._create_write_pipeline(self.redis)
+        self._queue_write(pipeline, self._get_key(session_id), data)
+        pipeline.execute()
+
+    def update_session_data(self, session_id: str, changed_data: dict, deleted_keys: set[str]):
+        pipeline = self.redis.pipeline()
+        self._queue_update(pipeline, self._get_key(session_id), changed_data, deleted_keys)
+        pipeline.execute()
+
+    def refresh_session_ttl(self, session_id: str):
+        if self.ttl:
+            self.redis.expire(self._get_key(session_id), self.ttl)
+
+    def subscribe_to_invalidations(self, callback: Callable[[Optional[str]], None]) -> bool:
+        if self.__invalidations_listener_pid == os.getpid():
+            return True
+        try:
+            notify_keyspace_events = self.redis.config_get('notify-keyspace-events').get('notify-keyspace-events', '')
+        except redis.RedisError:
+            notify_keyspace_events = ''
+        if not REQUIRED_KEYSPACE_EVENTS_FLAGS <= get_keyspace_events_flags(notify_keyspace_events):
+            warnings.warn(
+                f'Redis notify-keyspace-events is "{notify_keyspace_events}" but must include '
+                f'"{"".join(sorted(REQUIRED_KEYSPACE_EVENTS_FLAGS))}", cached sessions will only expire by TTL',
+                RuntimeWarning,
+            )
+            return False
+        self.__invalidations_listener_pid = os.getpid()
+        threading.Thread(
+            target=self.__listen_to_invalidations, args=(callback,), name='sessions_invalidations', daemon=True,
+        ).start()
+        return True
+
+    def __listen_to_invalidations(self, callback: Callable[[Optional[str]], None]):
+        database = self.redis.connection_pool.connection_kwargs.get('db', 0)
+        channel_prefix = f'__keyspace@{database}__:{self.key_prefix}'
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.psubscribe(f'{channel_prefix}*')
+                callback(None)
+                while True:
+                    message = pubsub.get_message(timeout=30)
+                    if message and message['data'] in INVALIDATING_KEYSPACE_EVENTS:
+                        callback(message['channel'].decode()[len(channel_prefix):])
+            except redis.RedisError:
+                callback(None)
+                time.sleep(1)
+            finally:
+                pubsub.close()
+
+
+class AsyncRedisSessionsBackend(RedisSessionsCommands, AsyncSessionsBackendABC):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int,
+        password: Optional[str] = None,
+        ttl: Optional[int] = 24 * 60 * 60,
+        storage: RedisSessionStorage = RedisSessionStorage.HASH,
+        serializer: SessionSerializerABC = JsonSessionSerializer(),
+        key_prefix: str = 'session:',
+        max_connections: int = 50,
+        socket_timeout: float = 0.5,
+        socket_connect_timeout: float = 0.5,
+        retries: int = 2,
+        ttl_refresh_interval: float = 60.0,
+    ):
+        super().__init__(ttl, storage, serializer, key_prefix, ttl_refresh_interval)
+        self.redis = redis.asyncio.Redis(
+            host=host,
+            port=port,
+            db=db,
+            password=password,
+            max_connections=max_connections,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_connect_timeout,
+            socket_keepalive=True,
+            health_check_interval=30,
+            retry=AsyncRetry(ExponentialBackoff(cap=0.5, base=0.01), retries),
+            retry_on_error=[redis.ConnectionError, redis.TimeoutError],
+        )
+
+    async def get_session_data(self, session_id: str) -> dict:
+        return (await self.load_session(session_id)).to_dict()
+
+    async def load_session(self, session_id: str) -> Session:
+        if not session_id:
+            return Session()
+        key = self._get_key(session_id)
+        pipeline = self.redis.pipeline(transaction=False)
+        self._queue_load(pipeline, key)
+        try:
+            existing_session_data, pttl = await pipeline.execute()
+        except redis.ResponseError:
+            await self.redis.delete(key)
+            return Session(session_id)
+        return self._build_session(session_id, existing_session_data, pttl)
+
+    async def write_session_data(self, session_id: str, data: dict):
+        if not session_id:
+            return
+        pipeline = self._create_write_pipeline(self.redis)
+        self._queue_write(pipeline, self._get_key(session_id), data)
+        await pipeline.execute()
+
+    async def update_session_data(self, session_id: str, changed_data: dict, deleted_keys: set[str]):
+        pipeline = self.redis.pipeline()
+        self._queue_update(pipeline, self._get_key(session_id), changed_data, deleted_keys)
+        await pipeline.execute()
+
+    async def refresh_session_ttl(self, session_id: str):
+        if self.ttl:
+            await self.redis.expire(self._get_key(session_id), self.ttl)
@@ -0,0 +1,149 @@
+from typing import Any, Callable, Optional
+
+import redis
+
+
+class FakeRedisServer:
+    def __init__(self, notify_keyspace_events: str = ''):
+        self.now = 0.0
+        self.round_trips = 0
+        self.commands: list[str] = []
+        self.config = {'notify-keyspace-events': notify_keyspace_events}
+        self.__values: dict[str, Any] = {}
+        self.__expires_at: dict[str, float] = {}
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+    def ttl_of(self, key: str) -> Optional[float]:
+        self.__expire_if_needed(key)
+        return self.__expires_at[key] - self.now if key in self.__expires_at else None
+
+    def execute(self, name: str, *args, **kwargs) -> Any:
+        self.commands.append(name)
+        return getattr(self, f'_command_{name}')(*args, **kwargs)
+
+    def _command_get(self, key: str) -> Optional[bytes]:
+        value = self.__get(key)
+        if value is not None and not isinstance(value, bytes):
+            raise FakeResponseError('WRONGTYPE Operation against a key holding the wrong kind of value')
+        return value
+
+    def _command_getex(self, key: str, ex: Optional[int] = None) -> Optional[bytes]:
+        value = self._command_get(key)
+        if value is not None and ex:
+            self.__expires_at[key] = self.now + ex
+        return value
+
+    def _command_set(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        self.__values[key] = value
+        self.__expires_at.pop(key, None)
+        if ex:
+            self.__expires_at[key] = self.now + ex
+        return True
+
+    def _command_hgetall(self, key: str) -> dict:
+        value = self.__get(key)
+        if value is not None and not isinstance(value, dict):
+            raise FakeResponseError('WRONGTYPE Operation against a key holding the wrong kind of value')
+        return dict(value or {})
+
+    def _command_hset(self, key: str, mapping: dict) -> int:
+        if self.__get(key) is None:
+            self.__values[key] = {}
+        self.__values[key].update({field.encode(): field_value for field, field_value in mapping.items()})
+        return len(mapping)
+
+    def _command_hdel(self, key: str, *fields: str) -> int:
+        value = self.__get(key) or {}
+        removed_count = sum(value.pop(field.encode(), None) is not None for field in fields)
+        if not value:
+            self._command_delete(key)
+        return removed_count
+
+    def _command_delete(self, *keys: str) -> int:
+        removed_count = 0
+        for key in keys:
+            removed_count += self.__values.pop(key, None) is not None
+            self.__expires_at.pop(key, None)
+        return removed_count
+
+    def _command_expire(self, key: str, seconds: int) -> bool:
+        if self.__get(key) is None:
+            return False
+        self.__expires_at[key] = self.now + seconds
+        return True
+
+    def _command_pttl(self, key: str) -> int:
+        if self.__get(key) is None:
+            return -2
+        return int((self.__expires_at[key] - self.now) * 1000) if key in self.__expires_at else -1
+
+    def _command_config_get(self, name: str) -> dict:
+        return {name: self.config[name]} if name in self.config else {}
+
+    def __get(self, key: str) -> Any:
+        self.__expire_if_needed(key)
+        return self.__values.get(key)
+
+    def __expire_if_needed(self, key: str):
+        if key in self.__expires_at and self.__expires_at[key] <= self.now:
+            del self.__values[key]
+            del self.__expires_at[key]
+
+
+class FakeResponseError(redis.ResponseError):
+    pass
+
+
+class FakePipeline:
+    def __init__(self, server: FakeRedisServer):
+        self.__server = server
+        self.__commands: list[Callable[[], Any]] = []
+
+    def __getattr__(self, name: str) -> Callable:
+        def _queue(*args, **kwargs):
+            self.__commands.append(lambda: self.__server.execute(name, *args, **kwargs))
+            return self
+
+        return _queue
+
+    def execute(self) -> list:
+        self.__server.round_trips += 1
+        commands, self.__commands = self.__commands, []
+        return [command() for command in commands]
+
+
+class FakeRedis:
+    def __init__(self, server: FakeRedisServer):
+        self.server = server
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self.server)
+
+    def __getattr__(self, name: str) -> Callable:
+        def _execute(*args, **kwargs):
+            self.server.round_trips += 1
+            return self.server.execute(name, *args, **kwargs)
+
+        return _execute
+
+
+class AsyncFakePipeline(FakePipeline):
+    async def execute(self) -> list:
+        return super().execute()
+
+
+class AsyncFakeRedis:
+    def __init__(self, server: FakeRedisServer):
+        self.server = server
+
+    def pipeline(self, transaction: bool = True) -> AsyncFakePipeline:
+        return AsyncFakePipeline(self.server)
+
+    def __getattr__(self, name: str) -> Callable:
+        async def _execute(*args, **kwargs):
+            self.server.round_trips += 1
+            return self.server.execute(name, *args, **kwargs)
+
+        return _execute
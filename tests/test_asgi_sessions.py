@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from sessions_backend import AsyncRedisSessionsBackend, RedisSessionStorage
+from tests.fake_redis import AsyncFakeRedis, FakeRedisServer
+from wsgi_application.asgi import AsgiApplication
+from wsgi_application.response import SimpleResponse
+from wsgi_application.routing import Router
+from wsgi_application.sessions import session_required
+
+
+def _async_backend(server: FakeRedisServer, **kwargs) -> AsyncRedisSessionsBackend:
+    sessions_backend = AsyncRedisSessionsBackend('localhost', 6379, 0, **kwargs)
+    sessions_backend.redis = AsyncFakeRedis(server)
+    return sessions_backend
+
+
+def _application(sessions_backend: AsyncRedisSessionsBackend) -> AsgiApplication:
+    router = Router()
+
+    @router.route('/login', methods=['POST'])
+    def login(request, database_session):
+        response = SimpleResponse(request, 200, 'logged in')
+        response.set_session({'username': 'John'})
+        return response
+
+    @router.route('/questions', methods=['GET'])
+    @session_required
+    def get_questions(request, database_session):
+        return SimpleResponse(request, 200, request.session['username'])
+
+    @router.route('/unmarked', methods=['GET'])
+    def read_session_without_marker(request, database_session):
+        return SimpleResponse(request, 200, request.session.get('username', ''))
+
+    @router.route('/async_unmarked', methods=['GET'])
+    async def read_session_in_async_handler(request, database_session):
+        return SimpleResponse(request, 200, request.session.get('username', ''))
+
+    @router.route('/static', methods=['GET'])
+    def get_static(request, database_session):
+        return SimpleResponse(request, 200, 'static')
+
+    application = AsgiApplication(max_threads=2)
+    application.include_router(router)
+    application.set_sessions_backend(sessions_backend)
+    return application
+
+
+def _call(application: AsgiApplication, method: str, path: str, session_id: str = '') -> tuple[int, dict, bytes]:
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    headers = [(b'cookie', f'session={session_id}'.encode())] if session_id else []
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': b'', 'headers': headers}
+    asyncio.run(application(scope, receive, send))
+    response_headers = {name.decode(): value.decode() for name, value in messages[0]['headers']}
+    return messages[0]['status'], response_headers, b''.join(message.get('body', b'') for message in messages[1:])
+
+
+def test_async_backend_hash_storage():
+    server = FakeRedisServer()
+    sessions_backend = _async_backend(server, ttl=60)
+    asyncio.run(sessions_backend.write_session_data('a', {'username': 'John', 'answers': [1, 2]}))
+    asyncio.run(sessions_backend.update_session_data('a', {'answers': [3]}, {'username'}))
+    assert asyncio.run(sessions_backend.get_session_data('a')) == {'answers': [3]}
+    assert asyncio.run(sessions_backend.get_session_data('missing')) == {}
+
+
+def test_async_backend_string_storage():
+    server = FakeRedisServer()
+    sessions_backend = _async_backend(server, ttl=60, storage=RedisSessionStorage.STRING)
+    asyncio.run(sessions_backend.write_session_data('a', {'username': 'John'}))
+    server.advance(61)
+    assert asyncio.run(sessions_backend.get_session_data('a')) == {}
+
+
+def test_session_is_not_prefetched_for_routes_without_session():
+    server = FakeRedisServer()
+    application = _application(_async_backend(server))
+    assert _call(application, 'GET', '/static', 'a')[0] == 200
+    assert server.commands == []
+
+
+def test_login_writes_session_without_reading_it():
+    server = FakeRedisServer()
+    application = _application(_async_backend(server))
+    status, headers, _ = _call(application, 'POST', '/login', 'stale')
+    assert status == 200
+    assert 'hgetall' not in server.commands
+    session_id = headers['set-cookie'].split(';')[0].split('=')[1]
+    server.commands.clear()
+    assert _call(application, 'GET', '/questions', session_id)[2] == b'John'
+    assert server.commands == ['hgetall', 'pttl']
+
+
+@pytest.mark.parametrize('path', ['/unmarked', '/async_unmarked'])
+def test_route_without_marker_loads_session_on_demand(path):
+    server = FakeRedisServer()
+    sessions_backend = _async_backend(server)
+    application = _application(sessions_backend)
+    asyncio.run(sessions_backend.write_session_data('a', {'username': 'John'}))
+    server.commands.clear()
+    assert _call(application, 'GET', path, 'a')[:3:2] == (200, b'John')
+    assert server.commands == ['hgetall', 'pttl']
@@ -0,0 +1,19 @@
+import zlib
+
+from wsgi_application.compression import ResponseCompressor
+from wsgi_application.request import RequestCreator
+from wsgi_application.response import StreamingResponse
+
+
+def test_each_streamed_chunk_is_flushed_to_the_client():
+    request = RequestCreator().create_request(
+        {'PATH_INFO': '/questions', 'REQUEST_METHOD': 'GET', 'HTTP_ACCEPT_ENCODING': 'gzip'},
+    )
+    chunks = ['<h3>first question</h3>', '<h3>second question</h3>']
+    response = ResponseCompressor(minimum_size=0).compress(request, StreamingResponse(request, 200, iter(chunks)))
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    compressed_chunks = iter(response.format_response())
+    for chunk in chunks:
+        assert decompressor.decompress(next(compressed_chunks)) == chunk.encode()
+    assert decompressor.decompress(b''.join(compressed_chunks)) == b''
+    assert decompressor.eof
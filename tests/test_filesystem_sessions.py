@@ -0,0 +1,48 @@
+import os
+import time
+
+from wsgi_application.sessions import FilesystemSessionsBackend
+
+
+def _backend(directory, **kwargs) -> FilesystemSessionsBackend:
+    return FilesystemSessionsBackend(str(directory), **{'ttl': 3600, 'sweep_interval': None, **kwargs})
+
+
+def test_write_and_read(tmp_path):
+    sessions_backend = _backend(tmp_path)
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    session = sessions_backend.load_session('a')
+    assert session == {'username': 'John'}
+    assert session.expires_at == os.stat(sessions_backend.get_session_path('a')).st_mtime + 3600
+    assert sessions_backend.load_session('missing') == {}
+
+
+def test_saving_unchanged_session_touches_file_once_per_interval(tmp_path):
+    sessions_backend = _backend(tmp_path, ttl_refresh_interval=60)
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    session_file_path = sessions_backend.get_session_path('a')
+    modified_at = time.time() - 30
+    os.utime(session_file_path, (modified_at, modified_at))
+    assert sessions_backend.save_session(sessions_backend.load_session('a')) is None
+    assert os.stat(session_file_path).st_mtime == modified_at
+    modified_at = time.time() - 90
+    os.utime(session_file_path, (modified_at, modified_at))
+    assert sessions_backend.save_session(sessions_backend.load_session('a')) is None
+    assert os.stat(session_file_path).st_mtime > time.time() - 5
+    assert sessions_backend.load_session('a') == {'username': 'John'}
+
+
+def test_expired_session_is_empty(tmp_path):
+    sessions_backend = _backend(tmp_path, ttl=60)
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    modified_at = time.time() - 61
+    os.utime(sessions_backend.get_session_path('a'), (modified_at, modified_at))
+    assert sessions_backend.load_session('a') == {}
+
+
+def test_cached_session_is_reloaded_after_external_change(tmp_path):
+    sessions_backend = _backend(tmp_path)
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    assert sessions_backend.load_session('a') == {'username': 'John'}
+    _backend(tmp_path).write_session_data('a', {'username': 'Jane'})
+    assert sessions_backend.load_session('a') == {'username': 'Jane'}
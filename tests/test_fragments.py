@@ -0,0 +1,110 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from database.base import Base
+from models import Answer, Question, User, UserAnswer, UserTest
+from presentation import AnswerView, QuestionView, QuestionsFragmentsRenderer
+from wsgi_application.fragments import FragmentCache
+from wsgi_application.templates import create_templates_environment
+
+TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'templates')
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with Session(engine, autoflush=False, expire_on_commit=False) as db_session:
+        db_session.execute(insert(Question), [
+            {'id': 1, 'text': '1', 'type': 'single'}, {'id': 2, 'text': '2', 'type': 'single'},
+        ])
+        db_session.execute(insert(Answer), [
+            {'id': 10, 'question_id': 1, 'text': '10', 'is_correct': True},
+            {'id': 20, 'question_id': 2, 'text': '20', 'is_correct': True},
+        ])
+        db_session.execute(insert(User), [{'id': 1, 'username': 'John'}])
+        db_session.execute(insert(UserTest), [{'id': 1, 'user_id': 1}])
+        db_session.execute(insert(UserAnswer), [{'id': 1, 'user_test_id': 1, 'question_id': 1}])
+        db_session.commit()
+        yield db_session
+    engine.dispose()
+
+
+def _versions(db_session: Session) -> dict[int, int]:
+    return dict(db_session.execute(select(Question.id, Question.version)).all())
+
+
+def _edit_question(db_session: Session):
+    db_session.get(Question, 1).text = 'edited'
+
+
+def _create_answer(db_session: Session):
+    db_session.add(Answer(question_id=1, text='11'))
+
+
+def _edit_answer(db_session: Session):
+    db_session.get(Answer, 10).text = 'edited'
+
+
+def _delete_answer(db_session: Session):
+    db_session.delete(db_session.get(Answer, 10))
+
+
+@pytest.mark.parametrize('change', [_edit_question, _create_answer, _edit_answer, _delete_answer])
+def test_question_changes_bump_version(db_session, change):
+    change(db_session)
+    db_session.commit()
+    assert _versions(db_session) == {1: 2, 2: 1}
+
+
+def test_moving_answer_bumps_both_questions_versions(db_session):
+    db_session.get(Answer, 10).question_id = 2
+    db_session.commit()
+    assert _versions(db_session) == {1: 2, 2: 2}
+
+
+def test_linking_user_answers_does_not_bump_version(db_session):
+    user_answer = db_session.get(UserAnswer, 1)
+    user_answer.answers.append(db_session.get(Answer, 10))
+    db_session.add(Question(id=3, text='3'))
+    db_session.commit()
+    assert _versions(db_session) == {1: 1, 2: 1, 3: 1}
+
+
+def test_fragment_cache_evicts_least_recently_used_by_size():
+    fragment_cache = FragmentCache('test', max_bytes=10)
+    fragment_cache.set('a', 'a', 4)
+    fragment_cache.set('b', 'b', 4)
+    assert fragment_cache.get('a') == 'a'
+    fragment_cache.set('c', 'c', 4)
+    assert (fragment_cache.get('b'), fragment_cache.get('a'), fragment_cache.get('c')) == (None, 'a', 'c')
+    assert fragment_cache.size == 8
+    fragment_cache.set('a', 'a', 6)
+    assert fragment_cache.size == 10
+    assert fragment_cache.get('c') == 'c'
+    fragment_cache.set('d', 'd', 4)
+    assert (fragment_cache.get('a'), fragment_cache.get('c'), fragment_cache.get('d')) == (None, 'c', 'd')
+    assert fragment_cache.size == 8
+    fragment_cache.set('e', 'e', 11)
+    assert (fragment_cache.get('e'), fragment_cache.size) == (None, 8)
+
+
+def test_warm_render_equals_cold_render():
+    environment = create_templates_environment(TEMPLATES_PATH, auto_reload=False)
+    questions = [
+        QuestionView(1, 'Q <1>', 'radio', (AnswerView(10, 'a'), AnswerView(11, 'b')), 1),
+        QuestionView(2, 'Q 2', 'checkbox', (AnswerView(20, 'c'), AnswerView(21, 'd'), AnswerView(22, 'e')), 3),
+        QuestionView(3, 'Q 3', 'radio', (), 1),
+    ]
+    checked_answers_ids = {11, 20, 22}
+    question_macro = environment.get_template('macros.html').module.question
+    expected = [str(question_macro(question, checked_answers_ids)) for question in questions]
+    fragment_cache = FragmentCache('test')
+    renderer = QuestionsFragmentsRenderer(fragment_cache)
+    assert list(renderer.render(environment, questions, checked_answers_ids)) == expected
+    assert (fragment_cache.hits, fragment_cache.misses) == (0, 3)
+    assert list(renderer.render(environment, questions, checked_answers_ids)) == expected
+    assert (fragment_cache.hits, fragment_cache.misses) == (3, 3)
@@ -0,0 +1,152 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.orm import Session
+
+from database.base import Base
+from models import Answer, Question, User, UserAnswer, UserAnswersLinkAnswers, UserTest
+from service_layer.answer_keys import AnswerKeysCache
+from service_layer.testing import FinishUserTest
+from service_layer.unit_of_work import SqlAlchemyUnitOfWork
+
+
+class QuestionDeletingAnswerKeysCache(AnswerKeysCache):
+    def __init__(self, db_session: Session, question_id: int):
+        super().__init__()
+        self.__db_session = db_session
+        self.__question_id = question_id
+
+    def get_answer_keys(self, answers_repo, questions_versions: dict[int, int]):
+        self.__db_session.execute(delete(Answer).where(Answer.question_id == self.__question_id))
+        self.__db_session.execute(delete(Question).where(Question.id == self.__question_id))
+        return super().get_answer_keys(answers_repo, questions_versions)
+
+
+def test_answer_to_question_deleted_during_grading_is_incorrect():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with Session(engine, autoflush=False, expire_on_commit=False) as db_session:
+        db_session.execute(insert(Question), [
+            {'id': 1, 'text': '1', 'type': 'single'}, {'id': 2, 'text': '2', 'type': 'single'},
+        ])
+        db_session.execute(insert(Answer), [
+            {'id': 10, 'question_id': 1, 'text': '10', 'is_correct': True},
+            {'id': 20, 'question_id': 2, 'text': '20', 'is_correct': True},
+        ])
+        db_session.execute(insert(User), [{'id': 1, 'username': 'John'}])
+        db_session.execute(insert(UserTest), [{'id': 1, 'user_id': 1}])
+        db_session.execute(insert(UserAnswer), [
+            {'id': 1, 'user_test_id': 1, 'question_id': 1}, {'id': 2, 'user_test_id': 1, 'question_id': 2},
+        ])
+        db_session.commit()
+
+        finish_user_test = FinishUserTest(
+            SqlAlchemyUnitOfWork(db_session), QuestionDeletingAnswerKeysCache(db_session, question_id=2),
+        )
+        assert finish_user_test('John', {'1': '10', '2': '20'}) == 50
+        assert db_session.execute(select(UserAnswer.id, UserAnswer.is_correct).order_by(UserAnswer.id)).all() == [
+            (1, True), (2, False),
+        ]
+        assert db_session.execute(select(UserAnswersLinkAnswers.c.answer_id)).scalars().all() == [10]
+    engine.dispose()
+
+
+class CountingAnswersRepository:
+    def __init__(self, questions_versions: dict[int, int]):
+        self.questions_versions = questions_versions
+        self.loaded_questions_ids = []
+
+    def get_questions_answers(self, questions_ids):
+        self.loaded_questions_ids.append(sorted(questions_ids))
+        return [
+            SimpleNamespace(
+                question_id=question_id,
+                question_type='single',
+                question_version=self.questions_versions[question_id],
+                answer_id=question_id * 10,
+                is_correct=True,
+            )
+            for question_id in questions_ids
+        ]
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with Session(engine, autoflush=False, expire_on_commit=False) as db_session:
+        db_session.execute(insert(Question), [
+            {'id': 1, 'text': '1', 'type': 'single'}, {'id': 2, 'text': '2', 'type': 'multi'},
+        ])
+        db_session.execute(insert(Answer), [
+            {'id': 10, 'question_id': 1, 'text': '10', 'is_correct': True},
+            {'id': 11, 'question_id': 1, 'text': '11', 'is_correct': False},
+            {'id': 20, 'question_id': 2, 'text': '20', 'is_correct': True},
+            {'id': 21, 'question_id': 2, 'text': '21', 'is_correct': True},
+            {'id': 22, 'question_id': 2, 'text': '22', 'is_correct': False},
+        ])
+        db_session.execute(insert(User), [{'id': 1, 'username': 'John'}])
+        db_session.execute(insert(UserTest), [{'id': 1, 'user_id': 1}])
+        db_session.execute(insert(UserAnswer), [
+            {'id': 1, 'user_test_id': 1, 'question_id': 1}, {'id': 2, 'user_test_id': 1, 'question_id': 2},
+        ])
+        db_session.commit()
+        yield db_session
+    engine.dispose()
+
+
+def _finish_user_test(db_session: Session, answers: dict) -> tuple[int, dict[int, bool], dict[int, set[int]]]:
+    result = FinishUserTest(SqlAlchemyUnitOfWork(db_session), AnswerKeysCache())('John', answers)
+    grades = dict(db_session.execute(select(UserAnswer.id, UserAnswer.is_correct)).all())
+    links = {}
+    for user_answer_id, answer_id in db_session.execute(
+        select(UserAnswersLinkAnswers.c.user_answer_id, UserAnswersLinkAnswers.c.answer_id),
+    ):
+        links.setdefault(user_answer_id, set()).add(answer_id)
+    return result, grades, links
+
+
+@pytest.mark.parametrize('single_choice_answer, is_correct', [('10', True), ('11', False), (['10', '11'], False)])
+def test_single_choice_answer_is_correct_only_with_one_correct_id(db_session, single_choice_answer, is_correct):
+    _, grades, links = _finish_user_test(db_session, {'1': single_choice_answer, '2': ['20', '21']})
+    assert grades[1] is is_correct
+    given_answers = [single_choice_answer] if isinstance(single_choice_answer, str) else single_choice_answer
+    assert links[1] == {int(answer) for answer in given_answers}
+
+
+@pytest.mark.parametrize('multi_choice_answer, is_correct', [
+    (['20', '21'], True), (['21', '20'], True), (['20'], False), (['20', '21', '22'], False), ('20', False),
+])
+def test_multi_choice_answer_must_match_correct_set_exactly(db_session, multi_choice_answer, is_correct):
+    result, grades, _ = _finish_user_test(db_session, {'1': '10', '2': multi_choice_answer})
+    assert grades[2] is is_correct
+    assert result == (100 if is_correct else 50)
+
+
+def test_answers_of_other_questions_are_not_linked(db_session):
+    result, grades, links = _finish_user_test(db_session, {'1': ['10', '20'], '2': ['20', '21', '10', '999']})
+    assert (result, grades) == (0, {1: False, 2: False})
+    assert links == {1: {10}, 2: {20, 21}}
+
+
+def test_answer_keys_are_reloaded_when_question_version_changes():
+    answers_repo = CountingAnswersRepository({1: 1, 2: 1})
+    answer_keys_cache = AnswerKeysCache()
+    assert answer_keys_cache.get_answer_keys(answers_repo, {1: 1, 2: 1})[1].correct_answers_ids == {10}
+    answer_keys_cache.get_answer_keys(answers_repo, {1: 1, 2: 1})
+    answers_repo.questions_versions[2] = 2
+    assert answer_keys_cache.get_answer_keys(answers_repo, {1: 1, 2: 2})[2].version == 2
+    assert answers_repo.loaded_questions_ids == [[1, 2], [2]]
+    assert (answer_keys_cache.hits, answer_keys_cache.misses) == (3, 3)
+
+
+def test_answer_keys_cache_evicts_least_recently_used_questions():
+    answers_repo = CountingAnswersRepository({1: 1, 2: 1, 3: 1})
+    answer_keys_cache = AnswerKeysCache(max_size=2)
+    answer_keys_cache.get_answer_keys(answers_repo, {1: 1, 2: 1})
+    answer_keys_cache.get_answer_keys(answers_repo, {1: 1})
+    answer_keys_cache.get_answer_keys(answers_repo, {3: 1})
+    answer_keys_cache.get_answer_keys(answers_repo, {1: 1, 3: 1})
+    answer_keys_cache.get_answer_keys(answers_repo, {2: 1})
+    assert answers_repo.loaded_questions_ids == [[1, 2], [3], [2]]
@@ -0,0 +1,49 @@
+import gc
+import logging
+import weakref
+
+from wsgi_application.logging import Logger, _restart_loggers_queue_listeners
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self, records: list):
+        super().__init__()
+        self.records = records
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record.getMessage())
+
+
+def _configuration(records: list) -> dict:
+    return {
+        'loggers': {
+            'tests.logging': {
+                'handlers': [{'level': logging.ERROR, 'handler': 'recording'}],
+                'level': logging.ERROR,
+                'propagate': False,
+            },
+        },
+        'handlers': {'recording': {'class': RecordingHandler, 'records': records}},
+        'queue': {'maxsize': 100},
+    }
+
+
+def test_stopped_loggers_are_garbage_collected():
+    logger = Logger(_configuration([]))
+    logger.stop()
+    logger_reference = weakref.ref(logger)
+    del logger
+    gc.collect()
+    assert logger_reference() is None
+
+
+def test_queue_listener_is_restarted_after_fork():
+    records = []
+    logger = Logger(_configuration(records))
+    try:
+        _restart_loggers_queue_listeners()
+        logger.error('after fork')
+        logger.stop()
+        assert records == ['after fork']
+    finally:
+        logger.stop()
@@ -0,0 +1,27 @@
+from wsgi_application.middlewares import MiddlewareABC, MiddlewaresPipeline
+from wsgi_application.request import RequestCreator
+from wsgi_application.response import SimpleResponse
+
+
+class HeaderMiddleware(MiddlewareABC):
+    def __init__(self, value: str):
+        self.value = value
+
+    def after_request(self, request, response):
+        response.add_header('X-Order', self.value)
+        return response
+
+
+def test_timings_of_middlewares_with_the_same_name_are_kept_apart():
+    request = RequestCreator().create_request({'PATH_INFO': '/', 'REQUEST_METHOD': 'GET'})
+    pipeline = MiddlewaresPipeline(
+        lambda request: SimpleResponse(request, 200, ''),
+        (HeaderMiddleware('outer'), HeaderMiddleware('inner')),
+        timing_enabled=True,
+    )
+    headers = pipeline(request).headers
+    assert [value for key, value in headers if key == 'X-Order'] == ['inner', 'outer']
+    server_timing = dict(headers)['Server-Timing']
+    assert [entry.split(';')[0] for entry in server_timing.split(', ')] == [
+        'HeaderMiddleware', 'HeaderMiddleware_2', 'handler',
+    ]
@@ -0,0 +1,133 @@
+import threading
+from typing import Iterable
+
+import pytest
+
+from service_layer.exceptions import NotEnoughQuestionsException
+from service_layer.questions_pool import QuestionsPool
+
+
+class FakeQuestionsRepository:
+    def __init__(self, questions: dict[int, str]):
+        self.questions = questions
+        self.queries_count = 0
+
+    def get_questions_ids(self, question_type: str, after_id: int = 0) -> list[int]:
+        self.queries_count += 1
+        return sorted(
+            question_id for question_id, type_ in self.questions.items()
+            if type_ == question_type and question_id > after_id
+        )
+
+    def get_existing_questions_ids(self, questions_ids: Iterable[int]) -> set[int]:
+        self.queries_count += 1
+        return {question_id for question_id in questions_ids if question_id in self.questions}
+
+
+class FakeUnitOfWork:
+    def __init__(self, questions_repo: FakeQuestionsRepository, loaded: threading.Event):
+        self.questions_repo = questions_repo
+        self.__loaded = loaded
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.__loaded.set()
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.exceptions = []
+
+    def exception(self, msg, *args, **kwargs):
+        self.exceptions.append(msg)
+
+
+def _questions(count: int) -> dict[int, str]:
+    return {question_id: 'multi' if question_id % 2 else 'single' for question_id in range(1, count + 1)}
+
+
+def test_sample_does_not_load_questions_on_request_path():
+    questions_repo = FakeQuestionsRepository(_questions(10))
+    questions_pool = QuestionsPool(test_size=3)
+    assert questions_pool.sample(questions_repo) is None
+    assert questions_repo.queries_count == 0
+
+
+def test_refresher_loads_questions_in_background():
+    questions_repo = FakeQuestionsRepository(_questions(10))
+    loaded = threading.Event()
+    questions_pool = QuestionsPool(
+        test_size=3, create_unit_of_work=lambda: FakeUnitOfWork(questions_repo, loaded),
+    )
+    try:
+        questions_pool.start_refresher()
+        assert loaded.wait(5)
+        questions_ids = questions_pool.sample(questions_repo)
+        assert len(set(questions_ids)) == 3
+        assert set(questions_ids) <= set(questions_repo.questions)
+    finally:
+        questions_pool.stop_refresher()
+
+
+def test_incremental_refresh_appends_new_questions():
+    questions_repo = FakeQuestionsRepository(_questions(10))
+    questions_pool = QuestionsPool(test_size=3, refresh_interval=0)
+    questions_pool.refresh(questions_repo)
+    questions_repo.questions[11] = 'multi'
+    questions_pool.refresh(questions_repo)
+    assert questions_pool.size == 11
+
+
+def test_deleted_questions_are_discarded():
+    questions_repo = FakeQuestionsRepository(_questions(10))
+    questions_pool = QuestionsPool(test_size=3, questions_per_type={'single': 2, 'multi': 1})
+    questions_pool.refresh(questions_repo)
+    del questions_repo.questions[2]
+    del questions_repo.questions[4]
+    for _ in range(20):
+        questions_ids = questions_pool.sample(questions_repo)
+        assert not {2, 4} & set(questions_ids)
+    assert questions_pool.size == 8
+
+
+def test_sampling_falls_back_when_sampled_questions_keep_disappearing():
+    questions_repo = FakeQuestionsRepository(_questions(3))
+    questions_pool = QuestionsPool(test_size=3, max_sampling_attempts=1)
+    questions_pool.refresh(questions_repo)
+    questions_repo.questions.clear()
+    assert questions_pool.sample(questions_repo) is None
+
+
+@pytest.mark.parametrize('questions_per_type', [None, {'single': 2, 'multi': 1}])
+def test_not_enough_questions(questions_per_type):
+    questions_repo = FakeQuestionsRepository({1: 'single', 2: 'multi'})
+    questions_pool = QuestionsPool(test_size=3, questions_per_type=questions_per_type)
+    questions_pool.refresh(questions_repo)
+    with pytest.raises(NotEnoughQuestionsException):
+        questions_pool.sample(questions_repo)
+
+
+def test_refresher_keeps_running_after_failure():
+    questions_repo = FakeQuestionsRepository(_questions(10))
+    loaded = threading.Event()
+    attempts = []
+
+    def create_unit_of_work():
+        attempts.append(None)
+        if len(attempts) == 1:
+            raise RuntimeError('database is down')
+        return FakeUnitOfWork(questions_repo, loaded)
+
+    logger = RecordingLogger()
+    questions_pool = QuestionsPool(
+        test_size=3, refresh_interval=0.01, create_unit_of_work=create_unit_of_work, logger=logger,
+    )
+    try:
+        questions_pool.start_refresher()
+        assert loaded.wait(5)
+        assert questions_pool.is_loaded
+        assert logger.exceptions == ['Questions pool refresh failed']
+    finally:
+        questions_pool.stop_refresher()
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from wsgi_application.asgi import AsgiApplication
+from wsgi_application.response import SimpleResponse
+from wsgi_application.routing import Router
+from wsgi_application.static_files import StaticFiles
+
+
+@pytest.fixture
+def application(tmp_path) -> AsgiApplication:
+    (tmp_path / 'index.html').write_text('index')
+    (tmp_path / 'login_form.html').write_text('login form')
+    router = Router()
+
+    @router.route('/login', methods=['POST'])
+    def login(request, database_session):
+        return SimpleResponse(request, 200, 'logged in')
+
+    application = AsgiApplication(max_threads=2)
+    application.include_router(router)
+    application.mount_static_files('/', StaticFiles(str(tmp_path)))
+    return application
+
+
+def _call(application: AsgiApplication, method: str, path: str) -> tuple[int, dict, bytes]:
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': b'', 'headers': []}
+    asyncio.run(application(scope, receive, send))
+    response_headers = {name.decode(): value.decode() for name, value in messages[0]['headers']}
+    return messages[0]['status'], response_headers, b''.join(message.get('body', b'') for message in messages[1:])
+
+
+@pytest.mark.parametrize('path, body', [('/', b'index'), ('/login_form.html', b'login form')])
+def test_static_files_are_served_from_root_mount(application, path, body):
+    status, _, response_body = _call(application, 'GET', path)
+    assert (status, response_body) == (200, body)
+
+
+def test_head_to_static_file_returns_headers_without_body(application):
+    status, headers, body = _call(application, 'HEAD', '/login_form.html')
+    assert (status, headers['content-length'], body) == (200, '10', b'')
+
+
+def test_explicit_route_wins_over_static_mount_for_other_methods(application):
+    status, headers, _ = _call(application, 'GET', '/login')
+    assert (status, headers['allow']) == (405, 'POST')
+
+
+@pytest.mark.parametrize('method, path', [('POST', '/unknown'), ('GET', '/unknown.html')])
+def test_unknown_path_is_not_found(application, method, path):
+    assert _call(application, method, path)[0] == 404
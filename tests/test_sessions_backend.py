@@ -0,0 +1,200 @@
+import time
+
+import pytest
+
+from sessions_backend import (
+    REQUIRED_KEYSPACE_EVENTS_FLAGS,
+    MarshalSessionSerializer,
+    RedisSessionsBackend,
+    RedisSessionStorage,
+    get_keyspace_events_flags,
+)
+from tests.fake_redis import FakeRedis, FakeRedisServer
+from wsgi_application.session_cache import CachedSessionsBackend
+
+TTL = 60
+
+
+def _backend(server: FakeRedisServer, **kwargs) -> RedisSessionsBackend:
+    sessions_backend = RedisSessionsBackend('localhost', 6379, 0, **{'ttl': TTL, **kwargs})
+    sessions_backend.redis = FakeRedis(server)
+    return sessions_backend
+
+
+@pytest.mark.parametrize('storage', list(RedisSessionStorage))
+def test_write_and_read(storage):
+    server = FakeRedisServer()
+    sessions_backend = _backend(server, storage=storage)
+    sessions_backend.write_session_data('a', {'username': 'John', 'answers': [1, 2]})
+    assert sessions_backend.get_session_data('a') == {'username': 'John', 'answers': [1, 2]}
+
+
+def test_compact_serializer():
+    server = FakeRedisServer()
+    sessions_backend = _backend(server, serializer=MarshalSessionSerializer())
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    assert sessions_backend.get_session_data('a') == {'username': 'John'}
+
+
+def test_hash_write_and_expire_are_pipelined():
+    server = FakeRedisServer()
+    _backend(server).write_session_data('a', {'username': 'John'})
+    assert server.round_trips == 1
+    assert server.commands == ['delete', 'hset', 'expire']
+    assert server.ttl_of('session:a') == TTL
+
+
+def test_partial_update_and_expire_are_pipelined():
+    server = FakeRedisServer()
+    sessions_backend = _backend(server)
+    sessions_backend.write_session_data('a', {'username': 'John', 'answers': [1]})
+    server.round_trips = 0
+    server.commands.clear()
+    sessions_backend.update_session_data('a', {'answers': [2]}, {'username'})
+    assert server.round_trips == 1
+    assert server.commands == ['hdel', 'hset', 'expire']
+    assert sessions_backend.get_session_data('a') == {'answers': [2]}
+
+
+def test_string_write_sets_expiry_in_one_command():
+    server = FakeRedisServer()
+    _backend(server, storage=RedisSessionStorage.STRING).write_session_data('a', {'username': 'John'})
+    assert server.round_trips == 1
+    assert server.commands == ['set']
+    assert server.ttl_of('session:a') == TTL
+
+
+@pytest.mark.parametrize('storage, read_commands', [
+    (RedisSessionStorage.HASH, ['hgetall', 'pttl']),
+    (RedisSessionStorage.STRING, ['get', 'pttl']),
+])
+def test_read_does_not_touch_expiry(storage, read_commands):
+    server = FakeRedisServer()
+    sessions_backend = _backend(server, storage=storage)
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    server.advance(10)
+    server.round_trips = 0
+    server.commands.clear()
+    session = sessions_backend.load_session('a')
+    assert session == {'username': 'John'}
+    assert session.expires_at == pytest.approx(time.time() + TTL - 10, abs=1)
+    assert server.round_trips == 1
+    assert server.commands == read_commands
+    assert server.ttl_of('session:a') == TTL - 10
+
+
+def test_saving_unchanged_session_slides_expiry_once_per_interval(monkeypatch):
+    server = FakeRedisServer()
+    monkeypatch.setattr(time, 'time', lambda: server.now)
+    sessions_backend = _backend(server, ttl=3600, ttl_refresh_interval=60)
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    server.advance(30)
+    session = sessions_backend.load_session('a')
+    server.commands.clear()
+    assert sessions_backend.save_session(session) is None
+    assert server.commands == []
+    server.advance(31)
+    session = sessions_backend.load_session('a')
+    server.commands.clear()
+    assert sessions_backend.save_session(session) is None
+    assert server.commands == ['expire']
+    assert server.ttl_of('session:a') == 3600
+    assert session.expires_at == server.now + 3600
+
+
+@pytest.mark.filterwarnings('ignore:Redis notify-keyspace-events')
+def test_cache_hits_slide_expiry(monkeypatch):
+    server = FakeRedisServer()
+    monkeypatch.setattr(time, 'time', lambda: server.now)
+    sessions_backend = CachedSessionsBackend(_backend(server, ttl=3600, ttl_refresh_interval=60), ttl=3600)
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    sessions_backend.save_session(sessions_backend.load_session('a'))
+    server.advance(61)
+    server.commands.clear()
+    session = sessions_backend.load_session('a')
+    assert sessions_backend.hits == 2
+    assert sessions_backend.save_session(session) is None
+    assert server.commands == ['expire']
+    assert server.ttl_of('session:a') == 3600
+    server.commands.clear()
+    sessions_backend.save_session(sessions_backend.load_session('a'))
+    assert sessions_backend.hits == 3
+    assert server.commands == []
+
+
+@pytest.mark.parametrize('notify_keyspace_events, is_supported', [
+    ('', False), ('Kgh$x', False), ('Kgh$xe', True), ('KEA', True),
+])
+def test_keyspace_events_flags(notify_keyspace_events, is_supported):
+    assert (REQUIRED_KEYSPACE_EVENTS_FLAGS <= get_keyspace_events_flags(notify_keyspace_events)) is is_supported
+
+
+@pytest.mark.parametrize('notify_keyspace_events', ['', 'Kgh$x'])
+def test_invalidations_require_keyspace_events_config(notify_keyspace_events):
+    server = FakeRedisServer(notify_keyspace_events)
+    with pytest.warns(RuntimeWarning, match='notify-keyspace-events'):
+        assert _backend(server).subscribe_to_invalidations(lambda session_id: None) is False
+    assert server.commands == ['config_get']
+
+
+@pytest.mark.parametrize('storage', list(RedisSessionStorage))
+def test_missing_and_expired_sessions_are_empty(storage):
+    server = FakeRedisServer()
+    sessions_backend = _backend(server, storage=storage)
+    assert sessions_backend.get_session_data('missing') == {}
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    server.advance(TTL)
+    assert sessions_backend.get_session_data('a') == {}
+    assert server.ttl_of('session:missing') is None
+    assert server.ttl_of('session:a') is None
+
+
+def test_key_of_wrong_type_is_dropped():
+    server = FakeRedisServer()
+    _backend(server, storage=RedisSessionStorage.STRING).write_session_data('a', {'username': 'John'})
+    assert _backend(server).get_session_data('a') == {}
+    assert server.commands[-1] == 'delete'
+
+
+def test_no_expiry_without_ttl():
+    server = FakeRedisServer()
+    sessions_backend = _backend(server, ttl=None)
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    assert sessions_backend.get_session_data('a') == {'username': 'John'}
+    assert 'expire' not in server.commands
+    assert server.ttl_of('session:a') is None
+
+
+def test_unchanged_session_is_not_written_back():
+    server = FakeRedisServer()
+    sessions_backend = _backend(server)
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    session = sessions_backend.load_session('a')
+    server.commands.clear()
+    assert sessions_backend.save_session(session) is None
+    assert server.commands == []
+
+
+@pytest.mark.filterwarnings('ignore:Redis notify-keyspace-events')
+def test_cache_writes_through_only_without_invalidations():
+    server = FakeRedisServer()
+    sessions_backend = CachedSessionsBackend(_backend(server), ttl=3600)
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    server.commands.clear()
+    assert sessions_backend.load_session('a') == {'username': 'John'}
+    assert (sessions_backend.hits, server.commands) == (1, [])
+
+
+def test_cache_does_not_store_own_writes_when_receiving_invalidations():
+    server = FakeRedisServer()
+    redis_sessions_backend = _backend(server)
+    redis_sessions_backend.subscribe_to_invalidations = lambda callback: True
+    sessions_backend = CachedSessionsBackend(redis_sessions_backend, ttl=3600)
+    sessions_backend.write_session_data('a', {'username': 'John'})
+    assert sessions_backend.load_session('a') == {'username': 'John'}
+    assert (sessions_backend.hits, sessions_backend.misses) == (0, 1)
+    session = sessions_backend.load_session('a')
+    session['username'] = 'Jane'
+    sessions_backend.save_session(session)
+    assert sessions_backend.load_session('a') == {'username': 'Jane'}
+    assert (sessions_backend.hits, sessions_backend.misses) == (1, 2)
@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from wsgi_application.sessions import (
+    Session,
+    SessionsBackendABC,
+    SessionTooLargeError,
+    SignedCookieSessionsBackend,
+)
+
+
+class MemorySessionsBackend(SessionsBackendABC):
+    def __init__(self):
+        self.sessions: dict[str, dict] = {}
+
+    def get_session_data(self, session_id: str) -> dict:
+        return dict(self.sessions.get(session_id, {}))
+
+    def write_session_data(self, session_id: str, data: dict):
+        self.sessions[session_id] = dict(data)
+
+
+def _sign(sessions_backend: SignedCookieSessionsBackend, data: dict) -> str:
+    session = Session('', data)
+    session.mark_modified()
+    return sessions_backend.save_session(session)
+
+
+@pytest.mark.parametrize('compression_threshold', [None, 0])
+def test_round_trip(compression_threshold):
+    sessions_backend = SignedCookieSessionsBackend(['key'], compression_threshold=compression_threshold)
+    cookie_value = _sign(sessions_backend, {'username': 'Іван'})
+    assert cookie_value.startswith('.') is (compression_threshold == 0)
+    session = sessions_backend.load_session(cookie_value)
+    assert session == {'username': 'Іван'}
+    assert not session.is_modified
+
+
+@pytest.mark.parametrize('compression_threshold', [None, 0])
+def test_tampered_payload_is_rejected(compression_threshold):
+    sessions_backend = SignedCookieSessionsBackend(['key'], compression_threshold=compression_threshold)
+    cookie_value = _sign(sessions_backend, {'username': 'John'})
+    forged_payload = _sign(sessions_backend, {'username': 'admin'}).rpartition('.')[0]
+    encoded_payload, _, signature = cookie_value.rpartition('.')
+    assert sessions_backend.load_session(f'{forged_payload}.{signature}') == {}
+    tampered_payload = f'{encoded_payload[:-1]}{"A" if encoded_payload[-1] != "A" else "B"}'
+    assert sessions_backend.load_session(f'{tampered_payload}.{signature}') == {}
+
+
+def test_tampered_signature_is_rejected():
+    sessions_backend = SignedCookieSessionsBackend(['key'])
+    encoded_payload, _, signature = _sign(sessions_backend, {'username': 'John'}).rpartition('.')
+    assert sessions_backend.load_session(f'{encoded_payload}.{signature[::-1]}') == {}
+    assert sessions_backend.load_session(f'{encoded_payload}.') == {}
+    assert sessions_backend.load_session(encoded_payload) == {}
+    assert SignedCookieSessionsBackend(['other key']).load_session(f'{encoded_payload}.{signature}') == {}
+
+
+def test_cookie_signed_with_old_key_is_resigned_with_current_key():
+    cookie_value = _sign(SignedCookieSessionsBackend(['old key']), {'username': 'John'})
+    sessions_backend = SignedCookieSessionsBackend(['new key', 'old key'])
+    session = sessions_backend.load_session(cookie_value)
+    assert session == {'username': 'John'}
+    resigned_value = sessions_backend.save_session(session)
+    assert resigned_value and resigned_value != cookie_value
+    assert SignedCookieSessionsBackend(['new key']).load_session(resigned_value) == {'username': 'John'}
+
+
+def test_cookie_signed_with_current_key_is_not_rewritten():
+    sessions_backend = SignedCookieSessionsBackend(['new key', 'old key'])
+    session = sessions_backend.load_session(_sign(sessions_backend, {'username': 'John'}))
+    assert sessions_backend.save_session(session) is None
+
+
+def test_expired_cookie_is_rejected(monkeypatch):
+    sessions_backend = SignedCookieSessionsBackend(['key'], max_age=60)
+    cookie_value = _sign(sessions_backend, {'username': 'John'})
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 59)
+    assert sessions_backend.load_session(cookie_value) == {'username': 'John'}
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert sessions_backend.load_session(cookie_value) == {}
+
+
+def test_cookie_close_to_expiry_is_renewed(monkeypatch):
+    sessions_backend = SignedCookieSessionsBackend(['key'], max_age=60)
+    cookie_value = _sign(sessions_backend, {'username': 'John'})
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 40)
+    renewed_value = sessions_backend.save_session(sessions_backend.load_session(cookie_value))
+    monkeypatch.setattr(time, 'time', lambda: now + 90)
+    assert sessions_backend.load_session(renewed_value) == {'username': 'John'}
+
+
+def test_oversized_session_goes_to_fallback_backend():
+    fallback_backend = MemorySessionsBackend()
+    sessions_backend = SignedCookieSessionsBackend(
+        ['key'], compression_threshold=None, max_cookie_size=100, fallback_backend=fallback_backend,
+    )
+    data = {'answers': list(range(100))}
+    cookie_value = _sign(sessions_backend, data)
+    assert cookie_value.startswith(SignedCookieSessionsBackend.server_side_prefix)
+    assert fallback_backend.sessions == {cookie_value[1:]: data}
+    session = sessions_backend.load_session(cookie_value)
+    assert session == data
+    session['answers'] = list(range(200))
+    assert sessions_backend.save_session(session) == cookie_value
+    assert fallback_backend.sessions[cookie_value[1:]] == {'answers': list(range(200))}
+
+
+def test_oversized_session_without_fallback_backend_fails():
+    sessions_backend = SignedCookieSessionsBackend(['key'], compression_threshold=None, max_cookie_size=100)
+    with pytest.raises(SessionTooLargeError):
+        _sign(sessions_backend, {'answers': list(range(100))})
+
+
+def test_server_side_session_id_without_fallback_backend_is_empty():
+    assert SignedCookieSessionsBackend(['key']).load_session('~abc') == {}
@@ -0,0 +1,101 @@
+import asyncio
+import io
+import os
+
+import pytest
+
+from wsgi_application.application import Application
+from wsgi_application.asgi import AsgiApplication
+from wsgi_application.database import QueryStatisticsMiddleware, get_current_query_statistics
+from wsgi_application.response import StreamingResponse
+from wsgi_application.routing import Router
+from wsgi_application.templates import create_templates_environment, stream_template
+from wsgi_application.tracing import RingBufferSpanExporter, Tracer, span
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, msg, *args, **kwargs):
+        self.warnings.append(msg)
+
+
+def _render_chunks():
+    with span('render'):
+        for chunk in ('a', 'b'):
+            get_current_query_statistics().record('SELECT 1', 0.001)
+            yield chunk
+
+
+def _application(application: Application) -> tuple[Application, RingBufferSpanExporter, RecordingLogger]:
+    router = Router()
+
+    @router.route('/streamed', methods=['GET'])
+    def get_streamed(request, database_session):
+        return StreamingResponse(request, 200, _render_chunks())
+
+    exporter = RingBufferSpanExporter()
+    logger = RecordingLogger()
+    application.include_router(router)
+    application.add_middleware(QueryStatisticsMiddleware(logger, max_queries=1))
+    application.enable_tracing(Tracer(exporter))
+    return application, exporter, logger
+
+
+def _call_wsgi(application: Application, exporter: RingBufferSpanExporter) -> bytes:
+    environ = {'PATH_INFO': '/streamed', 'REQUEST_METHOD': 'GET', 'wsgi.input': io.BytesIO(b'')}
+    body = application(environ, lambda status, headers: None)
+    chunks = list(body)
+    assert not exporter.spans
+    body.close()
+    return b''.join(chunks)
+
+
+def _call_asgi(application: AsgiApplication, exporter: RingBufferSpanExporter) -> bytes:
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': '/streamed', 'query_string': b'', 'headers': []}
+    asyncio.run(application(scope, receive, send))
+    return b''.join(message.get('body', b'') for message in messages[1:])
+
+
+@pytest.mark.parametrize('application_class, call', [(Application, _call_wsgi), (AsgiApplication, _call_asgi)])
+def test_streamed_body_is_traced_and_counted(application_class, call):
+    application, exporter, logger = _application(application_class())
+    assert call(application, exporter) == b'ab'
+    spans = {span_data.name: span_data for span_data in exporter.spans}
+    assert list(spans) == ['handler', 'render', 'request']
+    render_span, request_span = spans['render'], spans['request']
+    assert render_span.parent_id == request_span.span_id
+    assert request_span.duration_ms >= render_span.duration_ms
+    assert len(logger.warnings) == 1
+    assert 'ran 2 queries' in logger.warnings[0]
+    assert get_current_query_statistics() is None
+
+
+def test_streamed_template_is_rendered_inside_request_span():
+    environment = create_templates_environment(
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'templates'), auto_reload=False,
+    )
+    template = environment.get_template('results.html')
+    router = Router()
+
+    @router.route('/streamed', methods=['GET'])
+    def get_streamed(request, database_session):
+        return StreamingResponse(request, 200, stream_template(template, username='John', user_tests=[]))
+
+    exporter = RingBufferSpanExporter()
+    application = Application()
+    application.include_router(router)
+    application.enable_tracing(Tracer(exporter))
+    assert b'John' in _call_wsgi(application, exporter)
+    spans = {span_data.name: span_data for span_data in exporter.spans}
+    assert spans['render'].attributes == {'template': 'results.html', 'streamed': True}
+    assert spans['render'].parent_id == spans['request'].span_id
@@ -1,77 +1,215 @@
-from inspect import signature
-from typing import Callable, Type
+from functools import partial
+from inspect import isawaitable
+from typing import Callable, Optional, Type, Union
 
-from jinja2 import FileSystemLoader, Environment
+from jinja2 import Environment
 
 from wsgi_application.authentication import AuthenticationError
-from wsgi_application.database import DatabaseSessionMakerABC, FakeDatabaseSessionMaker
+from wsgi_application.database import (
+    DatabaseSessionMakerABC,
+    DatabaseSessionsStatistics,
+    FakeDatabaseSessionMaker,
+    LazyDatabaseSession,
+)
+from wsgi_application.dependencies import DependenciesResolver, Dependency, DependencyScope
 from wsgi_application.logging import Logger, get_default_logging_configuration, LoggerABC
+from wsgi_application.metrics import MetricsEndpoint, MetricsMiddleware, MetricsRegistry
+from wsgi_application.middlewares import MiddlewareABC, MiddlewaresPipeline, TracingMiddleware
+from wsgi_application.profiling import RequestProfiler
 from wsgi_application.request import RequestCreator, Request
-from wsgi_application.response import ResponseABC, SimpleResponse
-from wsgi_application.routing import Router, Route
+from wsgi_application.response import (
+    ClosingIterator,
+    FileResponse,
+    ResponseABC,
+    SimpleResponse,
+    StreamingResponse,
+)
+from wsgi_application.routing import ROUTE_ENVIRON_KEY, Route, Router, RoutesTree
 from wsgi_application.sessions import FilesystemSessionsBackend, SessionsBackendABC
+from wsgi_application.static_files import StaticFiles
+from wsgi_application.templates import create_templates_environment, preload_templates
+from wsgi_application.tracing import Tracer, span
 
 
 class Application:
     def __init__(self):
         self._routers: list[Router] = []
+        self._routes_tree = RoutesTree()
         self.logger = Logger(get_default_logging_configuration())
-        self.__dependencies: dict[Callable, Callable] = {LoggerABC: lambda: self.logger}
+        self.__dependencies_resolver = DependenciesResolver(context_types=(Request, LazyDatabaseSession))
+        self.__dependencies_resolver.update(
+            {LoggerABC: Dependency(lambda: self.logger, scope=DependencyScope.SINGLETON)},
+        )
         self._authentication_failed_redirect_path = ''
         self.__sessions_backend: SessionsBackendABC = FilesystemSessionsBackend()
-        self.__request_creator = RequestCreator(self.__sessions_backend)
-        self.__database_session_maker = FakeDatabaseSessionMaker
+        self._request_creator = RequestCreator(self.__sessions_backend)
+        self._database_session_maker = FakeDatabaseSessionMaker
+        self.database_sessions_statistics = DatabaseSessionsStatistics()
+        self._middlewares: list[MiddlewareABC] = []
+        self._middlewares_timing_enabled = False
+        self._middlewares_pipeline: Callable[..., ResponseABC] = self._handle_request_safely
+        self._request_profiler: Optional[RequestProfiler] = None
 
     def __call__(self, environ: dict, start_response: Callable):
-        with self.__database_session_maker() as database_session:
-            request = self.__request_creator.create_request(environ)
+        request = self._request_creator.create_request(environ)
+        database_session = LazyDatabaseSession(self._database_session_maker)
+        close_database_session = True
+        try:
             try:
-                response: ResponseABC = self.handle_request(request, database_session)
-            except AuthenticationError:
-                self.logger.exception(f'Authentication error after accessing "{environ["PATH_INFO"]}"')
-                start_response('302', [('Location', self._authentication_failed_redirect_path)])
-                return []
+                if self._request_profiler and self._request_profiler.should_profile(request):
+                    response: ResponseABC = self._request_profiler.profile(
+                        request, self._middlewares_pipeline, request, database_session,
+                    )
+                else:
+                    response = self._middlewares_pipeline(request, database_session)
             except Exception:
                 self.logger.exception(f'Unexpected error occurred after accessing "{environ["PATH_INFO"]}"')
                 start_response('500', [])
                 return []
             start_response(str(response.status), response.headers)
-            return response.format_response()
+            body = response.format_response()
+            if response.is_streaming or response.close_callbacks:
+                close_database_session = False
+                return ClosingIterator(
+                    body, *response.close_callbacks, partial(self._close_database_session, database_session),
+                )
+            return body
+        finally:
+            if close_database_session:
+                self._close_database_session(database_session)
 
     def include_router(self, router: Router):
         self._routers.append(router)
+        for route in router.routes:
+            self._routes_tree.add_route(route)
+
+    def mount_static_files(self, path: str, static_files: StaticFiles):
+        self._routes_tree.add_route(
+            Route(
+                methods=['GET', 'HEAD'],
+                handler=static_files,
+                path=f'{path.rstrip("/")}/{{path:path}}',
+                is_fallback=True,
+            ),
+        )
+
+    def add_middleware(self, middleware: MiddlewareABC):
+        self._middlewares.append(middleware)
+        self._build_middlewares_pipeline()
+
+    def enable_tracing(self, tracer: Tracer):
+        self._middlewares.insert(0, TracingMiddleware(tracer))
+        self._build_middlewares_pipeline()
+
+    def enable_metrics(self, registry: MetricsRegistry, path: str = '/metrics'):
+        self._middlewares.insert(0, MetricsMiddleware(registry))
+        self._build_middlewares_pipeline()
+        self._routes_tree.add_route(Route(methods=['GET'], handler=MetricsEndpoint(registry), path=path))
+
+    def enable_middlewares_timing(self, enabled: bool = True):
+        self._middlewares_timing_enabled = enabled
+        self._build_middlewares_pipeline()
+
+    def enable_profiling(self, request_profiler: RequestProfiler):
+        self._request_profiler = request_profiler
 
     def change_logger_configuration(self, configuration: dict):
         self.logger.configuration = configuration
 
-    def override_dependencies(self, dependencies: dict[Callable, Callable]):
-        self.__dependencies.update(dependencies)
+    def override_dependencies(self, dependencies: dict[Callable, Union[Callable, Dependency]]):
+        self.__dependencies_resolver.update(dependencies)
 
     def set_authentication_failed_redirect_path(self, path: str):
         self._authentication_failed_redirect_path = path
 
     def set_database_session_maker(self, database_connection_opener: Type[DatabaseSessionMakerABC]):
-        self.__database_session_maker = database_connection_opener
+        self._database_session_maker = database_connection_opener
 
     def set_sessions_backend(self, session_backend: SessionsBackendABC):
         self.__sessions_backend = session_backend
-        self.__request_creator.sessions_backend = session_backend
-
-    def set_templates_path(self, path: str):
-        environment = Environment(loader=FileSystemLoader(path))
-        self.__dependencies[Environment] = lambda: environment
-
-    def handle_request(self, request: Request, database_session: DatabaseSessionMakerABC) -> ResponseABC:
-        for router in self._routers:
-            route: Route = router.get_route(path=request.path)
-            if route:
-                if request.method not in route.methods:
-                    return SimpleResponse(request, 405, 'Method is not allowed')
-                return self.inject_dependencies(route.handler, request, database_session)
-        return SimpleResponse(request, 404, 'Path is not valid')
-
-    def inject_dependencies(self, handler: Callable, *args, **kwargs):
-        for param_name, param in signature(handler).parameters.items():
-            if dependency := self.__dependencies.get(param.annotation):
-                kwargs[param_name] = dependency()  # TODO: make it possible to pass arguments in dependencies as well
-        return handler(*args, **kwargs)
+        self._request_creator.sessions_backend = session_backend
+
+    def set_templates_path(
+        self,
+        path: str,
+        auto_reload: bool = True,
+        bytecode_cache_directory: Optional[str] = None,
+        cache_size: int = 400,
+        preload: bool = False,
+    ):
+        environment = create_templates_environment(path, auto_reload, bytecode_cache_directory, cache_size)
+        if preload:
+            preload_templates(environment)
+        self.__dependencies_resolver.update(
+            {Environment: Dependency(lambda: environment, scope=DependencyScope.SINGLETON)},
+        )
+
+    def _build_middlewares_pipeline(self):
+        if not self._middlewares and not self._middlewares_timing_enabled:
+            self._middlewares_pipeline = self._handle_request_safely
+            return
+        self._middlewares_pipeline = MiddlewaresPipeline(
+            self._handle_request_safely, self._middlewares, timing_enabled=self._middlewares_timing_enabled,
+        )
+
+    def _handle_request_safely(self, request: Request, database_session: LazyDatabaseSession) -> ResponseABC:
+        try:
+            response = self.handle_request(request, database_session)
+            self._save_session(request, response)
+            return response
+        except Exception as e:
+            return self._handle_exception(request, e)
+
+    async def _handle_request_safely_async(
+        self, request: Request, database_session: LazyDatabaseSession,
+    ) -> ResponseABC:
+        try:
+            response = self.handle_request(request, database_session)
+            if isawaitable(response):
+                response = await response
+            self._save_session(request, response)
+            return response
+        except Exception as e:
+            return self._handle_exception(request, e)
+
+    def _handle_exception(self, request: Request, exception: Exception) -> ResponseABC:
+        if isinstance(exception, AuthenticationError):
+            self.logger.exception(f'Authentication error after accessing "{request.path}"')
+            response = SimpleResponse(request, 302, '')
+            response.add_header('Location', self._authentication_failed_redirect_path)
+            return response
+        self.logger.exception(f'Unexpected error occurred after accessing "{request.path}"')
+        return SimpleResponse(request, 500, '')
+
+    def _save_session(self, request: Request, response: ResponseABC):
+        if (session := request.loaded_session) is None:
+            return
+        with span('session_save'):
+            if cookie_value := request.sessions_backend.save_session(session):
+                response.set_session_cookie(cookie_value)
+
+    def _close_database_session(self, database_session: LazyDatabaseSession):
+        database_session.close()
+        self.database_sessions_statistics.record(database_session)
+
+    def handle_request(self, request: Request, database_session: LazyDatabaseSession) -> ResponseABC:
+        if not (route_match := self._routes_tree.match(request.path, request.method)):
+            return SimpleResponse(request, 404, 'Path is not valid')
+        if not route_match.route:
+            response = SimpleResponse(request, 405, 'Method is not allowed')
+            response.add_header('Allow', ', '.join(route_match.allowed_methods))
+            return response
+        request.environ[ROUTE_ENVIRON_KEY] = route_match.route.path
+        with span('handler', route=route_match.route.path):
+            return self.inject_dependencies(
+                route_match.route.handler, request, database_session, **route_match.path_parameters,
+            )
+
+    def inject_dependencies(
+        self, handler: Callable, request: Request, database_session: LazyDatabaseSession, **kwargs,
+    ):
+        plan = self.__dependencies_resolver.get_plan(handler)
+        if plan.steps:
+            context = {Request: request, LazyDatabaseSession: database_session}
+            kwargs.update(self.__dependencies_resolver.resolve(plan, context))
+        return handler(request, database_session, **kwargs)
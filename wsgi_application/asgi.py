@@ -0,0 +1,156 @@
+import asyncio
+import contextvars
+import io
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from inspect import iscoroutinefunction, unwrap
+from typing import Callable, Optional, Union
+
+from wsgi_application.application import Application
+from wsgi_application.database import LazyDatabaseSession
+from wsgi_application.middlewares import MiddlewaresPipeline
+from wsgi_application.request import Request
+from wsgi_application.response import ResponseABC
+from wsgi_application.sessions import (
+    SESSION_REQUIRED_ATTRIBUTE,
+    AsyncSessionsBackendABC,
+    PrefetchedSessionsBackend,
+    SessionsBackendABC,
+)
+
+
+class AsgiApplication(Application):
+    def __init__(self, max_threads: int = 20):
+        super().__init__()
+        self.__executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix='asgi_handler')
+        self.__async_sessions_backend: Optional[AsyncSessionsBackendABC] = None
+        self.__async_handlers: dict[Callable, bool] = {}
+        self._async_middlewares_pipeline = MiddlewaresPipeline(self._handle_request_safely_async)
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable):
+        if scope['type'] == 'lifespan':
+            return await self.__handle_lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError(f'Unsupported ASGI scope type "{scope["type"]}"')
+        loop = asyncio.get_running_loop()
+        request = self._request_creator.create_request(await self.__build_environ(scope, receive))
+        database_session = LazyDatabaseSession(self._database_session_maker)
+        try:
+            try:
+                route_match = self._routes_tree.match(request.path, request.method)
+                handler = route_match.route.handler if route_match and route_match.route else None
+                sessions_backend = await self.__prefetch_session(request, handler) if handler else None
+                if handler and not self.__is_async_handler(handler):
+                    context = contextvars.copy_context()
+                    response: ResponseABC = await loop.run_in_executor(
+                        self.__executor, context.run, self._middlewares_pipeline, request, database_session,
+                    )
+                else:
+                    response = await self._async_middlewares_pipeline.call_async(request, database_session)
+                    context = contextvars.copy_context()
+                if sessions_backend and sessions_backend.pending_operations:
+                    await sessions_backend.flush()
+            except Exception:
+                self.logger.exception(f'Unexpected error occurred after accessing "{scope["path"]}"')
+                await send({'type': 'http.response.start', 'status': 500, 'headers': []})
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+                return
+            await self.__send_response(response, send, loop, context)
+        finally:
+            if database_session.is_opened:
+                await loop.run_in_executor(self.__executor, self._close_database_session, database_session)
+            else:
+                self._close_database_session(database_session)
+
+    def set_sessions_backend(self, session_backend: Union[SessionsBackendABC, AsyncSessionsBackendABC]):
+        if isinstance(session_backend, AsyncSessionsBackendABC):
+            self.__async_sessions_backend = session_backend
+            return
+        self.__async_sessions_backend = None
+        super().set_sessions_backend(session_backend)
+
+    def _build_middlewares_pipeline(self):
+        super()._build_middlewares_pipeline()
+        self._async_middlewares_pipeline = MiddlewaresPipeline(
+            self._handle_request_safely_async, self._middlewares, timing_enabled=self._middlewares_timing_enabled,
+        )
+
+    def __is_async_handler(self, handler: Callable) -> bool:
+        if (is_async := self.__async_handlers.get(handler)) is None:
+            is_async = self.__async_handlers[handler] = iscoroutinefunction(unwrap(handler))
+        return is_async
+
+    async def __prefetch_session(self, request: Request, handler: Callable) -> Optional[PrefetchedSessionsBackend]:
+        if not self.__async_sessions_backend:
+            return
+        session_id = request.session_id
+        if getattr(handler, SESSION_REQUIRED_ATTRIBUTE, False) or self.__is_async_handler(handler):
+            session = await self.__async_sessions_backend.load_session(session_id)
+        else:
+            session = None
+        request.sessions_backend = PrefetchedSessionsBackend(
+            self.__async_sessions_backend, session_id, session, asyncio.get_running_loop(),
+        )
+        return request.sessions_backend
+
+    async def __build_environ(self, scope: dict, receive: Callable) -> dict:
+        body = bytearray()
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if message['type'] != 'http.request' or not message.get('more_body'):
+                break
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'PATH_INFO': scope['path'],
+            'SCRIPT_NAME': scope.get('root_path', ''),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+            'wsgi.input': io.BytesIO(bytes(body)),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'asgi.scope': scope,
+        }
+        for name, value in scope.get('headers', ()):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                name = f'HTTP_{name}'
+            value = value.decode('latin-1')
+            if name in environ:
+                value = f'{environ[name]}{"; " if name == "HTTP_COOKIE" else ","}{value}'
+            environ[name] = value
+        return environ
+
+    async def __send_response(
+        self, response: ResponseABC, send: Callable, loop: asyncio.AbstractEventLoop, context: contextvars.Context,
+    ):
+        await send({
+            'type': 'http.response.start',
+            'status': int(str(response.status).split()[0]),
+            'headers': [(key.lower().encode('latin-1'), value.encode('latin-1')) for key, value in response.headers],
+        })
+        body = response.format_response()
+        try:
+            if isinstance(body, (list, tuple)):
+                for chunk in body:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            else:
+                chunks = iter(body)
+                read_chunk = partial(context.run, next, chunks, None)
+                while (chunk := await loop.run_in_executor(self.__executor, read_chunk)) is not None:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        finally:
+            if close := getattr(body, 'close', None):
+                await loop.run_in_executor(self.__executor, context.run, close)
+            for callback in response.close_callbacks:
+                await loop.run_in_executor(self.__executor, context.run, callback)
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    async def __handle_lifespan(self, receive: Callable, send: Callable):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.__executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
@@ -0,0 +1,115 @@
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from wsgi_application.middlewares import MiddlewareABC
+from wsgi_application.request import Request
+from wsgi_application.response import ClosingIterator, FileResponse, ResponseABC
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+ENCODINGS_WINDOW_BITS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+
+class CompressedResponse(ResponseABC):
+    def __init__(
+        self,
+        response: ResponseABC,
+        encoding: str,
+        body: Iterable[bytes],
+        content_length: Optional[int] = None,
+    ):
+        super().__init__(response.request, response.status, '')
+        self.is_streaming = response.is_streaming
+        self.content_length = content_length
+        self.__response = response
+        self.__encoding = encoding
+        self.__body = body
+        for callback in response.close_callbacks:
+            self.call_on_close(callback)
+
+    @property
+    def headers(self) -> list[tuple, ...]:
+        headers = [(key, value) for key, value in self.__response.headers if key.lower() != 'content-length']
+        headers.append(('Content-Encoding', self.__encoding))
+        if self.content_length is not None:
+            headers.append(('Content-Length', str(self.content_length)))
+        headers.extend(super().headers[1:])
+        return headers
+
+    def format_response(self) -> Iterable[bytes]:
+        return self.__body
+
+
+class ResponseCompressor:
+    def __init__(
+        self,
+        minimum_size: int = 500,
+        compression_level: int = 6,
+        encodings: tuple[str, ...] = ('gzip', 'deflate'),
+    ):
+        self.minimum_size = minimum_size
+        self.compression_level = compression_level
+        self.encodings = encodings
+
+    def compress(self, request: Request, response: ResponseABC) -> ResponseABC:
+        if isinstance(response, FileResponse) or response.status in (204, 304, '204', '304'):
+            return response
+        content_type, vary = '', ''
+        for key, value in response.headers:
+            key = key.lower()
+            if key == 'content-encoding':
+                return response
+            if key == 'content-type':
+                content_type = value
+            elif key == 'vary':
+                vary += value.lower()
+        if not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES):
+            return response
+        if 'accept-encoding' not in vary:
+            response.add_header('Vary', 'Accept-Encoding')
+        if not (encoding := self.__choose_encoding(request)):
+            return response
+        if response.is_streaming:
+            content_length = getattr(response, 'content_length', None)
+            if content_length is not None and content_length < self.minimum_size:
+                return response
+            body = response.format_response()
+            compressed_body = ClosingIterator(self.__compress_chunks(body, encoding), body.close)
+            return CompressedResponse(response, encoding, compressed_body)
+        body = b''.join(response.format_response())
+        if len(body) < self.minimum_size:
+            return response
+        compressed_body = self.__compress(body, encoding)
+        return CompressedResponse(response, encoding, [compressed_body], content_length=len(compressed_body))
+
+    def __choose_encoding(self, request: Request) -> Optional[str]:
+        for encoding in self.encodings:
+            if request.accepts_encoding(encoding):
+                return encoding
+
+    def __compress(self, body: bytes, encoding: str) -> bytes:
+        compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, ENCODINGS_WINDOW_BITS[encoding])
+        return compressor.compress(body) + compressor.flush()
+
+    def __compress_chunks(self, chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+        compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, ENCODINGS_WINDOW_BITS[encoding])
+        for chunk in chunks:
+            if chunk:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+class CompressionMiddleware(MiddlewareABC):
+    def __init__(self, response_compressor: ResponseCompressor):
+        self.response_compressor = response_compressor
+
+    def after_request(self, request: Request, response: ResponseABC) -> ResponseABC:
+        return self.response_compressor.compress(request, response)
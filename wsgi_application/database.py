@@ -1,4 +1,17 @@
 import abc
+import re
+from collections import Counter
+from contextvars import ContextVar
+from functools import partial
+from typing import Optional, Type
+
+from wsgi_application.logging import LoggerABC
+from wsgi_application.middlewares import MiddlewareABC
+from wsgi_application.request import Request
+from wsgi_application.response import ResponseABC
+
+QUERY_STATISTICS_ENVIRON_KEY = 'wsgi_application.db_queries'
+EXPANDED_PARAMETERS_PATTERN = re.compile(r'\((?:\s*(?:%\(\w+\)s|\?|:\w+)\s*,?)+\)')
 
 
 class DatabaseSessionMakerABC:
@@ -38,3 +51,119 @@ class FakeDatabaseSessionMaker(DatabaseSessionMakerABC):
 
     def close(self):
         pass
+
+
+class LazyDatabaseSession:
+    def __init__(self, database_session_maker: Type[DatabaseSessionMakerABC]):
+        self.__database_session_maker_class = database_session_maker
+        self.__database_session_maker: Optional[DatabaseSessionMakerABC] = None
+        self.__session = None
+
+    @property
+    def is_opened(self) -> bool:
+        return self.__database_session_maker is not None
+
+    def __getattr__(self, name: str):
+        return getattr(self.__get_session(), name)
+
+    def commit(self):
+        if self.is_opened:
+            self.__database_session_maker.commit()
+
+    def rollback(self):
+        if self.is_opened:
+            self.__database_session_maker.rollback()
+
+    def close(self):
+        if self.is_opened:
+            self.__database_session_maker.rollback()
+            self.__database_session_maker.close()
+
+    def __get_session(self):
+        if self.__database_session_maker is None:
+            self.__database_session_maker = self.__database_session_maker_class()
+            self.__session = self.__database_session_maker.open_session()
+        return self.__session
+
+
+class DatabaseSessionsStatistics:
+    def __init__(self):
+        self.requests = 0
+        self.requests_without_database_session = 0
+
+    @property
+    def opened_database_sessions(self) -> int:
+        return self.requests - self.requests_without_database_session
+
+    def record(self, database_session: LazyDatabaseSession):
+        self.requests += 1
+        if not database_session.is_opened:
+            self.requests_without_database_session += 1
+
+
+class QueryStatistics:
+    def __init__(self):
+        self.queries_count = 0
+        self.total_time = 0.0
+        self.statements_shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.queries_count += 1
+        self.total_time += duration
+        self.statements_shapes[EXPANDED_PARAMETERS_PATTERN.sub('(?)', statement)] += 1
+
+    def get_repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        return [(shape, count) for shape, count in self.statements_shapes.most_common() if count >= threshold]
+
+    def __str__(self) -> str:
+        return f'{self.queries_count}q/{self.total_time * 1000:.1f}ms'
+
+
+_current_query_statistics: ContextVar[Optional[QueryStatistics]] = ContextVar('current_query_statistics', default=None)
+
+
+def get_current_query_statistics() -> Optional[QueryStatistics]:
+    return _current_query_statistics.get()
+
+
+class QueryStatisticsMiddleware(MiddlewareABC):
+    def __init__(
+        self,
+        logger: LoggerABC,
+        max_queries: int = 20,
+        repeated_statement_threshold: int = 3,
+        debug_header: Optional[str] = None,
+    ):
+        self.logger = logger
+        self.max_queries = max_queries
+        self.repeated_statement_threshold = repeated_statement_threshold
+        self.debug_header = debug_header
+
+    def before_request(self, request: Request) -> Optional[ResponseABC]:
+        request.environ[QUERY_STATISTICS_ENVIRON_KEY] = QueryStatistics()
+        _current_query_statistics.set(request.environ[QUERY_STATISTICS_ENVIRON_KEY])
+        return None
+
+    def after_request(self, request: Request, response: ResponseABC) -> ResponseABC:
+        statistics: QueryStatistics = request.environ[QUERY_STATISTICS_ENVIRON_KEY]
+        if self.debug_header:
+            response.add_header(self.debug_header, str(statistics))
+        if response.is_streaming:
+            response.call_on_close(partial(self.__finish_statistics, request, statistics))
+        else:
+            self.__finish_statistics(request, statistics)
+        return response
+
+    def __finish_statistics(self, request: Request, statistics: QueryStatistics):
+        _current_query_statistics.set(None)
+        if statistics.queries_count > self.max_queries:
+            self.logger.warning(
+                f'"{request.method} {request.path}" ran {statistics.queries_count} queries '
+                f'(limit {self.max_queries}) in {statistics.total_time * 1000:.1f}ms',
+                specified_loggers=('application.performance',),
+            )
+        for shape, count in statistics.get_repeated_statements(self.repeated_statement_threshold):
+            self.logger.warning(
+                f'"{request.method} {request.path}" repeated a statement {count} times, possible N+1: {shape}',
+                specified_loggers=('application.performance',),
+            )
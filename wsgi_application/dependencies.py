@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from enum import Enum
+from inspect import signature
+from typing import Any, Callable, Iterable, Union
+
+
+class DependencyScope(str, Enum):
+    REQUEST = 'request'
+    SINGLETON = 'singleton'
+
+
+@dataclass(frozen=True)
+class Dependency:
+    provider: Callable
+    scope: DependencyScope = DependencyScope.REQUEST
+
+
+class DependencyResolutionError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class InjectionStep:
+    key: Any
+    dependency: Dependency
+    arguments: tuple[tuple[str, Any], ...]
+
+
+@dataclass(frozen=True)
+class InjectionPlan:
+    steps: tuple[InjectionStep, ...]
+    parameters: tuple[tuple[str, Any], ...]
+
+
+class DependenciesResolver:
+    def __init__(self, context_types: Iterable[Any] = ()):
+        self.__dependencies: dict[Any, Dependency] = {}
+        self.__context_types = frozenset(context_types)
+        self.__plans: dict[Callable, InjectionPlan] = {}
+        self.__singletons: dict[Any, Any] = {}
+
+    def update(self, dependencies: dict[Any, Union[Callable, Dependency]]):
+        for key, dependency in dependencies.items():
+            if not isinstance(dependency, Dependency):
+                dependency = Dependency(provider=dependency)
+            self.__dependencies[key] = dependency
+            self.__singletons.pop(key, None)
+        self.__plans.clear()
+
+    def get_plan(self, handler: Callable) -> InjectionPlan:
+        if (plan := self.__plans.get(handler)) is None:
+            plan = self.__plans[handler] = self.build_plan(handler)
+        return plan
+
+    def build_plan(self, handler: Callable) -> InjectionPlan:
+        steps: list[InjectionStep] = []
+        planned_keys = set()
+        parameters = []
+        for param_name, param in signature(handler).parameters.items():
+            if param.annotation in self.__dependencies:
+                self.__add_steps(param.annotation, steps, planned_keys, ())
+                parameters.append((param_name, param.annotation))
+        return InjectionPlan(steps=tuple(steps), parameters=tuple(parameters))
+
+    def resolve(self, plan: InjectionPlan, context: dict[Any, Any]) -> dict[str, Any]:
+        for step in plan.steps:
+            if step.key in context:
+                continue
+            if step.dependency.scope is DependencyScope.SINGLETON and step.key in self.__singletons:
+                context[step.key] = self.__singletons[step.key]
+                continue
+            value = step.dependency.provider(**{name: context[key] for name, key in step.arguments})
+            if step.dependency.scope is DependencyScope.SINGLETON:
+                self.__singletons[step.key] = value
+            context[step.key] = value
+        return {name: context[key] for name, key in plan.parameters}
+
+    def __add_steps(self, key: Any, steps: list[InjectionStep], planned_keys: set, resolution_chain: tuple):
+        if key in planned_keys or key in self.__context_types:
+            return
+        if key in resolution_chain:
+            chain = ' -> '.join(getattr(item, '__name__', str(item)) for item in resolution_chain + (key,))
+            raise DependencyResolutionError(f'Circular dependency: {chain}')
+        dependency = self.__dependencies[key]
+        arguments = []
+        for param_name, param in signature(dependency.provider).parameters.items():
+            if param.annotation in self.__dependencies or param.annotation in self.__context_types:
+                self.__add_steps(param.annotation, steps, planned_keys, resolution_chain + (key,))
+                arguments.append((param_name, param.annotation))
+        steps.append(InjectionStep(key=key, dependency=dependency, arguments=tuple(arguments)))
+        planned_keys.add(key)
@@ -0,0 +1,56 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from wsgi_application.metrics import MetricsRegistry
+
+
+class FragmentCache:
+    def __init__(self, name: str, max_bytes: int = 8 * 1024 * 1024, metrics_registry: Optional[MetricsRegistry] = None):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.__fragments: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__cache_requests = metrics_registry.counter(
+            'fragments_cache_requests_total', 'Fragment cache lookups', ('cache', 'result'),
+        ) if metrics_registry else None
+        self.__cache_size = metrics_registry.gauge(
+            'fragments_cache_bytes', 'Bytes held by the fragment cache', ('cache',),
+        ) if metrics_registry else None
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / (self.hits + self.misses) if self.hits or self.misses else 0.0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.__lock:
+            if (cached := self.__fragments.get(key)) is not None:
+                self.__fragments.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if self.__cache_requests:
+            self.__cache_requests.inc(cache=self.name, result='miss' if cached is None else 'hit')
+        return cached[0] if cached is not None else None
+
+    def set(self, key: Hashable, fragment: Any, size: int):
+        if size > self.max_bytes:
+            return
+        with self.__lock:
+            if (replaced := self.__fragments.pop(key, None)) is not None:
+                self.size -= replaced[1]
+            self.__fragments[key] = (fragment, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                self.size -= self.__fragments.popitem(last=False)[1][1]
+            size_after = self.size
+        if self.__cache_size:
+            self.__cache_size.set(size_after, cache=self.name)
+
+    def clear(self):
+        with self.__lock:
+            self.__fragments.clear()
+            self.size = 0
@@ -1,6 +1,12 @@
 import abc
+import atexit
 import copy
 import logging
+import os
+import queue
+import weakref
+from enum import Enum
+from logging.handlers import QueueHandler, QueueListener
 from typing import Union, Optional
 
 
@@ -23,6 +29,17 @@ def get_default_logging_configuration():
                 'level': logging.ERROR,
                 'propagate': False,
             },
+            'application.performance': {
+                'handlers': [
+                    {
+                        'level': logging.WARNING,
+                        'handler': 'console',
+                        'propagate': False,
+                    },
+                ],
+                'level': logging.WARNING,
+                'propagate': False,
+            },
         },
         'handlers': {
             'console': {
@@ -71,24 +88,121 @@ class LoggerABC(abc.ABC):
         pass
 
 
+class QueueOverflowPolicy(str, Enum):
+    DROP = 'drop'
+    BLOCK = 'block'
+
+
+class LoggingQueueStatistics:
+    def __init__(self):
+        self.queued = 0
+        self.dropped = 0
+
+
+class BoundedQueueHandler(QueueHandler):
+    def __init__(
+        self,
+        records_queue: queue.Queue,
+        statistics: LoggingQueueStatistics,
+        overflow_policy: QueueOverflowPolicy = QueueOverflowPolicy.DROP,
+        block_timeout: float = 0.1,
+    ):
+        super().__init__(records_queue)
+        self.statistics = statistics
+        self.overflow_policy = QueueOverflowPolicy(overflow_policy)
+        self.block_timeout = block_timeout
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.overflow_policy is QueueOverflowPolicy.BLOCK:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.statistics.dropped += 1
+            return
+        self.statistics.queued += 1
+
+
+class LoggingQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class LoggersHandlersDispatcher(logging.Handler):
+    def __init__(self, loggers_handlers: dict[str, list[logging.Handler]]):
+        super().__init__()
+        self.loggers_handlers = loggers_handlers
+
+    def handle(self, record: logging.LogRecord):
+        for handler in self.loggers_handlers.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+_loggers: 'weakref.WeakSet[Logger]' = weakref.WeakSet()
+
+
+def _stop_loggers():
+    for logger in list(_loggers):
+        logger.stop()
+
+
+def _restart_loggers_queue_listeners():
+    for logger in list(_loggers):
+        logger._restart_queue_listener()
+
+
+atexit.register(_stop_loggers)
+os.register_at_fork(after_in_child=_restart_loggers_queue_listeners)
+
+
 class Logger(LoggerABC):
     logger_levels_ascending_order = (logging.CRITICAL, logging.ERROR, logging.WARNING, logging.INFO, logging.DEBUG)
 
     def __init__(self, configuration: dict):
         self.__configuration = configuration
         self.loggers = {}
+        self.queue_statistics = LoggingQueueStatistics()
+        self.__attached_handlers: list[tuple[logging.Logger, logging.Handler]] = []
+        self.__queue_handlers: list[BoundedQueueHandler] = []
+        self.__queue_listener: Optional[LoggingQueueListener] = None
         self.__configure_loggers()
+        _loggers.add(self)
 
     @property
     def configuration(self) -> dict:
-        return copy.deepcopy(self.configuration)
+        return copy.deepcopy(self.__configuration)
 
     @configuration.setter
     def configuration(self, configuration: dict):
         self.__configuration = configuration
         self.__configure_loggers()
 
+    def stop(self):
+        if self.__queue_listener:
+            self.__queue_listener.stop()
+            self.__queue_listener = None
+
+    def _restart_queue_listener(self):
+        if not self.__queue_handlers:
+            return
+        self.__queue_listener = None
+        records_queue = queue.Queue(self.__configuration['queue'].get('maxsize', 10_000))
+        for queue_handler in self.__queue_handlers:
+            queue_handler.queue = records_queue
+        self.__queue_listener = LoggingQueueListener(records_queue, self.__dispatcher)
+        self.__queue_listener.start()
+
     def __configure_loggers(self):
+        self.stop()
+        for logger, handler in self.__attached_handlers:
+            logger.removeHandler(handler)
+        self.__attached_handlers.clear()
+        self.__queue_handlers.clear()
+        self.loggers = {}
+        queue_configuration = self.__configuration.get('queue')
+        loggers_handlers: dict[str, list[logging.Handler]] = {}
         handlers = {}
         for handler_name in self.__configuration.get('handlers', {}):
             handler_data = self.__configuration['handlers'][handler_name].copy()
@@ -109,13 +223,30 @@ class Logger(LoggerABC):
                 handler = copy.copy(handlers[handler_data['handler']])
                 handler.setLevel(handler_data['level'])
                 handler.propagate = handler_data.get('propagate', False)
-                logger.addHandler(handler)
+                if queue_configuration is None:
+                    logger.addHandler(handler)
+                    self.__attached_handlers.append((logger, handler))
+                else:
+                    loggers_handlers.setdefault(logger_name, []).append(handler)
+            if queue_configuration is not None:
+                queue_handler = BoundedQueueHandler(
+                    queue.Queue(),
+                    self.queue_statistics,
+                    overflow_policy=queue_configuration.get('overflow_policy', QueueOverflowPolicy.DROP),
+                    block_timeout=queue_configuration.get('block_timeout', 0.1),
+                )
+                logger.addHandler(queue_handler)
+                self.__attached_handlers.append((logger, queue_handler))
+                self.__queue_handlers.append(queue_handler)
             if logger.propagate:
                 logger_level_index = self.logger_levels_ascending_order.index(logger_level)
                 for logger_level in self.logger_levels_ascending_order[:logger_level_index + 1]:
                     self.loggers.setdefault(logger_level, {})[logger_name] = logger
             else:
                 self.loggers.setdefault(logger_level, {})[logger_name] = logger
+        if queue_configuration is not None:
+            self.__dispatcher = LoggersHandlersDispatcher(loggers_handlers)
+            self._restart_queue_listener()
 
     def debug(self, msg, *args, specified_loggers: tuple[str] = (), **kwargs):
         if not (loggers := self.__get_loggers(logging.DEBUG, specified_loggers)):
@@ -0,0 +1,333 @@
+import abc
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+from typing import Iterable, Iterator, Optional, Union
+
+from wsgi_application.middlewares import MiddlewareABC
+from wsgi_application.request import Request
+from wsgi_application.response import ResponseABC
+from wsgi_application.routing import ROUTE_ENVIRON_KEY
+
+METRICS_FILE_SUFFIX = '.metrics'
+DEAD_PROCESSES_METRICS_FILE = f'dead_processes{METRICS_FILE_SUFFIX}'
+REQUEST_STARTED_AT_ENVIRON_KEY = 'wsgi_application.request_started_at'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0, math.inf)
+
+_HEADER = struct.Struct('i4x')
+_KEY_LENGTH = struct.Struct('i')
+_VALUE = struct.Struct('d')
+
+
+def _format_label_value(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_bucket_bound(bound: float) -> str:
+    return '+Inf' if bound == math.inf else repr(float(bound))
+
+
+class MmapValuesFile:
+    initial_size = 1 << 16
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__file = open(path, 'a+b')
+        if os.fstat(self.__file.fileno()).st_size == 0:
+            self.__file.truncate(self.initial_size)
+        self.__mmap = mmap.mmap(self.__file.fileno(), 0)
+        self.__used = _HEADER.unpack_from(self.__mmap, 0)[0] or _HEADER.size
+        self.__offsets = {key: offset for key, _, offset in iterate_values(self.__mmap)}
+
+    def get_offset(self, key: str) -> int:
+        if (offset := self.__offsets.get(key)) is None:
+            offset = self.__offsets[key] = self.__append_key(key)
+        return offset
+
+    def add(self, offset: int, amount: float):
+        _VALUE.pack_into(self.__mmap, offset, _VALUE.unpack_from(self.__mmap, offset)[0] + amount)
+
+    def set(self, offset: int, value: float):
+        _VALUE.pack_into(self.__mmap, offset, value)
+
+    def close(self):
+        self.__mmap.close()
+        self.__file.close()
+
+    def __append_key(self, key: str) -> int:
+        encoded_key = key.encode()
+        padding = -(_KEY_LENGTH.size + len(encoded_key)) % 8
+        entry_size = _KEY_LENGTH.size + len(encoded_key) + padding + _VALUE.size
+        while self.__used + entry_size > len(self.__mmap):
+            self.__resize(len(self.__mmap) * 2)
+        _KEY_LENGTH.pack_into(self.__mmap, self.__used, len(encoded_key))
+        self.__mmap[self.__used + _KEY_LENGTH.size:self.__used + _KEY_LENGTH.size + len(encoded_key)] = encoded_key
+        offset = self.__used + entry_size - _VALUE.size
+        _VALUE.pack_into(self.__mmap, offset, 0.0)
+        self.__used += entry_size
+        _HEADER.pack_into(self.__mmap, 0, self.__used)
+        return offset
+
+    def __resize(self, size: int):
+        self.__mmap.close()
+        self.__file.truncate(size)
+        self.__mmap = mmap.mmap(self.__file.fileno(), 0)
+
+
+def iterate_values(data: Union[bytes, mmap.mmap]) -> Iterator[tuple[str, float, int]]:
+    used = _HEADER.unpack_from(data, 0)[0] if len(data) >= _HEADER.size else 0
+    position = _HEADER.size
+    while position < used:
+        key_length = _KEY_LENGTH.unpack_from(data, position)[0]
+        key_start = position + _KEY_LENGTH.size
+        key = bytes(data[key_start:key_start + key_length]).decode()
+        offset = key_start + key_length + (-(_KEY_LENGTH.size + key_length) % 8)
+        yield key, _VALUE.unpack_from(data, offset)[0], offset
+        position = offset + _VALUE.size
+
+
+def read_values_file(path: str) -> Iterator[tuple[str, float]]:
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return
+    for key, value, _ in iterate_values(data):
+        yield key, value
+
+
+def mark_process_dead(directory: str, pid: int):
+    path = os.path.join(directory, f'{pid}{METRICS_FILE_SUFFIX}')
+    dead_processes_path = os.path.join(directory, DEAD_PROCESSES_METRICS_FILE)
+    values = defaultdict(float)
+    for values_path in (dead_processes_path, path):
+        for key, value in read_values_file(values_path):
+            if json.loads(key)[0] != Gauge.type:
+                values[key] += value
+    temporary_path = f'{dead_processes_path}.{os.getpid()}.tmp'
+    values_file = MmapValuesFile(temporary_path)
+    for key, value in values.items():
+        values_file.set(values_file.get_offset(key), value)
+    values_file.close()
+    os.replace(temporary_path, dead_processes_path)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def clear_metrics_directory(directory: str):
+    os.makedirs(directory, exist_ok=True)
+    for file_name in os.listdir(directory):
+        if file_name.endswith(METRICS_FILE_SUFFIX):
+            os.remove(os.path.join(directory, file_name))
+
+
+class MetricABC(abc.ABC):
+    type: str
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str, labels_names: Iterable[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labels_names = tuple(labels_names)
+
+    def _get_labels_values(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[label_name]) for label_name in self.labels_names)
+
+    def _build_key(self, sample_name: str, labels_values: tuple[str, ...], extra_labels: tuple = ()) -> str:
+        return json.dumps([self.type, self.name, sample_name, [*zip(self.labels_names, labels_values), *extra_labels]])
+
+
+class Counter(MetricABC):
+    type = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        self.registry.add(self, (self.name, self._get_labels_values(labels)), amount)
+
+
+class Gauge(MetricABC):
+    type = 'gauge'
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        self.registry.add(self, (self.name, self._get_labels_values(labels)), amount)
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.registry.add(self, (self.name, self._get_labels_values(labels)), -amount)
+
+    def set(self, value: float, **labels: str):
+        self.registry.set(self, (self.name, self._get_labels_values(labels)), value)
+
+
+class Histogram(MetricABC):
+    type = 'histogram'
+
+    def __init__(
+        self,
+        registry: 'MetricsRegistry',
+        name: str,
+        documentation: str,
+        labels_names: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_HISTOGRAM_BUCKETS,
+    ):
+        super().__init__(registry, name, documentation, labels_names)
+        self.buckets = tuple(sorted(buckets))
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+
+    def observe(self, value: float, **labels: str):
+        labels_values = self._get_labels_values(labels)
+        bucket = next(bound for bound in self.buckets if value <= bound)
+        self.registry.add(self, (f'{self.name}_bucket', labels_values, bucket), 1.0)
+        self.registry.add(self, (f'{self.name}_sum', labels_values), value)
+        self.registry.add(self, (f'{self.name}_count', labels_values), 1.0)
+
+
+class MetricsRegistry:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.__metrics: dict[str, MetricABC] = {}
+        self.__lock = threading.Lock()
+        self.__pid: Optional[int] = None
+        self.__values_file: Optional[MmapValuesFile] = None
+        self.__offsets: dict[tuple, int] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def counter(self, name: str, documentation: str, labels_names: Iterable[str] = ()) -> Counter:
+        return self.__register(Counter(self, name, documentation, labels_names))
+
+    def gauge(self, name: str, documentation: str, labels_names: Iterable[str] = ()) -> Gauge:
+        return self.__register(Gauge(self, name, documentation, labels_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels_names: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_HISTOGRAM_BUCKETS,
+    ) -> Histogram:
+        return self.__register(Histogram(self, name, documentation, labels_names, buckets))
+
+    def add(self, metric: MetricABC, sample: tuple, amount: float):
+        with self.__lock:
+            values_file = self.__get_values_file()
+            values_file.add(self.__get_offset(values_file, metric, sample), amount)
+
+    def set(self, metric: MetricABC, sample: tuple, value: float):
+        with self.__lock:
+            values_file = self.__get_values_file()
+            values_file.set(self.__get_offset(values_file, metric, sample), value)
+
+    def collect(self) -> str:
+        samples = defaultdict(lambda: defaultdict(float))
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(METRICS_FILE_SUFFIX):
+                for key, value in read_values_file(os.path.join(self.directory, file_name)):
+                    metric_type, name, sample_name, labels = json.loads(key)
+                    samples[(metric_type, name)][(sample_name, tuple(map(tuple, labels)))] += value
+        lines = []
+        for (metric_type, name), metric_samples in sorted(samples.items(), key=lambda item: item[0][1]):
+            if metric := self.__metrics.get(name):
+                lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            if metric_type == Histogram.type:
+                metric_samples = self.__accumulate_buckets(metric_samples, metric.buckets if metric else ())
+            for (sample_name, labels), value in sorted(metric_samples.items(), key=self.__get_sample_sort_key):
+                formatted_labels = ','.join(f'{label}="{_format_label_value(str(v))}"' for label, v in labels)
+                lines.append(f'{sample_name}{{{formatted_labels}}} {value!r}' if labels else f'{sample_name} {value!r}')
+        return '\n'.join(lines) + '\n'
+
+    def __register(self, metric: MetricABC):
+        if (registered_metric := self.__metrics.get(metric.name)) is not None:
+            return registered_metric
+        self.__metrics[metric.name] = metric
+        return metric
+
+    def __get_values_file(self) -> MmapValuesFile:
+        if self.__pid != (pid := os.getpid()):
+            self.__pid = pid
+            self.__offsets = {}
+            self.__values_file = MmapValuesFile(os.path.join(self.directory, f'{pid}{METRICS_FILE_SUFFIX}'))
+        return self.__values_file
+
+    def __get_offset(self, values_file: MmapValuesFile, metric: MetricABC, sample: tuple) -> int:
+        if (offset := self.__offsets.get(sample)) is None:
+            sample_name, labels_values, *bucket = sample
+            extra_labels = (('le', _format_bucket_bound(bucket[0])),) if bucket else ()
+            key = metric._build_key(sample_name, labels_values, extra_labels)
+            offset = self.__offsets[sample] = values_file.get_offset(key)
+        return offset
+
+    @staticmethod
+    def __get_sample_sort_key(sample: tuple) -> tuple:
+        (sample_name, labels), _ = sample
+        labels = dict(labels)
+        bound = float(labels.pop('le', '-inf'))
+        return sample_name, sorted(labels.items()), bound
+
+    @staticmethod
+    def __accumulate_buckets(metric_samples: dict[tuple, float], bounds: Iterable[float]) -> dict[tuple, float]:
+        buckets = defaultdict(lambda: {bound: 0.0 for bound in bounds})
+        accumulated_samples = {}
+        for (sample_name, labels), value in metric_samples.items():
+            if not sample_name.endswith('_bucket'):
+                accumulated_samples[(sample_name, labels)] = value
+                continue
+            bound = float(dict(labels)['le'])
+            bucket_values = buckets[(sample_name, tuple(label for label in labels if label[0] != 'le'))]
+            bucket_values[bound] = bucket_values.get(bound, 0.0) + value
+        for (sample_name, labels), bucket_values in buckets.items():
+            cumulative_value = 0.0
+            for bound, value in sorted(bucket_values.items()):
+                cumulative_value += value
+                accumulated_samples[(sample_name, (*labels, ('le', _format_bucket_bound(bound))))] = cumulative_value
+        return accumulated_samples
+
+
+class MetricsResponse(ResponseABC):
+    def __init__(self, request: Request, text: str):
+        super().__init__(request, 200, PROMETHEUS_CONTENT_TYPE)
+        self.text = text
+
+    def format_response(self):
+        return [self.text.encode()]
+
+
+class MetricsEndpoint:
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+
+    def __call__(self, request: Request, database_session) -> ResponseABC:
+        return MetricsResponse(request, self.registry.collect())
+
+
+class MetricsMiddleware(MiddlewareABC):
+    def __init__(self, registry: MetricsRegistry, unmatched_route_label: str = 'unmatched'):
+        self.unmatched_route_label = unmatched_route_label
+        self.requests_total = registry.counter(
+            'http_requests_total', 'Handled HTTP requests', ('method', 'route', 'status'),
+        )
+        self.request_duration = registry.histogram(
+            'http_request_duration_seconds', 'HTTP request handling latency', ('method', 'route'),
+        )
+        self.requests_in_progress = registry.gauge('http_requests_in_progress', 'HTTP requests being handled')
+
+    def before_request(self, request: Request) -> Optional[ResponseABC]:
+        request.environ[REQUEST_STARTED_AT_ENVIRON_KEY] = time.perf_counter()
+        self.requests_in_progress.inc()
+        return None
+
+    def after_request(self, request: Request, response: ResponseABC) -> ResponseABC:
+        duration = time.perf_counter() - request.environ.pop(REQUEST_STARTED_AT_ENVIRON_KEY)
+        self.requests_in_progress.dec()
+        route = request.environ.get(ROUTE_ENVIRON_KEY, self.unmatched_route_label)
+        status = str(response.status).split()[0]
+        self.requests_total.inc(method=request.method, route=route, status=status)
+        self.request_duration.observe(duration, method=request.method, route=route)
+        return response
@@ -0,0 +1,134 @@
+import abc
+from functools import partial
+from time import perf_counter
+from typing import Awaitable, Callable, Iterable, Optional, Union
+
+from wsgi_application.request import Request
+from wsgi_application.response import ResponseABC
+from wsgi_application.tracing import SpanContext, Trace, Tracer
+
+TIMINGS_ENVIRON_KEY = 'wsgi_application.timings'
+REQUEST_SPAN_ENVIRON_KEY = 'wsgi_application.request_span'
+
+
+class MiddlewareABC(abc.ABC):
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    def before_request(self, request: Request) -> Optional[ResponseABC]:
+        return None
+
+    def after_request(self, request: Request, response: ResponseABC) -> ResponseABC:
+        return response
+
+
+class MiddlewaresPipeline:
+    def __init__(
+        self,
+        handler: Callable[..., Union[ResponseABC, Awaitable[ResponseABC]]],
+        middlewares: Iterable[MiddlewareABC] = (),
+        timing_enabled: bool = False,
+    ):
+        self.__handler = handler
+        self.__middlewares = tuple(middlewares)
+        self.__timing_enabled = timing_enabled
+        self.__timing_names = self.__get_unique_names(self.__middlewares)
+
+    def __call__(self, request: Request, *args) -> ResponseABC:
+        timings = self.__start_timings(request)
+        response, entered_middlewares_count = self.__run_before_hooks(request, timings)
+        if response is None:
+            started_at = perf_counter()
+            response = self.__handler(request, *args)
+            if timings is not None:
+                timings['handler'] = perf_counter() - started_at
+        return self.__run_after_hooks(request, response, entered_middlewares_count, timings)
+
+    async def call_async(self, request: Request, *args) -> ResponseABC:
+        timings = self.__start_timings(request)
+        response, entered_middlewares_count = self.__run_before_hooks(request, timings)
+        if response is None:
+            started_at = perf_counter()
+            response = await self.__handler(request, *args)
+            if timings is not None:
+                timings['handler'] = perf_counter() - started_at
+        return self.__run_after_hooks(request, response, entered_middlewares_count, timings)
+
+    def __start_timings(self, request: Request) -> Optional[dict[str, float]]:
+        if not self.__timing_enabled:
+            return
+        timings = request.environ[TIMINGS_ENVIRON_KEY] = {}
+        return timings
+
+    def __run_before_hooks(
+        self, request: Request, timings: Optional[dict[str, float]],
+    ) -> tuple[Optional[ResponseABC], int]:
+        entered_middlewares_count = 0
+        for middleware, timing_name in zip(self.__middlewares, self.__timing_names):
+            entered_middlewares_count += 1
+            started_at = perf_counter()
+            response = middleware.before_request(request)
+            if timings is not None:
+                timings[timing_name] = perf_counter() - started_at
+            if response is not None:
+                return response, entered_middlewares_count
+        return None, entered_middlewares_count
+
+    def __run_after_hooks(
+        self,
+        request: Request,
+        response: ResponseABC,
+        entered_middlewares_count: int,
+        timings: Optional[dict[str, float]],
+    ) -> ResponseABC:
+        for index in reversed(range(entered_middlewares_count)):
+            started_at = perf_counter()
+            response = self.__middlewares[index].after_request(request, response)
+            if timings is not None:
+                timings[self.__timing_names[index]] += perf_counter() - started_at
+        if timings is not None:
+            response.add_header(
+                'Server-Timing', ', '.join(f'{name};dur={seconds * 1000:.3f}' for name, seconds in timings.items()),
+            )
+        return response
+
+    @staticmethod
+    def __get_unique_names(middlewares: tuple[MiddlewareABC, ...]) -> tuple[str, ...]:
+        names = []
+        for middleware in middlewares:
+            name = middleware.name
+            suffix = 1
+            while name in names:
+                suffix += 1
+                name = f'{middleware.name}_{suffix}'
+            names.append(name)
+        return tuple(names)
+
+
+class TracingMiddleware(MiddlewareABC):
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+
+    def before_request(self, request: Request) -> Optional[ResponseABC]:
+        if trace := self.tracer.start_trace():
+            request_span = SpanContext(trace, 'request', {'method': request.method, 'path': request.path})
+            request_span.__enter__()
+            request.environ[REQUEST_SPAN_ENVIRON_KEY] = (trace, request_span)
+        return None
+
+    def after_request(self, request: Request, response: ResponseABC) -> ResponseABC:
+        if not (traced_request := request.environ.pop(REQUEST_SPAN_ENVIRON_KEY, None)):
+            return response
+        trace, request_span = traced_request
+        response.add_header(self.tracer.trace_id_header, trace.trace_id)
+        if response.is_streaming:
+            response.call_on_close(partial(self.__finish_trace, trace, request_span, response.status))
+        else:
+            self.__finish_trace(trace, request_span, response.status)
+        return response
+
+    def __finish_trace(self, trace: Trace, request_span: SpanContext, status: Union[str, int]):
+        request_span.span.attributes['status'] = status
+        request_span.__exit__(None)
+        self.tracer.finish_trace(trace)
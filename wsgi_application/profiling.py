@@ -0,0 +1,120 @@
+import argparse
+import cProfile
+import hmac
+import os
+import pstats
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Optional, TypeVar
+from urllib.parse import quote, unquote
+
+from wsgi_application.request import Request
+from wsgi_application.routing import ROUTE_ENVIRON_KEY
+
+UNMATCHED_ROUTE = 'unmatched'
+PROFILE_FILE_SUFFIX = '.pstats'
+
+T = TypeVar('T')
+
+
+def build_profile_file_name(route: str, latency: float) -> str:
+    return f'{quote(route, safe="")}__{time.time_ns()}__{os.getpid()}__{latency * 1000:.1f}ms{PROFILE_FILE_SUFFIX}'
+
+
+def parse_profile_file_route(file_name: str) -> str:
+    return unquote(file_name.removesuffix(PROFILE_FILE_SUFFIX).rsplit('__', 3)[0])
+
+
+class RequestProfiler:
+    def __init__(
+        self,
+        directory: str,
+        sample_rate: float = 0.0,
+        secret_header: Optional[str] = None,
+        secret: Optional[str] = None,
+        max_files: int = 500,
+    ):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.__secret_header_environ_key = f'HTTP_{secret_header.upper().replace("-", "_")}' if secret_header else None
+        self.__secret = secret.encode() if secret else None
+        self.max_files = max_files
+        self.__lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def should_profile(self, request: Request) -> bool:
+        if self.__secret and self.__secret_header_environ_key:
+            header_value = request.environ.get(self.__secret_header_environ_key)
+            if header_value and hmac.compare_digest(header_value.encode(), self.__secret):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def profile(self, request: Request, function: Callable[..., T], *args) -> T:
+        if not self.__lock.acquire(blocking=False):
+            return function(*args)
+        try:
+            profiler = cProfile.Profile()
+            started_at = time.perf_counter()
+            profiler.enable()
+            try:
+                return function(*args)
+            finally:
+                profiler.disable()
+                latency = time.perf_counter() - started_at
+                self.__dump(profiler, request.environ.get(ROUTE_ENVIRON_KEY, UNMATCHED_ROUTE), latency)
+        finally:
+            self.__lock.release()
+
+    def __dump(self, profiler: cProfile.Profile, route: str, latency: float):
+        profiler.dump_stats(os.path.join(self.directory, build_profile_file_name(route, latency)))
+        self.__rotate()
+
+    def __rotate(self):
+        with os.scandir(self.directory) as entries:
+            profile_files = [entry for entry in entries if entry.name.endswith(PROFILE_FILE_SUFFIX)]
+        if len(profile_files) <= self.max_files:
+            return
+        profile_files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in profile_files[:len(profile_files) - self.max_files]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def group_profile_files_by_route(directory: str) -> dict[str, list[str]]:
+    profile_files = defaultdict(list)
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith(PROFILE_FILE_SUFFIX):
+            profile_files[parse_profile_file_route(file_name)].append(os.path.join(directory, file_name))
+    return profile_files
+
+
+def merge_profiles(directory: str, output_directory: Optional[str], sort: str, limit: int, route: Optional[str]):
+    for profiled_route, paths in group_profile_files_by_route(directory).items():
+        if route is not None and profiled_route != route:
+            continue
+        stats = pstats.Stats(*paths)
+        print(f'=== {profiled_route} ({len(paths)} profiles) ===')
+        stats.sort_stats(sort).print_stats(limit)
+        if output_directory:
+            os.makedirs(output_directory, exist_ok=True)
+            merged_file_name = f'{quote(profiled_route, safe="")}.merged{PROFILE_FILE_SUFFIX}'
+            stats.dump_stats(os.path.join(output_directory, merged_file_name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge request profiles per route')
+    parser.add_argument('directory')
+    parser.add_argument('--output-directory', default=None)
+    parser.add_argument('--sort', default='cumulative')
+    parser.add_argument('--limit', type=int, default=30)
+    parser.add_argument('--route', default=None)
+    arguments = parser.parse_args()
+    merge_profiles(arguments.directory, arguments.output_directory, arguments.sort, arguments.limit, arguments.route)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,10 @@
 import abc
-from dataclasses import dataclass
-from typing import Union, Any
+from functools import cached_property
+from typing import Any, Optional, Union
 from urllib import parse
 
-from wsgi_application.sessions import SessionsBackendABC, FilesystemSessionsBackend
-
-
-@dataclass(frozen=True)
-class Request:
-    path: str
-    method: str
-    cookies: dict
-    session_id: str
-    session: dict
-    sessions_backend: SessionsBackendABC
-    body: Any
-    query_params: dict[str, Union[str, list[str]]]
+from wsgi_application.sessions import FilesystemSessionsBackend, Session, SessionsBackendABC
+from wsgi_application.tracing import span
 
 
 class BodyParser(abc.ABC):
@@ -33,6 +22,72 @@ class FormUrlencodedBodyParser(BodyParser):
         return body
 
 
+class Request:
+    def __init__(self, environ: dict, sessions_backend: SessionsBackendABC, body_parser: BodyParser):
+        self.environ = environ
+        self.path: str = environ['PATH_INFO']
+        self.method: str = environ['REQUEST_METHOD']
+        self.sessions_backend = sessions_backend
+        self.__body_parser = body_parser
+
+    @cached_property
+    def cookies(self) -> dict:
+        cookies = {}
+        if not (cookies_string := self.environ.get('HTTP_COOKIE', '')):
+            return cookies
+        for cookie in cookies_string.split('; '):
+            cookie = cookie.split('=')
+            cookies[cookie[0]] = parse.unquote(cookie[1])
+        return cookies
+
+    @cached_property
+    def session_id(self) -> str:
+        return self.cookies.get('session', '')
+
+    @cached_property
+    def session(self) -> Session:
+        with span('session'):
+            return self.sessions_backend.load_session(self.session_id)
+
+    @property
+    def loaded_session(self) -> Optional[Session]:
+        return self.__dict__.get('session')
+
+    @cached_property
+    def body(self) -> Any:
+        with span('request_body'):
+            return self.__body_parser(self.environ)
+
+    @cached_property
+    def accepted_encodings(self) -> dict[str, float]:
+        accepted_encodings = {}
+        for encoding in self.environ.get('HTTP_ACCEPT_ENCODING', '').split(','):
+            encoding, _, parameters = encoding.partition(';')
+            if not (encoding := encoding.strip().lower()):
+                continue
+            quality = 1.0
+            parameter_name, _, parameter_value = parameters.partition('=')
+            if parameter_name.strip() == 'q':
+                try:
+                    quality = float(parameter_value)
+                except ValueError:
+                    quality = 0.0
+            accepted_encodings[encoding] = quality
+        return accepted_encodings
+
+    def accepts_encoding(self, encoding: str) -> bool:
+        accepted_encodings = self.accepted_encodings
+        return accepted_encodings.get(encoding, accepted_encodings.get('*', 0.0)) > 0
+
+    @cached_property
+    def query_params(self) -> dict[str, Union[str, list[str]]]:
+        query_params = parse.parse_qs(self.environ.get('QUERY_STRING', ''))
+        for k, v in query_params.items():
+            if isinstance(v, list) and len(v) == 1:
+                query_params[k] = v[0]
+        return query_params
+
+
 class RequestCreator:
     def __init__(self, sessions_backend: SessionsBackendABC = FilesystemSessionsBackend()):
         self.__default_body_parser = FormUrlencodedBodyParser()
@@ -48,37 +103,9 @@ class RequestCreator:
         self.__sessions_backend = session_backend
 
     def create_request(self, environ: dict) -> Request:
-        cookies = self.__parse_cookies(environ.get('HTTP_COOKIE', ''))
-        session_id = cookies.get('session', '')
-        session = self.__sessions_backend.get_session_data(session_id)
+        content_type = environ.get('CONTENT_TYPE', 'application/x-www-form-urlencoded')
         return Request(
-            path=environ['PATH_INFO'],
-            method=environ['REQUEST_METHOD'],
-            cookies=cookies,
-            session_id=session_id,
-            session=session,
-            sessions_backend=self.sessions_backend,
-            body=self.__parse_body(environ),
-            query_params=self.__parse_query_params(environ),
+            environ=environ,
+            sessions_backend=self.__sessions_backend,
+            body_parser=self.__body_parsers.get(content_type, self.__default_body_parser),
         )
-
-    def __parse_body(self, environ: dict) -> dict:
-        content_type = environ.get('CONTENT_TYPE', 'application/x-www-form-urlencoded')
-        parser = self.__body_parsers.get(content_type, self.__default_body_parser)
-        return parser(environ)
-
-    def __parse_query_params(self, environ: dict) -> dict[str, list[str]]:
-        query_params = parse.parse_qs(environ['QUERY_STRING'])
-        for k, v in query_params.items():
-            if isinstance(v, list) and len(v) == 1:
-                query_params[k] = v[0]
-        return query_params
-
-    def __parse_cookies(self, cookies_string: str) -> dict:
-        cookies = {}
-        if not cookies_string:
-            return cookies
-        for cookie in cookies_string.split('; '):
-            cookie = cookie.split('=')
-            cookies[cookie[0]] = parse.unquote(cookie[1])
-        return cookies
@@ -1,26 +1,43 @@
 import abc
+import mimetypes
+import os
 from copy import deepcopy
 from datetime import datetime, timedelta
-from typing import Union, Optional
+from typing import Callable, Iterable, Iterator, Union, Optional
 
 from wsgi_application.request import Request
+from wsgi_application.sessions import Session
 
 
 class ResponseABC(abc.ABC):
+    is_streaming = False
+
     def __init__(self, request: Request, status: Union[str, int], content_type: str):
         self.status = status
         self.__headers: list[tuple, ...] = []
         self.__headers.append(('Content-Type', content_type))
         self.__request: Request = request
+        self.__close_callbacks: list[Callable] = []
 
     @abc.abstractmethod
     def format_response(self):
         pass
 
+    @property
+    def request(self) -> Request:
+        return self.__request
+
     @property
     def headers(self) -> list[tuple, ...]:
         return deepcopy(self.__headers)
 
+    @property
+    def close_callbacks(self) -> tuple[Callable, ...]:
+        return tuple(self.__close_callbacks)
+
+    def call_on_close(self, callback: Callable):
+        self.__close_callbacks.append(callback)
+
     def add_header(self, key: str, value: str):
         if key.lower() == 'content-type' or key.lower() == 'set-cookie':
             return
@@ -32,13 +49,14 @@ class ResponseABC(abc.ABC):
         self.__set_cookie_header(key, value, seconds)
 
     def set_session(self, session_data: dict, session_id: Optional[str] = None):
+        session = Session(session_id or '', dict(session_data))
+        session.mark_modified()
         if session_id:
             self.__set_cookie_header('session', session_id)
-        elif not self.__request.session_id:
-            session_id = self.__request.sessions_backend.generate_session_id()
-            self.__set_cookie_header('session', session_id)
-        session_id = session_id or self.__request.session_id
-        self.__request.sessions_backend.write_session_data(session_id, session_data)
+        self.__request.session = session
+
+    def set_session_cookie(self, value: str):
+        self.__set_cookie_header('session', value)
 
     def __set_cookie_header(self, key: str, value: str, seconds: int = 600 * 600):
         dt = (datetime.now() + timedelta(seconds=seconds)).strftime('%a, %d %b %Y %H:%M:%S GMT')
@@ -52,3 +70,77 @@ class SimpleResponse(ResponseABC):
 
     def format_response(self):
         return [self.text.encode()]
+
+
+class ClosingIterator:
+    def __init__(self, iterable: Iterable[bytes], *callbacks: Callable):
+        self.__iterable = iterable
+        self.__callbacks = callbacks
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.__iterable)
+
+    def close(self):
+        try:
+            if close := getattr(self.__iterable, 'close', None):
+                close()
+        finally:
+            for callback in self.__callbacks:
+                callback()
+
+
+class StreamingResponse(ResponseABC):
+    is_streaming = True
+
+    def __init__(
+        self,
+        request: Request,
+        status: Union[str, int],
+        content: Iterable[Union[bytes, str]],
+        content_type: str = 'text/html',
+        content_length: Optional[int] = None,
+    ):
+        super().__init__(request, status, content_type)
+        self.content = content
+        self.content_length = content_length
+        if content_length is not None:
+            self.add_header('Content-Length', str(content_length))
+
+    def format_response(self) -> ClosingIterator:
+        return ClosingIterator(self.__encode_chunks(), *self.__get_content_close_callbacks())
+
+    def __encode_chunks(self) -> Iterator[bytes]:
+        for chunk in self.content:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield chunk
+
+    def __get_content_close_callbacks(self) -> tuple[Callable, ...]:
+        close = getattr(self.content, 'close', None)
+        return (close,) if close else ()
+
+
+class FileResponse(ResponseABC):
+    block_size = 64 * 1024
+
+    def __init__(
+        self,
+        request: Request,
+        status: Union[str, int],
+        path: str,
+        content_type: Optional[str] = None,
+        content_length: Optional[int] = None,
+    ):
+        super().__init__(request, status, content_type or mimetypes.guess_type(path)[0] or 'application/octet-stream')
+        self.path = path
+        self.content_length = os.stat(path).st_size if content_length is None else content_length
+        self.add_header('Content-Length', str(self.content_length))
+
+    def format_response(self) -> Iterable[bytes]:
+        if self.request.method == 'HEAD':
+            return []
+        file = open(self.path, 'rb')
+        if file_wrapper := self.request.environ.get('wsgi.file_wrapper'):
+            return file_wrapper(file, self.block_size)
+        return ClosingIterator(iter(lambda: file.read(self.block_size), b''), file.close)
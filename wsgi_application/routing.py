@@ -1,25 +1,154 @@
-from dataclasses import dataclass
-from typing import Callable, Optional
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+def _convert_str(value: str) -> str:
+    if not value:
+        raise ValueError('Empty path parameter')
+    return value
+
+
+def _convert_int(value: str) -> int:
+    if not value.isascii() or not value.isdigit():
+        raise ValueError(f'"{value}" is not a valid integer path parameter')
+    return int(value)
+
+
+def _convert_uuid(value: str) -> uuid.UUID:
+    return uuid.UUID(value)
+
+
+PATH_PARAMETER_CONVERTERS: dict[str, Callable[[str], Any]] = {
+    'str': _convert_str,
+    'int': _convert_int,
+    'uuid': _convert_uuid,
+    'path': _convert_str,
+}
+CATCH_ALL_CONVERTER = 'path'
+ROUTE_ENVIRON_KEY = 'wsgi_application.route'
 
 
 @dataclass
 class Route:
     methods: list[str, ...]
     handler: Callable
+    path: str = ''
+    path_parameters_names: tuple[str, ...] = ()
+    is_fallback: bool = False
+
+
+@dataclass
+class RouteMatch:
+    route: Optional[Route]
+    path_parameters: dict[str, Any] = field(default_factory=dict)
+    allowed_methods: tuple[str, ...] = ()
 
 
 class Router:
     def __init__(self):
-        self._routes = {}
+        self._routes: list[Route] = []
 
-    def get_route(self, path: str) -> Optional[Route]:
-        route: Optional[Route] = self._routes.get(path)
-        if route:
-            return route
+    @property
+    def routes(self) -> list[Route]:
+        return list(self._routes)
 
     def route(self, path: str, methods: list[str]):
         def _route(request_handler: Callable):
-            self._routes[path] = Route(methods=methods, handler=request_handler)
+            self._routes.append(Route(methods=methods, handler=request_handler, path=path))
             return request_handler
 
         return _route
+
+
+class _RoutesTreeNode:
+    __slots__ = ('static_children', 'parameter_children', 'catch_all_child', 'routes')
+
+    def __init__(self):
+        self.static_children: dict[str, _RoutesTreeNode] = {}
+        self.parameter_children: dict[str, _RoutesTreeNode] = {}
+        self.catch_all_child: Optional[_RoutesTreeNode] = None
+        self.routes: dict[str, Route] = {}
+
+
+class RoutesTree:
+    def __init__(self):
+        self.__root = _RoutesTreeNode()
+        self.__fallback_root = _RoutesTreeNode()
+
+    def add_route(self, route: Route):
+        node = self.__fallback_root if route.is_fallback else self.__root
+        path_parameters_names = []
+        segments = self.__split_path(route.path)
+        for segment_index, segment in enumerate(segments):
+            if not (segment.startswith('{') and segment.endswith('}')):
+                node = node.static_children.setdefault(segment, _RoutesTreeNode())
+                continue
+            parameter_name, _, converter_name = segment[1:-1].partition(':')
+            converter_name = converter_name or 'str'
+            if converter_name not in PATH_PARAMETER_CONVERTERS:
+                raise ValueError(f'Unknown path parameter type "{converter_name}" in "{route.path}"')
+            path_parameters_names.append(parameter_name)
+            if converter_name == CATCH_ALL_CONVERTER:
+                if segment_index != len(segments) - 1:
+                    raise ValueError(f'"{segment}" must be the last segment of "{route.path}"')
+                node.catch_all_child = node.catch_all_child or _RoutesTreeNode()
+                node = node.catch_all_child
+            else:
+                node = node.parameter_children.setdefault(converter_name, _RoutesTreeNode())
+        route.path_parameters_names = tuple(path_parameters_names)
+        for method in route.methods:
+            node.routes[method] = route
+
+    def match(self, path: str, method: str) -> Optional[RouteMatch]:
+        segments = self.__split_path(path)
+        allowed_methods = set()
+        path_parameters_values = []
+        route = self.__match(self.__root, segments, 0, method, path_parameters_values, allowed_methods)
+        if not route and allowed_methods:
+            return RouteMatch(route=None, allowed_methods=tuple(sorted(allowed_methods)))
+        if not route:
+            route = self.__match(self.__fallback_root, segments, 0, method, path_parameters_values, set())
+        if route:
+            return RouteMatch(
+                route=route,
+                path_parameters=dict(zip(route.path_parameters_names, path_parameters_values)),
+            )
+
+    def __match(
+        self,
+        node: _RoutesTreeNode,
+        segments: list[str],
+        segment_index: int,
+        method: str,
+        path_parameters_values: list,
+        allowed_methods: set,
+    ) -> Optional[Route]:
+        if segment_index == len(segments):
+            if route := node.routes.get(method):
+                return route
+            allowed_methods.update(node.routes)
+            return
+        segment = segments[segment_index]
+        if (child := node.static_children.get(segment)) and (
+            route := self.__match(child, segments, segment_index + 1, method, path_parameters_values, allowed_methods)
+        ):
+            return route
+        for converter_name, child in node.parameter_children.items():
+            try:
+                value = PATH_PARAMETER_CONVERTERS[converter_name](segment)
+            except ValueError:
+                continue
+            path_parameters_values.append(value)
+            if route := self.__match(child, segments, segment_index + 1, method, path_parameters_values, allowed_methods):
+                return route
+            path_parameters_values.pop()
+        if (child := node.catch_all_child) and child.routes:
+            if route := child.routes.get(method):
+                path_parameters_values.append('/'.join(segments[segment_index:]))
+                return route
+            allowed_methods.update(child.routes)
+
+    @staticmethod
+    def __split_path(path: str) -> list[str]:
+        return path[1:].split('/') if path.startswith('/') else path.split('/')
@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Callable, Optional
+
+from wsgi_application.metrics import MetricsRegistry
+from wsgi_application.sessions import Session, SessionsBackendABC
+
+
+class CachedSessionsBackend(SessionsBackendABC):
+    def __init__(
+        self,
+        sessions_backend: SessionsBackendABC,
+        max_size: int = 1024,
+        ttl: float = 5.0,
+        metrics_registry: Optional[MetricsRegistry] = None,
+    ):
+        self.sessions_backend = sessions_backend
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__cache: OrderedDict[str, tuple[float, dict, Optional[float]]] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__subscribed_pid: Optional[int] = None
+        self.__receives_invalidations = False
+        self.__cache_requests = metrics_registry.counter(
+            'sessions_cache_requests_total', 'Session loads served by the in-process cache', ('result',),
+        ) if metrics_registry else None
+
+    @property
+    def supports_partial_updates(self) -> bool:
+        return self.sessions_backend.supports_partial_updates
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / (self.hits + self.misses) if self.hits or self.misses else 0.0
+
+    def generate_session_id(self) -> str:
+        return self.sessions_backend.generate_session_id()
+
+    def get_session_data(self, session_id: str) -> dict:
+        return self.load_session(session_id).to_dict()
+
+    def write_session_data(self, session_id: str, data: dict):
+        self.__subscribe_to_invalidations()
+        self.sessions_backend.write_session_data(session_id, data)
+        self.__store_written(session_id, data, None)
+
+    def update_session_data(self, session_id: str, changed_data: dict, deleted_keys: set[str]):
+        self.sessions_backend.update_session_data(session_id, changed_data, deleted_keys)
+        self.invalidate(session_id)
+
+    def refresh_session_ttl(self, session_id: str):
+        self.sessions_backend.refresh_session_ttl(session_id)
+
+    def is_session_ttl_refresh_due(self, session: Session) -> bool:
+        return self.sessions_backend.is_session_ttl_refresh_due(session)
+
+    def load_session(self, session_id: str) -> Session:
+        if not session_id:
+            return Session()
+        self.__subscribe_to_invalidations()
+        with self.__lock:
+            cached = self.__cache.get(session_id)
+            if cached and cached[0] > time.monotonic():
+                self.__cache.move_to_end(session_id)
+                session_data, expires_at = deepcopy(cached[1]), cached[2]
+            else:
+                session_data = expires_at = None
+        if session_data is not None:
+            self.__record(hit=True)
+            session = Session(session_id, session_data)
+            session.expires_at = expires_at
+            return session
+        self.__record(hit=False)
+        session = self.sessions_backend.load_session(session_id)
+        self.__store(session_id, session.to_dict(), session.expires_at)
+        return session
+
+    def save_session(self, session: Session) -> Optional[str]:
+        is_modified = session.is_modified
+        if is_modified:
+            self.__subscribe_to_invalidations()
+        cookie_value = self.sessions_backend.save_session(session)
+        if is_modified:
+            self.__store_written(session.session_id, session.to_dict(), session.expires_at)
+        else:
+            self.__update_expires_at(session.session_id, session.expires_at)
+        return cookie_value
+
+    def invalidate(self, session_id: Optional[str] = None):
+        with self.__lock:
+            if session_id is None:
+                self.__cache.clear()
+            else:
+                self.__cache.pop(session_id, None)
+
+    def subscribe_to_invalidations(self, callback: Callable[[Optional[str]], None]) -> bool:
+        return self.sessions_backend.subscribe_to_invalidations(callback)
+
+    def __subscribe_to_invalidations(self):
+        if self.__subscribed_pid == (pid := os.getpid()):
+            return
+        self.__subscribed_pid = pid
+        self.invalidate()
+        self.__receives_invalidations = self.sessions_backend.subscribe_to_invalidations(self.invalidate)
+
+    def __store_written(self, session_id: str, data: dict, expires_at: Optional[float]):
+        if self.__receives_invalidations:
+            self.invalidate(session_id)
+        else:
+            self.__store(session_id, data, expires_at)
+
+    def __store(self, session_id: str, data: dict, expires_at: Optional[float]):
+        if not session_id or not self.max_size:
+            return
+        with self.__lock:
+            self.__cache[session_id] = (time.monotonic() + self.ttl, deepcopy(data), expires_at)
+            self.__cache.move_to_end(session_id)
+            if len(self.__cache) > self.max_size:
+                self.__cache.popitem(last=False)
+
+    def __update_expires_at(self, session_id: str, expires_at: Optional[float]):
+        with self.__lock:
+            if cached := self.__cache.get(session_id):
+                self.__cache[session_id] = (cached[0], cached[1], expires_at)
+
+    def __record(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self.__cache_requests:
+            self.__cache_requests.inc(result='hit' if hit else 'miss')
@@ -1,10 +1,105 @@
 import abc
+import asyncio
+import base64
+import hashlib
+import hmac
 import json
 import os
+import threading
+import time
 import uuid
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import suppress
+from copy import deepcopy
+from typing import Any, Awaitable, Callable, Iterator, Optional, Sequence, Union
+
+
+SESSION_REQUIRED_ATTRIBUTE = '__session_required__'
+
+
+def session_required(request_handler: Callable) -> Callable:
+    setattr(request_handler, SESSION_REQUIRED_ATTRIBUTE, True)
+    return request_handler
+
+
+class Session(MutableMapping):
+    def __init__(self, session_id: str = '', data: Optional[dict] = None):
+        self.session_id = session_id
+        self.__data = data if data is not None else {}
+        self.__changed_keys: set[str] = set()
+        self.__deleted_keys: set[str] = set()
+        self.__is_replaced = False
+        self.expires_at: Optional[float] = None
+
+    @property
+    def is_modified(self) -> bool:
+        return self.__is_replaced or bool(self.__changed_keys or self.__deleted_keys)
+
+    @property
+    def is_replaced(self) -> bool:
+        return self.__is_replaced
+
+    @property
+    def changed_data(self) -> dict:
+        return {key: self.__data[key] for key in self.__changed_keys}
+
+    @property
+    def deleted_keys(self) -> set[str]:
+        return set(self.__deleted_keys)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.__data[key]
+
+    def __setitem__(self, key: str, value: Any):
+        self.__data[key] = value
+        self.__changed_keys.add(key)
+        self.__deleted_keys.discard(key)
+
+    def __delitem__(self, key: str):
+        del self.__data[key]
+        self.__changed_keys.discard(key)
+        self.__deleted_keys.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__data)
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.__data!r})'
+
+    def clear(self):
+        self.__data.clear()
+        self.__changed_keys.clear()
+        self.__deleted_keys.clear()
+        self.__is_replaced = True
+
+    def replace(self, data: dict):
+        self.clear()
+        self.__data.update(data)
+
+    def mark_modified(self, key: Optional[str] = None):
+        if key is None:
+            self.__is_replaced = True
+        else:
+            self.__changed_keys.add(key)
+
+    def to_dict(self) -> dict:
+        return dict(self.__data)
+
+
+def is_ttl_refresh_due(session: Session, ttl: Optional[float], ttl_refresh_interval: float) -> bool:
+    if not ttl or not session:
+        return False
+    return session.expires_at is None or session.expires_at - time.time() < ttl - ttl_refresh_interval
 
 
 class SessionsBackendABC(abc.ABC):
+    supports_partial_updates = False
+
     def generate_session_id(self) -> str:
         return uuid.uuid4().hex
 
@@ -16,25 +111,372 @@ class SessionsBackendABC(abc.ABC):
     def write_session_data(self, session_id: str, data: dict):
         raise NotImplementedError
 
+    def update_session_data(self, session_id: str, changed_data: dict, deleted_keys: set[str]):
+        raise NotImplementedError
+
+    def refresh_session_ttl(self, session_id: str):
+        pass
+
+    def is_session_ttl_refresh_due(self, session: Session) -> bool:
+        return True
+
+    def subscribe_to_invalidations(self, callback: Callable[[Optional[str]], None]) -> bool:
+        return False
+
+    def load_session(self, session_id: str) -> Session:
+        return Session(session_id, self.get_session_data(session_id) if session_id else {})
+
+    def save_session(self, session: Session) -> Optional[str]:
+        if not session.is_modified:
+            if session.session_id and self.is_session_ttl_refresh_due(session):
+                self.refresh_session_ttl(session.session_id)
+            return None
+        cookie_value = None
+        if not session.session_id:
+            session.session_id = cookie_value = self.generate_session_id()
+        if self.supports_partial_updates and not session.is_replaced:
+            self.update_session_data(session.session_id, session.changed_data, session.deleted_keys)
+        else:
+            self.write_session_data(session.session_id, session.to_dict())
+        return cookie_value
+
 
 class FilesystemSessionsBackend(SessionsBackendABC):
+    def __init__(
+        self,
+        directory: str = 'sessions',
+        ttl: Optional[float] = 24 * 60 * 60,
+        shard_depth: int = 2,
+        cache_size: int = 1024,
+        sweep_interval: Optional[float] = 10 * 60,
+        ttl_refresh_interval: float = 60.0,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.ttl_refresh_interval = ttl_refresh_interval
+        self.shard_depth = shard_depth
+        self.cache_size = cache_size
+        self.sweep_interval = sweep_interval
+        self.__cache: OrderedDict[str, tuple[tuple[int, int, int], dict]] = OrderedDict()
+        self.__cache_lock = threading.Lock()
+        self.__created_directories: set[str] = set()
+        self.__sweeper_pid: Optional[int] = None
+        self.__sweeper_stopped = threading.Event()
+
+    def get_session_path(self, session_id: str) -> str:
+        session_hash = hashlib.sha256(session_id.encode()).hexdigest()
+        shards = (session_hash[index * 2:index * 2 + 2] for index in range(self.shard_depth))
+        return os.path.join(self.directory, *shards, f'{session_hash}.json')
+
     def get_session_data(self, session_id: str) -> dict:
+        return self.load_session(session_id).to_dict()
+
+    def load_session(self, session_id: str) -> Session:
         if not session_id:
-            return {}
-        os.makedirs('sessions', exist_ok=True)
-        session_file_path = os.path.join('sessions', f'{session_id}.json')
-        if not os.path.exists(session_file_path):
-            with open(session_file_path, 'w') as f:
-                f.write('{}')
-            return {}
-        with open(session_file_path, 'r') as f:
-            session_data = json.load(f)
-        return session_data
+            return Session()
+        session_file_path = self.get_session_path(session_id)
+        try:
+            file_stat = os.stat(session_file_path)
+        except FileNotFoundError:
+            return Session(session_id)
+        if self.__is_expired(file_stat.st_mtime):
+            return Session(session_id)
+        session = Session(session_id, self.__read_session_data(session_file_path, file_stat))
+        if self.ttl is not None:
+            session.expires_at = file_stat.st_mtime + self.ttl
+        return session
+
+    def is_session_ttl_refresh_due(self, session: Session) -> bool:
+        return is_ttl_refresh_due(session, self.ttl, self.ttl_refresh_interval)
 
     def write_session_data(self, session_id: str, data: dict):
         if not session_id:
             return
-        os.makedirs('sessions', exist_ok=True)
-        session_file_path = os.path.join('sessions', f'{session_id}.json')
-        with open(session_file_path, 'w') as f:
-            json.dump(data, f)
+        self.__start_sweeper()
+        session_file_path = self.get_session_path(session_id)
+        session_directory = os.path.dirname(session_file_path)
+        if session_directory not in self.__created_directories:
+            os.makedirs(session_directory, exist_ok=True)
+            self.__created_directories.add(session_directory)
+        temporary_file_path = f'{session_file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temporary_file_path, 'w') as f:
+                json.dump(data, f)
+                f.flush()
+                file_stat = os.fstat(f.fileno())
+            os.replace(temporary_file_path, session_file_path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.remove(temporary_file_path)
+            raise
+        self.__cache_session_data(session_file_path, self.__get_file_version(file_stat), deepcopy(data))
+
+    def refresh_session_ttl(self, session_id: str):
+        session_file_path = self.get_session_path(session_id)
+        try:
+            os.utime(session_file_path)
+            file_stat = os.stat(session_file_path)
+        except FileNotFoundError:
+            return
+        with self.__cache_lock:
+            if not (cached := self.__cache.get(session_file_path)):
+                return
+            if cached[0][1:] == (file_stat.st_size, file_stat.st_ino):
+                self.__cache[session_file_path] = (self.__get_file_version(file_stat), cached[1])
+            else:
+                del self.__cache[session_file_path]
+
+    def sweep_expired_sessions(self) -> int:
+        if self.ttl is None:
+            return 0
+        removed_sessions_count = 0
+        expired_before = time.time() - self.ttl
+        for session_file_path, file_stat in self.__iterate_session_files(self.directory):
+            if file_stat.st_mtime < expired_before:
+                with suppress(FileNotFoundError):
+                    os.remove(session_file_path)
+                    removed_sessions_count += 1
+        return removed_sessions_count
+
+    def stop_sweeper(self):
+        self.__sweeper_stopped.set()
+
+    def __read_session_data(self, session_file_path: str, file_stat: os.stat_result) -> dict:
+        with self.__cache_lock:
+            if (cached := self.__cache.get(session_file_path)) and cached[0] == self.__get_file_version(file_stat):
+                self.__cache.move_to_end(session_file_path)
+                return deepcopy(cached[1])
+        try:
+            with open(session_file_path, 'r') as f:
+                session_data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        self.__cache_session_data(session_file_path, self.__get_file_version(file_stat), session_data)
+        return deepcopy(session_data)
+
+    def __is_expired(self, modified_at: float) -> bool:
+        return self.ttl is not None and time.time() - modified_at > self.ttl
+
+    def __cache_session_data(self, session_file_path: str, file_version: tuple[int, int, int], session_data: dict):
+        if not self.cache_size:
+            return
+        with self.__cache_lock:
+            self.__cache[session_file_path] = (file_version, session_data)
+            self.__cache.move_to_end(session_file_path)
+            if len(self.__cache) > self.cache_size:
+                self.__cache.popitem(last=False)
+
+    @staticmethod
+    def __get_file_version(file_stat: os.stat_result) -> tuple[int, int, int]:
+        return file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino
+
+    def __iterate_session_files(self, directory: str) -> Iterator[tuple[str, os.stat_result]]:
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            with suppress(FileNotFoundError):
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self.__iterate_session_files(entry.path)
+                elif entry.name.endswith(('.json', '.tmp')):
+                    yield entry.path, entry.stat(follow_symlinks=False)
+
+    def __start_sweeper(self):
+        if not self.sweep_interval or self.ttl is None or self.__sweeper_pid == os.getpid():
+            return
+        self.__sweeper_pid = os.getpid()
+        self.__sweeper_stopped = threading.Event()
+        threading.Thread(target=self.__sweep_periodically, name='sessions_sweeper', daemon=True).start()
+
+    def __sweep_periodically(self):
+        while not self.__sweeper_stopped.wait(self.sweep_interval):
+            with suppress(OSError):
+                self.sweep_expired_sessions()
+
+
+class SessionTooLargeError(ValueError):
+    pass
+
+
+def _encode_base64(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b'=').decode()
+
+
+def _decode_base64(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+
+class SignedCookieSessionsBackend(SessionsBackendABC):
+    server_side_prefix = '~'
+
+    def __init__(
+        self,
+        secret_keys: Sequence[Union[str, bytes]],
+        max_age: int = 24 * 60 * 60,
+        compression_threshold: Optional[int] = 200,
+        max_cookie_size: int = 3800,
+        fallback_backend: Optional[SessionsBackendABC] = None,
+    ):
+        if not secret_keys:
+            raise ValueError('At least one secret key is required')
+        self.__secret_keys = tuple(key.encode() if isinstance(key, str) else key for key in secret_keys)
+        self.max_age = max_age
+        self.compression_threshold = compression_threshold
+        self.max_cookie_size = max_cookie_size
+        self.fallback_backend = fallback_backend
+
+    def get_session_data(self, session_id: str) -> dict:
+        return self.load_session(session_id).to_dict()
+
+    def write_session_data(self, session_id: str, data: dict):
+        raise NotImplementedError('Signed cookie sessions are written through save_session')
+
+    def load_session(self, session_id: str) -> Session:
+        if not session_id:
+            return Session()
+        if session_id.startswith(self.server_side_prefix):
+            if not self.fallback_backend:
+                return Session()
+            session = self.fallback_backend.load_session(session_id[len(self.server_side_prefix):])
+            session.session_id = session_id
+            return session
+        if (unsigned := self.__unsign(session_id)) is None:
+            return Session()
+        payload, is_signed_with_current_key = unsigned
+        session = Session(session_id, payload['d'])
+        session.expires_at = payload['e']
+        if not is_signed_with_current_key:
+            session.mark_modified()
+        return session
+
+    def save_session(self, session: Session) -> Optional[str]:
+        now = time.time()
+        if not session.is_modified and session.session_id.startswith(self.server_side_prefix):
+            if self.fallback_backend:
+                server_side_session = Session(session.session_id[len(self.server_side_prefix):], session.to_dict())
+                server_side_session.expires_at = session.expires_at
+                self.fallback_backend.save_session(server_side_session)
+            return None
+        if not session.is_modified and (session.expires_at is None or session.expires_at - now > self.max_age / 2):
+            return None
+        cookie_value = self.__sign({'e': int(now + self.max_age), 'd': session.to_dict()})
+        if len(cookie_value) <= self.max_cookie_size:
+            return cookie_value
+        if not self.fallback_backend:
+            raise SessionTooLargeError(f'Signed session cookie is {len(cookie_value)} bytes long')
+        if session.session_id.startswith(self.server_side_prefix):
+            server_side_session_id = session.session_id[len(self.server_side_prefix):]
+        else:
+            server_side_session_id = self.fallback_backend.generate_session_id()
+        self.fallback_backend.write_session_data(server_side_session_id, session.to_dict())
+        return f'{self.server_side_prefix}{server_side_session_id}'
+
+    def __sign(self, payload: dict) -> str:
+        serialized_payload = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode()
+        if self.compression_threshold is not None and len(serialized_payload) > self.compression_threshold:
+            encoded_payload = f'.{_encode_base64(zlib.compress(serialized_payload))}'
+        else:
+            encoded_payload = _encode_base64(serialized_payload)
+        return f'{encoded_payload}.{self.__get_signature(self.__secret_keys[0], encoded_payload)}'
+
+    def __unsign(self, cookie_value: str) -> Optional[tuple[dict, bool]]:
+        encoded_payload, _, signature = cookie_value.rpartition('.')
+        if not encoded_payload:
+            return None
+        signing_key_index = next((
+            index for index, key in enumerate(self.__secret_keys)
+            if hmac.compare_digest(signature, self.__get_signature(key, encoded_payload))
+        ), None)
+        if signing_key_index is None:
+            return None
+        try:
+            if encoded_payload.startswith('.'):
+                payload = json.loads(zlib.decompress(_decode_base64(encoded_payload[1:])))
+            else:
+                payload = json.loads(_decode_base64(encoded_payload))
+        except (ValueError, zlib.error):
+            return None
+        return (payload, signing_key_index == 0) if payload['e'] > time.time() else None
+
+    @staticmethod
+    def __get_signature(key: bytes, encoded_payload: str) -> str:
+        return _encode_base64(hmac.new(key, encoded_payload.encode(), hashlib.sha256).digest())
+
+
+class AsyncSessionsBackendABC(abc.ABC):
+    supports_partial_updates = False
+
+    def generate_session_id(self) -> str:
+        return uuid.uuid4().hex
+
+    @abc.abstractmethod
+    async def get_session_data(self, session_id: str) -> dict:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def write_session_data(self, session_id: str, data: dict):
+        raise NotImplementedError
+
+    async def update_session_data(self, session_id: str, changed_data: dict, deleted_keys: set[str]):
+        raise NotImplementedError
+
+    async def refresh_session_ttl(self, session_id: str):
+        pass
+
+    def is_session_ttl_refresh_due(self, session: Session) -> bool:
+        return True
+
+    async def load_session(self, session_id: str) -> Session:
+        return Session(session_id, await self.get_session_data(session_id) if session_id else {})
+
+
+class PrefetchedSessionsBackend(SessionsBackendABC):
+    def __init__(
+        self,
+        sessions_backend: AsyncSessionsBackendABC,
+        session_id: str,
+        session: Optional[Session],
+        loop: asyncio.AbstractEventLoop,
+    ):
+        self.__sessions_backend = sessions_backend
+        self.__session_id = session_id
+        self.__session = session
+        self.__loop = loop
+        self.supports_partial_updates = sessions_backend.supports_partial_updates
+        self.pending_operations: list[Callable[[], Awaitable]] = []
+
+    def generate_session_id(self) -> str:
+        return self.__sessions_backend.generate_session_id()
+
+    def get_session_data(self, session_id: str) -> dict:
+        return self.load_session(session_id).to_dict()
+
+    def load_session(self, session_id: str) -> Session:
+        if session_id != self.__session_id:
+            return Session()
+        if self.__session is None:
+            self.__session = asyncio.run_coroutine_threadsafe(
+                self.__sessions_backend.load_session(session_id), self.__loop,
+            ).result()
+        return self.__session
+
+    def write_session_data(self, session_id: str, data: dict):
+        if session_id:
+            self.pending_operations.append(lambda: self.__sessions_backend.write_session_data(session_id, data))
+
+    def update_session_data(self, session_id: str, changed_data: dict, deleted_keys: set[str]):
+        self.pending_operations.append(
+            lambda: self.__sessions_backend.update_session_data(session_id, changed_data, deleted_keys),
+        )
+
+    def refresh_session_ttl(self, session_id: str):
+        self.pending_operations.append(lambda: self.__sessions_backend.refresh_session_ttl(session_id))
+
+    def is_session_ttl_refresh_due(self, session: Session) -> bool:
+        return self.__sessions_backend.is_session_ttl_refresh_due(session)
+
+    async def flush(self):
+        for operation in self.pending_operations:
+            await operation()
+        self.pending_operations.clear()
@@ -0,0 +1,116 @@
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from wsgi_application.request import Request
+from wsgi_application.response import FileResponse, ResponseABC, SimpleResponse
+
+
+@dataclass(frozen=True)
+class StaticFileVariant:
+    path: str
+    size: int
+    etag: str
+
+
+@dataclass(frozen=True)
+class StaticFile:
+    content_type: str
+    last_modified: int
+    last_modified_header: str
+    identity: StaticFileVariant
+    gzip: Optional[StaticFileVariant] = None
+
+
+class StaticFiles:
+    def __init__(
+        self,
+        directory: str,
+        excluded_directories: tuple[str, ...] = (),
+        index_file: str = 'index.html',
+        max_age: int = 3600,
+    ):
+        self.directory = directory
+        self.excluded_directories = excluded_directories
+        self.index_file = index_file
+        self.cache_control = f'public, max-age={max_age}'
+        self.__files: dict[str, StaticFile] = self.__build_index()
+
+    def __call__(self, request: Request, database_session, path: str = '') -> ResponseABC:
+        if not path or path.endswith('/'):
+            path += self.index_file
+        if not (static_file := self.__files.get(path)):
+            return SimpleResponse(request, 404, 'Path is not valid')
+        variant = static_file.identity
+        if static_file.gzip and request.accepts_encoding('gzip'):
+            variant = static_file.gzip
+        if self.__is_not_modified(request, static_file, variant):
+            response = SimpleResponse(request, 304, '')
+        else:
+            response = FileResponse(
+                request, 200, variant.path, content_type=static_file.content_type, content_length=variant.size,
+            )
+            if variant is static_file.gzip:
+                response.add_header('Content-Encoding', 'gzip')
+        response.add_header('ETag', variant.etag)
+        response.add_header('Last-Modified', static_file.last_modified_header)
+        response.add_header('Cache-Control', self.cache_control)
+        if static_file.gzip:
+            response.add_header('Vary', 'Accept-Encoding')
+        return response
+
+    def __is_not_modified(self, request: Request, static_file: StaticFile, variant: StaticFileVariant) -> bool:
+        if if_none_match := request.environ.get('HTTP_IF_NONE_MATCH'):
+            if if_none_match.strip() == '*':
+                return True
+            etags = {etag.strip().removeprefix('W/') for etag in if_none_match.split(',')}
+            return variant.etag in etags
+        if if_modified_since := request.environ.get('HTTP_IF_MODIFIED_SINCE'):
+            try:
+                return static_file.last_modified <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def __build_index(self) -> dict[str, StaticFile]:
+        files = {}
+        for directory_path, directories_names, files_names in os.walk(self.directory):
+            relative_directory = os.path.relpath(directory_path, self.directory)
+            if relative_directory == '.':
+                directories_names[:] = [name for name in directories_names if name not in self.excluded_directories]
+                relative_directory = ''
+            for file_name in files_names:
+                if file_name.endswith('.gz'):
+                    continue
+                file_path = os.path.join(directory_path, file_name)
+                url_path = '/'.join(filter(None, (*relative_directory.split(os.sep), file_name)))
+                files[url_path] = self.__index_file(file_path)
+        return files
+
+    def __index_file(self, file_path: str) -> StaticFile:
+        file_stat = os.stat(file_path)
+        last_modified = int(file_stat.st_mtime)
+        gzip_variant = None
+        gzip_path = f'{file_path}.gz'
+        if os.path.isfile(gzip_path) and os.stat(gzip_path).st_mtime >= file_stat.st_mtime:
+            gzip_variant = StaticFileVariant(
+                path=gzip_path, size=os.stat(gzip_path).st_size, etag=self.__calculate_etag(gzip_path),
+            )
+        return StaticFile(
+            content_type=mimetypes.guess_type(file_path)[0] or 'application/octet-stream',
+            last_modified=last_modified,
+            last_modified_header=formatdate(last_modified, usegmt=True),
+            identity=StaticFileVariant(path=file_path, size=file_stat.st_size, etag=self.__calculate_etag(file_path)),
+            gzip=gzip_variant,
+        )
+
+    @staticmethod
+    def __calculate_etag(file_path: str) -> str:
+        file_hash = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(64 * 1024), b''):
+                file_hash.update(block)
+        return f'"{file_hash.hexdigest()}"'
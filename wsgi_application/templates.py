@@ -0,0 +1,46 @@
+import os
+from typing import Iterator, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from wsgi_application.tracing import span
+
+
+class TracedTemplate(Template):
+    def render(self, *args, **kwargs) -> str:
+        with span('render', template=self.name):
+            return super().render(*args, **kwargs)
+
+
+def create_templates_environment(
+    path: str,
+    auto_reload: bool = True,
+    bytecode_cache_directory: Optional[str] = None,
+    cache_size: int = 400,
+) -> Environment:
+    bytecode_cache = None
+    if bytecode_cache_directory:
+        os.makedirs(bytecode_cache_directory, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_directory)
+    environment = Environment(
+        loader=FileSystemLoader(path),
+        auto_reload=auto_reload,
+        bytecode_cache=bytecode_cache,
+        cache_size=cache_size,
+    )
+    environment.template_class = TracedTemplate
+    return environment
+
+
+def preload_templates(environment: Environment) -> int:
+    templates_names = environment.list_templates()
+    for template_name in templates_names:
+        environment.get_template(template_name)
+    return len(templates_names)
+
+
+def stream_template(template: Template, buffer_size: int = 32, **context) -> Iterator[str]:
+    stream = template.stream(**context)
+    stream.enable_buffering(buffer_size)
+    with span('render', template=template.name, streamed=True):
+        yield from stream
@@ -0,0 +1,121 @@
+import abc
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    started_at: float
+    duration_ms: float = 0.0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+class Trace:
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        self.active_spans_ids: list[str] = []
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar('current_trace', default=None)
+
+
+class _NullSpanContext:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *args):
+        return False
+
+
+class SpanContext:
+    __slots__ = ('__trace', '__span', '__started_at')
+
+    def __init__(self, trace: Trace, name: str, attributes: dict[str, Any]):
+        self.__trace = trace
+        self.__span = Span(
+            trace_id=trace.trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_id=trace.active_spans_ids[-1] if trace.active_spans_ids else None,
+            name=name,
+            started_at=time.time(),
+            attributes=attributes,
+        )
+
+    @property
+    def span(self) -> Span:
+        return self.__span
+
+    def __enter__(self) -> Span:
+        self.__trace.active_spans_ids.append(self.__span.span_id)
+        self.__started_at = time.perf_counter()
+        return self.__span
+
+    def __exit__(self, exception_type, *args):
+        self.__span.duration_ms = (time.perf_counter() - self.__started_at) * 1000
+        if exception_type:
+            self.__span.attributes['error'] = exception_type.__name__
+        self.__trace.active_spans_ids.pop()
+        self.__trace.spans.append(self.__span)
+        return False
+
+
+_NULL_SPAN_CONTEXT = _NullSpanContext()
+
+
+def span(name: str, **attributes):
+    if (trace := _current_trace.get()) is None:
+        return _NULL_SPAN_CONTEXT
+    return SpanContext(trace, name, attributes)
+
+
+class SpanExporterABC(abc.ABC):
+    @abc.abstractmethod
+    def export(self, spans: list[Span]):
+        raise NotImplementedError
+
+
+class RingBufferSpanExporter(SpanExporterABC):
+    def __init__(self, max_spans: int = 10_000):
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, spans: list[Span]):
+        self.spans.extend(spans)
+
+
+class JsonlSpanExporter(SpanExporterABC):
+    def __init__(self, path: str):
+        self.path = path
+        self.__lock = threading.Lock()
+
+    def export(self, spans: list[Span]):
+        lines = ''.join(f'{json.dumps(asdict(span_data), default=str)}\n' for span_data in spans)
+        with self.__lock, open(self.path, 'a') as f:
+            f.write(lines)
+
+
+class Tracer:
+    def __init__(self, exporter: SpanExporterABC, sample_rate: float = 1.0, trace_id_header: str = 'X-Trace-Id'):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.trace_id_header = trace_id_header
+
+    def start_trace(self) -> Optional[Trace]:
+        trace = Trace() if self.sample_rate >= 1 or random.random() < self.sample_rate else None
+        _current_trace.set(trace)
+        return trace
+
+    def finish_trace(self, trace: Trace):
+        _current_trace.set(None)
+        self.exporter.export(trace.spans)